@@ -0,0 +1 @@
+"""Skrip benchmark dashboard (jalankan dengan ``python -m benchmarks.<nama>``)."""
@@ -0,0 +1,93 @@
+"""Benchmark analisis lintas indikator: pass penuh vs pembaruan inkremental.
+
+Untuk setiap jumlah baris dibuat matriks indikator sintetis (9 indikator,
+5% nilai kosong, seperti kab/kota × beberapa tahun). Diukur:
+
+* ``pandas``: ``DataFrame.corr()`` + rank + z-score pada subset (baseline);
+* ``penuh``: ``IndicatorAnalytics.analyze`` tanpa subset sebelumnya;
+* ``inkremental``: subset berikutnya berbeda ``--change`` bagian baris
+  (filter provinsi ditambah/dikurangi), jumlahnya diperbarui dari subset
+  sebelumnya;
+* ``korelasi``: hanya matriks korelasi untuk perubahan subset berikutnya.
+
+Jalankan dari root repo::
+
+    python -m benchmarks.bench_analytics --sizes 500 50000 500000
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard.analytics import IndicatorAnalytics
+
+INDICATORS = 9
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def pandas_baseline(values, rows, columns):
+    subset = pd.DataFrame(values[rows], columns=columns)
+    corr = subset.corr()
+    ranks = subset.rank(ascending=False, method="min")
+    zscores = (subset - subset.mean()) / subset.std()
+    return corr, ranks, zscores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 50000, 500000])
+    parser.add_argument("--change", type=float, default=0.02,
+                        help="bagian baris yang masuk/keluar subset di setiap langkah")
+    parser.add_argument("--json", help="simpan hasil sebagai JSON lines ke file ini")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    columns = [f"IND_{i}" for i in range(INDICATORS)]
+    results = []
+    for size in args.sizes:
+        values = rng.normal(50, 15, size=(size, INDICATORS))
+        values[:, 1] += 0.5 * values[:, 0]
+        values[rng.random(values.shape) < 0.05] = np.nan
+        analytics = IndicatorAnalytics(np.arange(size).astype(str), columns, values)
+
+        subset = rng.random(size) < 0.8
+        rows = np.flatnonzero(subset)
+        pandas_seconds, (reference, _, _) = timed(lambda: pandas_baseline(values, rows, columns))
+        full_seconds, _ = timed(lambda: analytics.analyze(rows))
+
+        # Filter berikutnya: sebagian kecil baris berganti status
+        flip = rng.random(size) < args.change
+        rows = np.flatnonzero(subset ^ flip)
+        incremental_seconds, result = timed(lambda: analytics.analyze(rows))
+        assert analytics.incremental_updates == 1
+        reference = pd.DataFrame(values[rows], columns=columns).corr()
+        error = float(np.nanmax(np.abs(result.correlation.to_numpy() - reference.to_numpy())))
+
+        # Korelasi saja (tanpa peringkat/z-score per baris): biaya ikut baris yang berubah
+        rows = np.flatnonzero(subset ^ flip ^ (rng.random(size) < args.change))
+        corr_seconds, _ = timed(lambda: analytics.correlation(rows))
+
+        results.append({"rows": size, "indicators": INDICATORS, "change": args.change,
+                        "pandas_seconds": pandas_seconds, "full_seconds": full_seconds,
+                        "incremental_seconds": incremental_seconds,
+                        "incremental_corr_seconds": corr_seconds, "max_corr_error": error})
+        print(f"{size:>8} baris  pandas {pandas_seconds * 1000:8.1f} ms  penuh {full_seconds * 1000:8.1f} ms"
+              f"  inkremental {incremental_seconds * 1000:8.1f} ms  korelasi {corr_seconds * 1000:6.1f} ms"
+              f"  (selisih r maks {error:.1e})")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for row in results:
+                f.write(json.dumps(row) + "\n")
+
+
+if __name__ == "__main__":
+    main()
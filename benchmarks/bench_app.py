@@ -0,0 +1,186 @@
+"""Benchmark rerun kemiskinan.py secara headless lewat ``AppTest``.
+
+Untuk setiap ukuran workbook sintetis, dashboard dijalankan di proses baru
+(agar cache Streamlit dan RSS tidak terbawa dari ukuran sebelumnya), lalu
+serangkaian interaksi widget dijalankan berurutan. Dicatat per langkah:
+waktu wall, puncak RSS proses, dan total ukuran JSON figure di halaman.
+
+Setiap ukuran diukur dua kali: ``cold`` (cache kolumnar kosong, workbook
+di-parse) dan ``warm`` (proses baru, cache kolumnar di disk sudah ada).
+Ukuran adalah jumlah baris kab/kota; jumlah provinsi ``max(38, ukuran // 100)``.
+
+Jalankan dari root repo::
+
+    python -m benchmarks.bench_app --sizes 38 10000 1000000 --json bench_app.jsonl
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_workbook
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "kemiskinan.py")
+
+
+def _peak_rss_kb():
+    # ru_maxrss dalam KB di Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _figure_bytes(at):
+    return sum(len(chart.proto.spec) for chart in at.get("plotly_chart"))
+
+
+def _view(at, index):
+    # Widget dicari saat langkah dijalankan; elemen dari rerun sebelumnya sudah usang
+    def switch():
+        radio = at.radio(key="active_view")
+        radio.set_value(radio.options[index]).run()
+    return switch
+
+
+def _other_option(widget):
+    options = list(widget.options)
+    current = str(widget.value)
+    return next((o for o in options if o != current), current)
+
+
+def scripted_steps(at):
+    """Urutan interaksi yang diukur: (nama langkah, fungsi yang menjalankan rerun)."""
+    def move_slider():
+        slider = next(s for s in at.slider if s.label.startswith("Range Penduduk Miskin"))
+        low, high = slider.value
+        slider.set_value((low + (high - low) // 4, high - (high - low) // 4)).run()
+
+    def narrow_provinces():
+        multiselect = at.multiselect[0]
+        multiselect.set_value(multiselect.value[: max(1, len(multiselect.value) // 2)]).run()
+
+    def toggle_sort():
+        radio = next(r for r in at.radio if r.label == "Urutkan Bar Chart")
+        radio.set_value("Ascending" if radio.value == "Descending" else "Descending").run()
+
+    def change_box_filter():
+        selectbox = next(s for s in at.selectbox if s.label == "Pilih Variabel untuk Boxplot")
+        selectbox.set_value(_other_option(selectbox)).run()
+
+    def change_aps_province():
+        selectbox = at.selectbox(key="aps_selector")
+        selectbox.set_value(_other_option(selectbox)).run()
+
+    return [
+        ("rerun tanpa perubahan", at.run),
+        ("kurangi provinsi", narrow_provinces),
+        ("geser slider kemiskinan", move_slider),
+        ("tampilan TPT", _view(at, 1)),
+        ("ubah urutan", toggle_sort),
+        ("tampilan kemiskinan", _view(at, 3)),
+        ("tampilan boxplot", _view(at, 4)),
+        ("ganti variabel boxplot", change_box_filter),
+        ("tampilan APS", _view(at, 5)),
+        ("ganti provinsi APS", change_aps_province),
+        ("tampilan peta", _view(at, 0)),
+    ]
+
+
+def _run_app(data_file, cache_dir, results):
+    """Worker: jalankan dashboard dan kirim hasil per langkah lewat ``results``."""
+    os.environ["DASHBOARD_DATA_FILE"] = data_file
+    os.environ["DASHBOARD_CACHE_DIR"] = cache_dir
+    from streamlit.testing.v1 import AppTest
+
+    records = []
+    at = AppTest.from_file(APP_PATH, default_timeout=1800)
+    start = time.perf_counter()
+    at.run()
+    records.append(("start", time.perf_counter() - start, _peak_rss_kb(), _figure_bytes(at)))
+    if at.exception:
+        results.put({"error": str(at.exception[0].value), "records": records})
+        return
+
+    for name, step in scripted_steps(at):
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            # Mis. widget tidak ditemukan karena struktur halaman berubah
+            results.put({"error": f"{name}: {e!r}", "records": records})
+            return
+        records.append((name, time.perf_counter() - start, _peak_rss_kb(), _figure_bytes(at)))
+        if at.exception:
+            results.put({"error": f"{name}: {at.exception[0].value}", "records": records})
+            return
+    results.put({"error": None, "records": records})
+
+
+def measure(data_file, cache_dir):
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    proc = ctx.Process(target=_run_app, args=(data_file, cache_dir, results))
+    proc.start()
+    # Jangan menunggu selamanya jika worker mati (mis. kehabisan memori)
+    while True:
+        try:
+            outcome = results.get(timeout=1.0)
+            break
+        except queue.Empty:
+            if not proc.is_alive():
+                outcome = {"error": f"worker berhenti dengan kode {proc.exitcode}", "records": []}
+                break
+    proc.join()
+    return outcome
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(APP_PATH), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[38, 10000, 1000000],
+                        help="jumlah baris kab/kota per workbook sintetis")
+    parser.add_argument("--json", help="simpan hasil sebagai JSON lines ke file ini")
+    args = parser.parse_args()
+
+    commit = _commit()
+    results = []
+    failed = False
+    for size in args.sizes:
+        n_provinsi = max(38, size // 100)
+        with tempfile.TemporaryDirectory() as tmp:
+            data_file = write_workbook(os.path.join(tmp, "synthetic.xlsx"), size, n_provinsi)
+            cache_dir = os.path.join(tmp, "cache")
+            for phase in ("cold", "warm"):
+                outcome = measure(data_file, cache_dir)
+                for step, seconds, rss_kb, figure_bytes in outcome["records"]:
+                    results.append({
+                        "commit": commit, "rows": size, "provinces": n_provinsi, "phase": phase,
+                        "step": step, "seconds": seconds, "peak_rss_kb": rss_kb, "figure_bytes": figure_bytes,
+                    })
+                    print(f"{size:>9} rows  {phase:<4}  {step:<24} {seconds * 1000:9.1f} ms"
+                          f"  RSS {rss_kb / 1024:7.1f} MB  figure {figure_bytes / 1024:8.1f} KB")
+                if outcome["error"]:
+                    print(f"{size:>9} rows  {phase:<4}  GAGAL: {outcome['error']}", file=sys.stderr)
+                    failed = True
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for row in results:
+                f.write(json.dumps(row) + "\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
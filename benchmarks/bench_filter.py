@@ -0,0 +1,87 @@
+"""Benchmark filter sidebar: mask boolean pandas vs ``FilterIndex``.
+
+Jalankan dari root repo::
+
+    python -m benchmarks.bench_filter --sizes 38 10000 1000000
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import province_names
+from dashboard.filtering import FilterIndex
+
+
+def make_table(n_rows, n_provinsi, rng):
+    names = np.array(province_names(n_provinsi), dtype=object)
+    return pd.DataFrame({
+        "PROVINSI": names[rng.integers(0, n_provinsi, n_rows)],
+        "PENDUDUK_MISKIN": rng.gamma(2.0, 300.0, n_rows).round(2),
+    })
+
+
+def pandas_mask(data, provinces, value_range):
+    return data[
+        (data["PROVINSI"].isin(provinces)) &
+        (data["PENDUDUK_MISKIN"] >= value_range[0]) &
+        (data["PENDUDUK_MISKIN"] <= value_range[1])
+    ]
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[38, 10000, 1000000])
+    parser.add_argument("--provinces", type=int, default=38)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", help="simpan hasil sebagai JSON lines ke file ini")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    results = []
+    for size in args.sizes:
+        data = make_table(size, args.provinces, rng)
+        names = province_names(args.provinces)
+        provinces = names[: len(names) // 2]
+        value_range = tuple(np.quantile(data["PENDUDUK_MISKIN"], [0.25, 0.75]))
+
+        start = time.perf_counter()
+        index = FilterIndex(data)
+        build = time.perf_counter() - start
+
+        expected = pandas_mask(data, provinces, value_range)
+        rows = index.query(provinces, value_range)
+        assert np.array_equal(expected.index.to_numpy(), data.index.to_numpy()[rows])
+
+        timings = {
+            "pandas mask": best_time(lambda: pandas_mask(data, provinces, value_range), args.repeat),
+            "index query": best_time(lambda: index.query(provinces, value_range), args.repeat),
+            "index query+frame": best_time(
+                lambda: index.view(data, index.query(provinces, value_range)).frame(), args.repeat),
+        }
+        print(f"{size:>9} rows  build index {build * 1000:9.2f} ms")
+        for name, seconds in timings.items():
+            print(f"{size:>9} rows  {name:<17} {seconds * 1000:9.3f} ms")
+            results.append({"rows": size, "approach": name, "seconds": seconds})
+        results.append({"rows": size, "approach": "build index", "seconds": build})
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for row in results:
+                f.write(json.dumps(row) + "\n")
+
+
+if __name__ == "__main__":
+    main()
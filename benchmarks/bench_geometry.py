@@ -0,0 +1,78 @@
+"""Benchmark penyederhanaan batas wilayah dan payload peta choropleth.
+
+Untuk setiap jumlah titik tepi per wilayah dibuat GeoJSON sintetis
+(``benchmarks.synthetic.write_geojson``), lalu dicatat waktu
+penyederhanaan semua level (dan load ulang dari cache), serta per zoom:
+level terpilih, jumlah titik, ukuran JSON figure setelah diringkas, dan
+waktu membangun figure.
+
+Jalankan dari root repo::
+
+    python -m benchmarks.bench_geometry --vertices 1000 20000 --zooms 3 5 7 10
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+
+from benchmarks.synthetic import province_names, write_geojson
+from dashboard import figures
+from dashboard.geometry import RegionGeometry
+from dashboard.payload import slim_figure
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vertices", type=int, nargs="+", default=[1000, 20000])
+    parser.add_argument("--regions", type=int, default=38)
+    parser.add_argument("--zooms", type=int, nargs="+", default=[3, 5, 7, 10])
+    parser.add_argument("--json", help="simpan hasil sebagai JSON lines ke file ini")
+    args = parser.parse_args()
+
+    names = province_names(args.regions)
+    data = pd.DataFrame({"PROVINSI": names,
+                         "PENDUDUK_MISKIN": np.random.default_rng(0).gamma(2.0, 300.0, args.regions)})
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_vertices in args.vertices:
+            path = write_geojson(os.path.join(tmp, f"provinsi_{n_vertices}.geojson"), names, n_vertices)
+            cache_path = os.path.join(tmp, f"geometry_{n_vertices}.json")
+            start = time.perf_counter()
+            RegionGeometry.from_file(path, "provinsi", cache_path=cache_path)
+            simplify_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            geometry = RegionGeometry.from_file(path, "provinsi", cache_path=cache_path)
+            cached_seconds = time.perf_counter() - start
+            print(f"{n_vertices:>8} titik/wilayah  sederhanakan {simplify_seconds:6.2f} s"
+                  f"  dari cache {cached_seconds * 1000:8.1f} ms  (GeoJSON {os.path.getsize(path) / 1024:,.0f} KB)")
+
+            ids = geometry.match(data["PROVINSI"].tolist())
+            for zoom in args.zooms:
+                start = time.perf_counter()
+                collection = geometry.feature_collection(zoom, ids)
+                figure = figures.choropleth_figure(data, "PROVINSI", "PENDUDUK_MISKIN", ids, collection, zoom)
+                payload = pio.to_json(slim_figure(json.loads(figure.to_json())), validate=False)
+                seconds = time.perf_counter() - start
+                level = geometry.level(zoom, ids)
+                vertices = geometry.vertex_count(level, ids)
+                results.append({"vertices_per_region": n_vertices, "zoom": zoom, "level": level,
+                                "tolerance": geometry.tolerances[level], "figure_vertices": vertices,
+                                "payload_bytes": len(payload), "build_seconds": seconds,
+                                "simplify_seconds": simplify_seconds, "cached_seconds": cached_seconds})
+                print(f"    zoom {zoom:>2}  level {level} (toleransi {geometry.tolerances[level]:g})"
+                      f"  {vertices:>8} titik  {len(payload) / 1024:8.1f} KB  {seconds * 1000:8.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for row in results:
+                f.write(json.dumps(row) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+"""Load test: banyak sesi dashboard paralel dengan persentil latensi rerun.
+
+Dashboard dijalankan sebagai server ``streamlit run`` sungguhan di proses
+terpisah. Setiap sesi adalah klien websocket (``/_stcore/stream``) yang
+berbicara protokol yang sama dengan browser: mengirim ``BackMsg``
+``rerun_script`` berisi state widget, lalu membaca ``ForwardMsg`` sampai
+``script_finished``. Widget di dalam ``st.fragment`` memicu rerun
+fragment saja (``fragment_id``), seperti di browser. Sesi-sesi berjalan
+bersamaan, jadi server melayani rerun mereka paralel di thread-nya sendiri
+dengan ``st.cache_resource`` (dataset, index, cache figure) bersama.
+
+Untuk setiap tingkat konkurensi, semua sesi dimulai bersamaan lalu
+memutar ulang jejak interaksi: edit multiselect provinsi, geser slider
+penduduk miskin (beberapa rerun berturut-turut), pindah ke tab 4 / tab 6
+lalu ganti selectbox provinsinya, dan pindah tampilan lain.
+
+Jejak default dibuat acak (seed per sesi) dari pola di atas; ``--trace``
+memutar jejak dari file JSON (list langkah, mis.
+``[{"action": "view", "index": 3}, {"action": "selectbox", "key": "prov_detail_selector"}]``).
+Aksi yang dikenal: ``rerun``, ``view`` (``index``), ``multiselect``
+(``drop``/``add`` jumlah provinsi), ``slider`` (``low``/``high`` sebagai
+pecahan rentang), ``selectbox`` (``key``), dan ``think`` (``seconds``).
+
+Dilaporkan per tingkat konkurensi: p50/p95/p99/maks latensi rerun (kirim
+``rerun_script`` sampai ``script_finished``), median waktu start sesi,
+throughput (rerun per detik), RSS proses server, dan tambahan RSS server
+per sesi. Klien dan server berbagi CPU mesin yang sama; pada mesin satu
+core throughput tidak bisa naik dengan konkurensi.
+
+Mode ambang untuk CI: ``--max-p95``/``--max-p99`` (ms),
+``--min-throughput``, dan ``--max-errors``; exit code 1 jika ada tingkat
+yang melanggar.
+
+Jalankan dari root repo::
+
+    python -m benchmarks.bench_load --concurrency 1 2 4 8 --steps 20 --max-p95 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+
+from benchmarks.bench_app import APP_PATH
+from benchmarks.synthetic import write_workbook
+
+# Pola interaksi default dan bobotnya
+PATTERNS = {"multiselect": 0.25, "slider": 0.25, "tab4": 0.2, "tab6": 0.2, "view": 0.1}
+# Rerun berturut-turut untuk satu geseran slider
+DRAG_RERUNS = 3
+N_VIEWS = 8
+# Batas waktu satu rerun dan start server (detik)
+RERUN_TIMEOUT = 600
+SERVER_TIMEOUT = 120
+WIDGET_TYPES = ("radio", "selectbox", "multiselect", "slider")
+
+
+def _rss_kb(pid):
+    """RSS proses ``pid`` saat ini (KB); 0 jika ``/proc`` tidak tersedia."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(env, port):
+    """Jalankan ``streamlit run`` headless dan tunggu sampai health check menjawab."""
+    command = [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless", "true",
+               "--server.port", str(port), "--server.address", "127.0.0.1",
+               "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"]
+    server = subprocess.Popen(command, env=env, cwd=os.path.dirname(APP_PATH),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + SERVER_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server berhenti dengan kode {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("server tidak menjawab health check")
+
+
+class Session:
+    """Satu sesi browser tiruan: state widget dan websocket ke server."""
+
+    def __init__(self, url):
+        self.url = url
+        self.connection = None
+        # id widget -> (jenis, proto elemen, fragment_id) dari run terakhir
+        self.widgets = {}
+        # id widget -> WidgetState yang sudah diubah sesi ini
+        self.states = {}
+
+    async def connect(self):
+        from websockets.asyncio.client import connect
+
+        # Pesan figure bisa besar; tanpa batas ukuran seperti browser
+        self.connection = await connect(self.url, max_size=None)
+
+    async def close(self):
+        if self.connection is not None:
+            await self.connection.close()
+
+    async def rerun(self, fragment_id=""):
+        """Kirim ``rerun_script`` dan tunggu ``script_finished``; kembalikan pesan exception di halaman."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        message = BackMsg()
+        message.rerun_script.fragment_id = fragment_id
+        message.rerun_script.widget_states.widgets.extend(self.states.values())
+        await self.connection.send(message.SerializeToString())
+
+        if not fragment_id:
+            self.widgets = {}
+        exceptions = []
+        while True:
+            raw = await asyncio.wait_for(self.connection.recv(), RERUN_TIMEOUT)
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            kind = forward.WhichOneof("type")
+            if kind == "script_finished":
+                return exceptions
+            if kind != "delta" or forward.delta.WhichOneof("type") != "new_element":
+                continue
+            element = forward.delta.new_element
+            element_type = element.WhichOneof("type")
+            if element_type == "exception":
+                exceptions.append(element.exception.message)
+            elif element_type in WIDGET_TYPES:
+                widget = getattr(element, element_type)
+                self.widgets[widget.id] = (element_type, widget, forward.delta.fragment_id)
+
+    def find(self, kind, key=None, label=None):
+        """Widget pertama dengan jenis dan ``key``/awalan label tertentu, atau None."""
+        for widget_id, (element_type, widget, fragment_id) in self.widgets.items():
+            if element_type != kind:
+                continue
+            if key is not None and widget_id.endswith(f"-{key}"):
+                return widget_id, widget, fragment_id
+            if label is not None and widget.label.startswith(label):
+                return widget_id, widget, fragment_id
+        return None
+
+    async def set_value(self, found, field, value):
+        """Ubah nilai widget ``found`` lalu rerun (fragment saja jika widget ada di fragment)."""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget_id, _, fragment_id = found
+        state = WidgetState(id=widget_id)
+        if field in ("string_array_value", "double_array_value"):
+            getattr(state, field).data.extend(value)
+        else:
+            setattr(state, field, value)
+        self.states[widget_id] = state
+        return await self.rerun(fragment_id)
+
+    def current(self, found, field):
+        """Nilai widget saat ini: yang terakhir dikirim sesi ini, atau default dari server."""
+        widget_id, widget, _ = found
+        state = self.states.get(widget_id)
+        if state is not None:
+            value = getattr(state, field)
+            return list(value.data) if field.endswith("array_value") else value
+        if field == "string_array_value":
+            return [widget.options[i] for i in widget.default]
+        if field == "double_array_value":
+            return list(widget.default)
+        return widget.options[widget.default] if widget.HasField("default") else None
+
+
+def make_trace(rng, n_actions):
+    """Jejak interaksi acak (list langkah) dengan ``n_actions`` pola dari ``PATTERNS``."""
+    names, weights = zip(*PATTERNS.items())
+    trace = []
+    for pattern in rng.choices(names, weights, k=n_actions):
+        if pattern == "multiselect":
+            trace.append({"action": "multiselect", rng.choice(["drop", "add"]): rng.randint(1, 3)})
+        elif pattern == "slider":
+            # Geser batas bawah lalu atas sedikit demi sedikit, tiap lepas mouse satu rerun
+            low, high = rng.uniform(0, 0.3), rng.uniform(0.7, 1)
+            for i in range(DRAG_RERUNS):
+                shift = (i + 1) / DRAG_RERUNS * 0.1
+                trace.append({"action": "slider", "low": low + shift, "high": high - shift})
+        elif pattern in ("tab4", "tab6"):
+            trace.append({"action": "view", "index": 3 if pattern == "tab4" else 5})
+            key = "prov_detail_selector" if pattern == "tab4" else "aps_selector"
+            trace.extend({"action": "selectbox", "key": key} for _ in range(rng.randint(1, 2)))
+        else:
+            trace.append({"action": "view", "index": rng.randrange(N_VIEWS)})
+    return trace
+
+
+async def apply_step(session, step, rng):
+    """Jalankan satu langkah jejak; ``None`` jika tidak ada rerun, selain itu daftar exception."""
+    action = step["action"]
+    if action == "think":
+        await asyncio.sleep(step.get("seconds", 1.0))
+        return None
+    if action == "rerun":
+        return await session.rerun()
+    if action == "view":
+        radio = session.find("radio", key="active_view")
+        options = radio[1].options
+        return await session.set_value(radio, "string_value", options[step["index"] % len(options)])
+    if action == "multiselect":
+        multiselect = session.find("multiselect", label="Filter Provinsi Spesifik")
+        options = list(multiselect[1].options)
+        selected = session.current(multiselect, "string_array_value")
+        if step.get("drop"):
+            drop = set(rng.sample(selected, min(step["drop"], max(len(selected) - 1, 0))))
+            selected = [name for name in selected if name not in drop]
+        else:
+            missing = [name for name in options if name not in selected]
+            selected += rng.sample(missing, min(step.get("add", 1), len(missing)))
+        return await session.set_value(multiselect, "string_array_value", selected)
+    if action == "slider":
+        slider = session.find("slider", label="Range Penduduk Miskin")
+        span = slider[1].max - slider[1].min
+        low = slider[1].min + int(span * step.get("low", 0))
+        high = max(low, slider[1].min + int(span * step.get("high", 1)))
+        return await session.set_value(slider, "double_array_value", [low, high])
+    if action == "selectbox":
+        selectbox = session.find("selectbox", key=step["key"])
+        if selectbox is None:
+            # Tab belum aktif (mis. jejak dari file): tidak ada rerun
+            return None
+        current = session.current(selectbox, "string_value")
+        other = next((o for o in selectbox[1].options if o != current), current)
+        return await session.set_value(selectbox, "string_value", other)
+    raise ValueError(f"aksi tidak dikenal: {action!r}")
+
+
+async def run_session(url, trace, seed, start_event):
+    """Satu sesi yang memutar ``trace``; sesi dibiarkan terhubung sampai RSS diukur."""
+    rng = random.Random(seed)
+    session = Session(url)
+    latencies, errors = [], []
+    await start_event.wait()
+    started = time.perf_counter()
+    try:
+        await session.connect()
+        exceptions = await session.rerun()
+    except Exception as e:
+        return {"session": session, "start": time.perf_counter() - started, "latencies": [],
+                "errors": [f"start: {e!r}"]}
+    start_seconds = time.perf_counter() - started
+    if exceptions:
+        errors.append(f"start: {exceptions[0]}")
+    else:
+        for step in trace:
+            started = time.perf_counter()
+            try:
+                exceptions = await apply_step(session, step, rng)
+            except Exception as e:
+                errors.append(f"{step['action']}: {e!r}")
+                break
+            if exceptions is not None:
+                latencies.append(time.perf_counter() - started)
+            if exceptions:
+                errors.append(f"{step['action']}: {exceptions[0]}")
+                break
+    return {"session": session, "start": start_seconds, "latencies": latencies, "errors": errors}
+
+
+async def measure(url, server_pid, concurrency, traces, seed):
+    """Jalankan ``concurrency`` sesi bersamaan; kembalikan ringkasan satu tingkat."""
+    rss_before = _rss_kb(server_pid)
+    start_event = asyncio.Event()
+    tasks = [asyncio.create_task(run_session(url, traces[i % len(traces)], seed + i, start_event))
+             for i in range(concurrency)]
+    started = time.perf_counter()
+    start_event.set()
+    outcome = await asyncio.gather(*tasks)
+    wall = time.perf_counter() - started
+    rss_after = _rss_kb(server_pid)
+    for result in outcome:
+        await result["session"].close()
+
+    latencies = np.array([s for result in outcome for s in result["latencies"]])
+    errors = [error for result in outcome for error in result["errors"]]
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (np.nan,) * 3
+    return {
+        "concurrency": concurrency,
+        "reruns": int(len(latencies)),
+        "errors": len(errors),
+        "error_samples": errors[:3],
+        "p50_ms": float(p50) * 1000,
+        "p95_ms": float(p95) * 1000,
+        "p99_ms": float(p99) * 1000,
+        "max_ms": float(latencies.max()) * 1000 if len(latencies) else float("nan"),
+        "start_p50_ms": float(np.median([result["start"] for result in outcome])) * 1000,
+        "throughput_per_s": len(latencies) / wall if wall > 0 else float("nan"),
+        "wall_seconds": wall,
+        "rss_mb": rss_after / 1024,
+        "mem_per_session_mb": max(rss_after - rss_before, 0) / 1024 / concurrency,
+    }
+
+
+def violations(result, args):
+    """Daftar pelanggaran ambang CI untuk satu tingkat konkurensi."""
+    problems = []
+    if result["errors"] > args.max_errors:
+        problems.append(f"{result['errors']} error (maks {args.max_errors}): {result['error_samples']}")
+    if args.max_p95 is not None and not result["p95_ms"] <= args.max_p95:
+        problems.append(f"p95 {result['p95_ms']:.0f} ms > {args.max_p95:.0f} ms")
+    if args.max_p99 is not None and not result["p99_ms"] <= args.max_p99:
+        problems.append(f"p99 {result['p99_ms']:.0f} ms > {args.max_p99:.0f} ms")
+    if args.min_throughput is not None and not result["throughput_per_s"] >= args.min_throughput:
+        problems.append(f"throughput {result['throughput_per_s']:.2f}/s < {args.min_throughput:.2f}/s")
+    return problems
+
+
+def load_trace(path):
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        # JSON lines: satu langkah per baris
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+async def run_levels(url, server_pid, traces, args):
+    # Pemanasan: load dataset dan cache bersama di server tidak dihitung sebagai latensi sesi
+    started = time.perf_counter()
+    warmup = await run_session(url, [], args.seed, _set_event())
+    await warmup["session"].close()
+    if warmup["errors"]:
+        raise RuntimeError(f"pemanasan gagal: {warmup['errors'][0]}")
+    print(f"Pemanasan {time.perf_counter() - started:.1f} s, RSS server {_rss_kb(server_pid) / 1024:.0f} MB")
+
+    results = []
+    for concurrency in args.concurrency:
+        results.append(await measure(url, server_pid, concurrency, traces, args.seed))
+    return results
+
+
+def _set_event():
+    event = asyncio.Event()
+    event.set()
+    return event
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="jumlah sesi bersamaan per tingkat")
+    parser.add_argument("--steps", type=int, default=20, help="jumlah pola interaksi per sesi (jejak acak)")
+    parser.add_argument("--trace", help="file JSON/JSON lines berisi langkah yang diputar semua sesi")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data", help="workbook yang dipakai (default DASHBOARD_DATA_FILE/data_python.xlsx)")
+    parser.add_argument("--rows", type=int, help="pakai workbook sintetis dengan jumlah baris kab/kota ini")
+    parser.add_argument("--max-p95", type=float, help="ambang p95 latensi rerun (ms)")
+    parser.add_argument("--max-p99", type=float, help="ambang p99 latensi rerun (ms)")
+    parser.add_argument("--min-throughput", type=float, help="ambang minimum rerun per detik")
+    parser.add_argument("--max-errors", type=int, default=0, help="jumlah error sesi yang masih diterima")
+    parser.add_argument("--json", help="simpan hasil sebagai JSON lines ke file ini")
+    args = parser.parse_args()
+
+    if args.trace:
+        traces = [load_trace(args.trace)]
+    else:
+        traces = [make_trace(random.Random(args.seed + i), args.steps) for i in range(max(args.concurrency))]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        if args.rows:
+            args.data = write_workbook(os.path.join(tmp, "synthetic.xlsx"), args.rows, max(38, args.rows // 100))
+            env["DASHBOARD_CACHE_DIR"] = os.path.join(tmp, "cache")
+        if args.data:
+            env["DASHBOARD_DATA_FILE"] = os.path.abspath(args.data)
+
+        port = _free_port()
+        server = start_server(env, port)
+        try:
+            results = asyncio.run(run_levels(f"ws://127.0.0.1:{port}/_stcore/stream", server.pid, traces, args))
+        finally:
+            server.terminate()
+            server.wait()
+
+    failed = False
+    for result in results:
+        problems = violations(result, args)
+        result["passed"] = not problems
+        concurrency = result["concurrency"]
+        print(f"{concurrency:>4} sesi  {result['reruns']:>5} rerun  p50 {result['p50_ms']:8.1f} ms"
+              f"  p95 {result['p95_ms']:8.1f} ms  p99 {result['p99_ms']:8.1f} ms"
+              f"  {result['throughput_per_s']:6.2f} rerun/s  RSS server {result['rss_mb']:7.1f} MB"
+              f"  (+{result['mem_per_session_mb']:.1f} MB/sesi)")
+        for problem in problems:
+            print(f"{concurrency:>4} sesi  GAGAL: {problem}", file=sys.stderr)
+            failed = True
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for row in results:
+                f.write(json.dumps(row) + "\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Benchmark ukuran payload peta: titik per baris vs agregasi grid.
+
+Jalankan dari root repo::
+
+    python -m benchmarks.bench_map --sizes 38 10000 100000 --zoom 4
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard import figures
+from dashboard.mapping import grid_aggregate
+
+
+def make_points(n_points, rng):
+    return pd.DataFrame({
+        "PROVINSI": [f"TITIK {i}" for i in range(n_points)],
+        "PENDUDUK_MISKIN": rng.gamma(2.0, 30.0, n_points),
+        "TPT (%)": rng.uniform(1.0, 9.0, n_points),
+        "LATITUDE": rng.uniform(-10.0, 6.0, n_points),
+        "LONGITUDE": rng.uniform(95.0, 141.0, n_points),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[38, 10000, 100000])
+    parser.add_argument("--zoom", type=int, default=4)
+    parser.add_argument("--json", help="simpan hasil sebagai JSON lines ke file ini")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    results = []
+    for size in args.sizes:
+        data = make_points(size, rng)
+        builders = {
+            "Titik": lambda: figures.map_figure(data, "LATITUDE", "LONGITUDE", "PENDUDUK_MISKIN", args.zoom),
+            "Grid": lambda: figures.map_grid_figure(
+                grid_aggregate(data, "LATITUDE", "LONGITUDE", "PENDUDUK_MISKIN", args.zoom), args.zoom),
+        }
+        for mode, build in builders.items():
+            start = time.perf_counter()
+            payload = build().to_json()
+            seconds = time.perf_counter() - start
+            results.append({"points": size, "mode": mode, "bytes": len(payload), "seconds": seconds})
+            print(f"{size:>8} titik  {mode:<6} {len(payload) / 1024:10.1f} KB {seconds * 1000:9.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for row in results:
+                f.write(json.dumps(row) + "\n")
+
+
+if __name__ == "__main__":
+    main()
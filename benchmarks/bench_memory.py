@@ -0,0 +1,141 @@
+"""Anggaran alokasi memori per rerun kemiskinan.py (diukur dengan tracemalloc).
+
+Dashboard dijalankan headless lewat ``streamlit.testing.v1.AppTest`` dengan
+workbook sintetis, lalu setiap interaksi widget diukur puncak alokasinya.
+Selain puncak alokasi, dihitung juga DataFrame seukuran tabel provinsi yang
+dibuat selama rerun (salinan, ``take``, ``sort_values``, ...): satu salinan
+tabel sintetis hanya ~0,4 MB sehingga mudah tenggelam di angka puncak.
+Skrip keluar dengan kode 1 jika ada rerun yang melewati ``--budget-mb``
+atau ``--max-frames``.
+Anggaran default ikut diperiksa oleh ``python -m pytest``
+(``tests/test_memory_budget.py``), jadi CI cukup menjalankan pytest.
+
+Jalankan dari root repo::
+
+    python -m benchmarks.bench_memory --provinces 5000 --budget-mb 4 --max-frames 2
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+from benchmarks.synthetic import write_workbook
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "kemiskinan.py")
+
+
+def _poverty_slider(at):
+    return next(s for s in at.slider if s.label.startswith("Range Penduduk Miskin"))
+
+
+@contextmanager
+def count_frames(min_rows):
+    """Hitung DataFrame dengan minimal ``min_rows`` baris yang dibuat di dalam blok.
+
+    Semua operasi pandas yang menghasilkan DataFrame baru (``copy``, ``take``,
+    ``sort_values``, ``merge``, ...) memanggil ``__finalize__`` pada hasilnya.
+    """
+    counted = []
+    original = pd.DataFrame.__finalize__
+
+    def finalize(self, other, method=None, **kwargs):
+        if len(self) >= min_rows:
+            counted.append(method)
+        return original(self, other, method=method, **kwargs)
+
+    pd.DataFrame.__finalize__ = finalize
+    try:
+        yield counted
+    finally:
+        pd.DataFrame.__finalize__ = original
+
+
+def interactions(at):
+    """Urutan interaksi yang diukur: (nama, fungsi yang menjalankan rerun)."""
+    def move_slider():
+        slider = _poverty_slider(at)
+        low, high = slider.value
+        slider.set_value((low + (high - low) // 4, high - (high - low) // 4)).run()
+
+    def narrow_provinces():
+        multiselect = at.multiselect[0]
+        multiselect.set_value(multiselect.value[: max(1, len(multiselect.value) // 2)]).run()
+
+    def toggle_sort():
+        # Urutan hanya dibaca bar chart Top 10 (tab TPT dan kemiskinan)
+        radio = next(r for r in at.radio if r.label == "Urutkan Bar Chart")
+        radio.set_value("Ascending" if radio.value == "Descending" else "Descending").run()
+
+    def show_view(index):
+        def switch():
+            radio = at.radio(key="active_view")
+            radio.set_value(radio.options[index]).run()
+        return switch
+
+    def rerun_unchanged():
+        at.run()
+
+    # Tab Top 10 dulu saat semua provinsi masih terpilih (frame hasil filter = tabel penuh),
+    # baru filter dipersempit
+    return [
+        ("rerun tanpa perubahan", rerun_unchanged),
+        ("tampilan TPT", show_view(1)),
+        ("ubah urutan TPT", toggle_sort),
+        ("tampilan kemiskinan", show_view(3)),
+        ("ubah urutan kemiskinan", toggle_sort),
+        ("geser slider kemiskinan", move_slider),
+        ("kurangi provinsi", narrow_provinces),
+        ("tampilan peta", show_view(0)),
+        ("rerun tanpa perubahan", rerun_unchanged),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--provinces", type=int, default=5000, help="baris DATA_PROVINSI sintetis")
+    parser.add_argument("--kabkota", type=int, default=20000, help="baris kab/kota sintetis")
+    parser.add_argument("--budget-mb", type=float, default=4.0, help="batas puncak alokasi per rerun")
+    # Rerun Top 10 saat ini: satu take (FilteredView.frame) dan satu salinan di dalam nlargest
+    parser.add_argument("--max-frames", type=int, default=2,
+                        help="batas DataFrame seukuran tabel provinsi yang dibuat per rerun")
+    args = parser.parse_args()
+
+    from streamlit.testing.v1 import AppTest
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DASHBOARD_DATA_FILE"] = write_workbook(
+            os.path.join(tmp, "synthetic.xlsx"), args.kabkota, args.provinces)
+        os.environ["DASHBOARD_CACHE_DIR"] = os.path.join(tmp, "cache")
+
+        at = AppTest.from_file(APP_PATH, default_timeout=300)
+        at.run()  # cold start: load data, bangun index dan cache
+        if at.exception:
+            print(at.exception[0].value, file=sys.stderr)
+            return 2
+
+        tracemalloc.start()
+        over_budget = False
+        for name, action in interactions(at):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            # Separuh tabel: baris total nasional dan filter ringan tetap terhitung "seukuran tabel"
+            with count_frames(args.provinces // 2) as frames:
+                action()
+            _, peak = tracemalloc.get_traced_memory()
+            peak_mb = (peak - before) / (1024 * 1024)
+            over = peak_mb > args.budget_mb or len(frames) > args.max_frames
+            over_budget |= over
+            print(f"{name:<26} puncak alokasi {peak_mb:8.2f} MB  frame penuh {len(frames)}"
+                  f"  {'MELEBIHI ANGGARAN' if over else 'OK'}")
+        tracemalloc.stop()
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
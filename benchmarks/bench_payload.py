@@ -0,0 +1,65 @@
+"""Benchmark ukuran JSON figure sebelum dan sesudah diringkas (``dashboard.payload``).
+
+Untuk setiap jumlah titik dibangun figure peta (titik, grid, densitas),
+bar TPT, dan boxplot dari data acak, lalu dicatat ukuran JSON asli,
+ukuran setelah ``slim_figure`` (dengan dan tanpa typed array), serta
+waktu peringkasan.
+
+Jalankan dari root repo::
+
+    python -m benchmarks.bench_payload --sizes 38 10000 100000
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import plotly.io as pio
+
+from benchmarks.bench_map import make_points
+from dashboard import figures
+from dashboard.mapping import grid_aggregate
+from dashboard.payload import slim_figure
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[38, 10000, 100000])
+    parser.add_argument("--zoom", type=int, default=4)
+    parser.add_argument("--json", help="simpan hasil sebagai JSON lines ke file ini")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    results = []
+    for size in args.sizes:
+        data = make_points(size, rng)
+        builders = {
+            "peta titik": lambda: figures.map_figure(data, "LATITUDE", "LONGITUDE", "PENDUDUK_MISKIN", args.zoom),
+            "peta grid": lambda: figures.map_grid_figure(
+                grid_aggregate(data, "LATITUDE", "LONGITUDE", "PENDUDUK_MISKIN", args.zoom), args.zoom),
+            "peta densitas": lambda: figures.map_density_figure(
+                data, "LATITUDE", "LONGITUDE", "PENDUDUK_MISKIN", args.zoom),
+            "bar TPT": lambda: figures.tpt_bar(data, ascending=False),
+            "boxplot": lambda: figures.box_figure(data, "TPT (%)"),
+        }
+        for name, build in builders.items():
+            figure = json.loads(build().to_json())
+            raw_bytes = len(pio.to_json(figure, validate=False))
+            start = time.perf_counter()
+            slim_bytes = len(pio.to_json(slim_figure(figure, typed_arrays=False), validate=False))
+            seconds = time.perf_counter() - start
+            typed_bytes = len(json.dumps(slim_figure(figure, typed_arrays=True), separators=(",", ":")))
+            results.append({"points": size, "figure": name, "raw_bytes": raw_bytes, "slim_bytes": slim_bytes,
+                            "typed_bytes": typed_bytes, "slim_seconds": seconds})
+            print(f"{size:>8} titik  {name:<14} {raw_bytes / 1024:10.1f} KB -> {slim_bytes / 1024:10.1f} KB"
+                  f"  (typed array {typed_bytes / 1024:10.1f} KB)  {seconds * 1000:8.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for row in results:
+                f.write(json.dumps(row) + "\n")
+
+
+if __name__ == "__main__":
+    main()
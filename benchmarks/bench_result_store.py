@@ -0,0 +1,74 @@
+"""Benchmark cache figure dua tingkat: build baru vs store disk vs memori.
+
+Untuk setiap jumlah titik, figure peta dan bar TPT dibangun sekali lewat
+``FigureCache`` dengan ``ResultStore`` di folder sementara (miss), lalu
+diambil lagi dari ``FigureCache`` baru yang memakai file store yang sama
+(seperti proses baru setelah deploy: hit disk), lalu sekali lagi dari
+memori.
+
+Jalankan dari root repo::
+
+    python -m benchmarks.bench_result_store --sizes 38 10000 100000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_map import make_points
+from dashboard import figures
+from dashboard.figcache import FigureCache, make_key
+from dashboard.resultstore import ResultStore
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[38, 10000, 100000])
+    parser.add_argument("--json", help="simpan hasil sebagai JSON lines ke file ini")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.sqlite")
+        for size in args.sizes:
+            data = make_points(size, rng)
+            builders = {
+                "peta titik": lambda: figures.map_figure(data, "LATITUDE", "LONGITUDE", "PENDUDUK_MISKIN"),
+                "bar TPT": lambda: figures.tpt_bar(data, ascending=False),
+            }
+            for name, build in builders.items():
+                key = make_key(name, size)
+                cold = FigureCache(store=ResultStore(path))
+                build_seconds = timed(lambda: cold.get_or_build(key, build, version="v"))
+                # Proses baru: memori kosong, store disk sama
+                warm = FigureCache(store=ResultStore(path))
+                disk_seconds = timed(lambda: warm.get_or_build(key, build, version="v"))
+                memory_seconds = timed(lambda: warm.get_or_build(key, build, version="v"))
+                assert warm.stats()["disk_hits"] == 1 and warm.stats()["misses"] == 0
+                stored = warm.store.stats()["bytes"]
+                results.append({"points": size, "figure": name, "build_seconds": build_seconds,
+                                "disk_seconds": disk_seconds, "memory_seconds": memory_seconds,
+                                "store_bytes": stored})
+                print(f"{size:>8} titik  {name:<10}  build {build_seconds * 1000:8.1f} ms"
+                      f"  disk {disk_seconds * 1000:8.1f} ms  memori {memory_seconds * 1000:8.1f} ms"
+                      f"  (store {stored / 1024:,.0f} KB)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for row in results:
+                f.write(json.dumps(row) + "\n")
+
+
+if __name__ == "__main__":
+    main()
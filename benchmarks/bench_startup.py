@@ -0,0 +1,167 @@
+"""Benchmark waktu impor dan overhead rerun dashboard.
+
+Dua bagian:
+
+* ``impor``: waktu impor setiap modul di ``IMPORT_MODULES``, masing-masing
+  di interpreter baru setelah streamlit/pandas/numpy sudah dimuat (biaya
+  yang memang dibayar setiap proses server). Dicatat juga apakah
+  ``dashboard.app`` ikut memuat Plotly Express (seharusnya tidak; baru
+  dimuat di tab yang membangun figure).
+* ``rerun``: di proses baru, dashboard dijalankan sekali (start, termasuk
+  impor dan load data) lalu ``--reruns`` kali tanpa perubahan widget;
+  dilaporkan median dan p95 rerun. Diukur untuk dua bentuk script:
+  ``entry`` (``kemiskinan.py`` yang hanya memanggil ``dashboard.app.main``)
+  dan ``monolitik`` (isi ``dashboard/app.py`` dijalankan sebagai script,
+  seperti sebelum dipecah: semua definisi, dekorator, dan konstanta
+  dibangun ulang setiap rerun). Bytecode script di-cache bersama seperti
+  di server (lihat ``share_script_cache``).
+
+Store figure di disk dimatikan agar kedua bentuk script sebanding. Waktu
+impor mengasumsikan bytecode (``.pyc``) sudah ada; dengan
+``PYTHONDONTWRITEBYTECODE`` jalankan ``python -m compileall -q .`` dulu.
+
+Jalankan dari root repo::
+
+    python -m benchmarks.bench_startup --reruns 30 --json bench_startup.jsonl
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_app import APP_PATH
+from benchmarks.synthetic import write_workbook
+
+MODULE_PATH = os.path.join(os.path.dirname(APP_PATH), "dashboard", "app.py")
+BASE_IMPORTS = "import streamlit, pandas, numpy"
+IMPORT_MODULES = ["dashboard.app", "dashboard.figures", "plotly.express", "dashboard.api", "dashboard.dataset"]
+SCRIPTS = ("entry", "monolitik")
+
+_IMPORT_PROBE = """
+import sys, time
+{base}
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, "plotly.express" in sys.modules)
+"""
+
+
+def import_seconds(module, repeat):
+    """Median waktu impor ``module`` di ``repeat`` interpreter baru, dan apakah Plotly Express ikut dimuat."""
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _IMPORT_PROBE.format(base=BASE_IMPORTS, module=module)],
+                             capture_output=True, text=True, check=True, cwd=os.path.dirname(APP_PATH))
+        seconds, plotly_loaded = out.stdout.split()
+        samples.append(float(seconds))
+    return statistics.median(samples), plotly_loaded == "True"
+
+
+def share_script_cache():
+    """Satu ``ScriptCache`` untuk semua run ``AppTest``, seperti server yang mem-parse script sekali.
+
+    Tanpa ini ``AppTest`` membuat cache bytecode baru di setiap run
+    sehingga biaya parse script ikut terhitung di setiap rerun.
+    """
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import local_script_runner
+
+    shared = ScriptCache()
+    local_script_runner.ScriptCache = lambda: shared
+
+
+def _run_reruns(script, data_file, cache_dir, reruns, results):
+    """Worker: start dashboard lalu rerun tanpa perubahan; kirim waktu per run lewat ``results``."""
+    os.environ["DASHBOARD_DATA_FILE"] = data_file
+    os.environ["DASHBOARD_CACHE_DIR"] = cache_dir
+    os.environ["DASHBOARD_RESULT_CACHE"] = "off"
+    from streamlit.testing.v1 import AppTest
+
+    share_script_cache()
+    if script == "entry":
+        at = AppTest.from_file(APP_PATH, default_timeout=1800)
+    else:
+        with open(MODULE_PATH, encoding="utf-8") as f:
+            at = AppTest.from_string(f.read() + "\nmain()\n", default_timeout=1800)
+
+    times = []
+    for _ in range(reruns + 1):
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+        if at.exception:
+            results.put({"error": str(at.exception[0].value), "times": times})
+            return
+    results.put({"error": None, "times": times})
+
+
+def measure_reruns(script, data_file, cache_dir, reruns):
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    proc = ctx.Process(target=_run_reruns, args=(script, data_file, cache_dir, reruns, results))
+    proc.start()
+    while True:
+        try:
+            outcome = results.get(timeout=1.0)
+            break
+        except queue.Empty:
+            if not proc.is_alive():
+                outcome = {"error": f"worker berhenti dengan kode {proc.exitcode}", "times": []}
+                break
+    proc.join()
+    return outcome
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=IMPORT_MODULES, help="modul yang diukur waktu impornya")
+    parser.add_argument("--repeat", type=int, default=5, help="jumlah interpreter baru per modul")
+    parser.add_argument("--reruns", type=int, default=30, help="jumlah rerun tanpa perubahan per script")
+    parser.add_argument("--rows", type=int, default=1000, help="jumlah baris kab/kota workbook sintetis")
+    parser.add_argument("--data", help="pakai workbook ini, bukan workbook sintetis")
+    parser.add_argument("--json", help="simpan hasil sebagai JSON lines ke file ini")
+    args = parser.parse_args()
+
+    results = []
+    failed = False
+    for module in args.modules:
+        seconds, plotly_loaded = import_seconds(module, args.repeat)
+        results.append({"part": "import", "module": module, "seconds": seconds, "plotly_express": plotly_loaded})
+        print(f"impor {module:<20} {seconds * 1000:8.1f} ms  Plotly Express dimuat: {'ya' if plotly_loaded else 'tidak'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = args.data or write_workbook(os.path.join(tmp, "synthetic.xlsx"), args.rows,
+                                                max(38, args.rows // 100))
+        for script in SCRIPTS:
+            # Cache kolumnar per script, agar start keduanya sama-sama dari workbook yang belum di-cache
+            outcome = measure_reruns(script, data_file, os.path.join(tmp, f"cache-{script}"), args.reruns)
+            if outcome["error"]:
+                print(f"rerun {script:<10} GAGAL: {outcome['error']}", file=sys.stderr)
+                failed = True
+                continue
+            start, reruns = outcome["times"][0], np.array(outcome["times"][1:])
+            row = {"part": "rerun", "script": script, "start_seconds": start,
+                   "rerun_p50_seconds": float(np.percentile(reruns, 50)),
+                   "rerun_p95_seconds": float(np.percentile(reruns, 95)), "reruns": len(reruns)}
+            results.append(row)
+            print(f"rerun {script:<10} start {start * 1000:8.1f} ms  rerun p50 {row['rerun_p50_seconds'] * 1000:7.1f} ms"
+                  f"  p95 {row['rerun_p95_seconds'] * 1000:7.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for row in results:
+                f.write(json.dumps(row) + "\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
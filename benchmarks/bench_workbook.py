@@ -0,0 +1,74 @@
+"""Benchmark parsing workbook: tiga kali ``pd.read_excel`` vs reader single-pass.
+
+Jalankan dari root repo::
+
+    python -m benchmarks.bench_workbook --sizes 540 10000 100000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import write_workbook
+from dashboard.workbook import read_workbook
+
+SHEETS = ["DATA_PROVINSI", "KEMISKINAN_KABKOTA", "TPAK_JENISKELAMIN"]
+
+
+def read_three_times(path):
+    return {sheet: pd.read_excel(path, sheet_name=sheet) for sheet in SHEETS}
+
+
+def read_sheet_list(path):
+    return pd.read_excel(path, sheet_name=SHEETS)
+
+
+def read_single_pass(path):
+    return read_workbook(path, SHEETS)
+
+
+APPROACHES = {
+    "read_excel x3": read_three_times,
+    "read_excel sheet_name=[...]": read_sheet_list,
+    "openpyxl read_only": read_single_pass,
+}
+
+
+def best_time(func, path, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[540, 10000, 100000],
+                        help="jumlah baris kab/kota per workbook sintetis")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="simpan hasil sebagai JSON lines ke file ini")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = write_workbook(os.path.join(tmp, f"synthetic_{size}.xlsx"), size)
+            for name, func in APPROACHES.items():
+                seconds = best_time(func, path, args.repeat)
+                results.append({"rows_kabkota": size, "approach": name, "seconds": seconds})
+                print(f"{size:>8} rows  {name:<28} {seconds * 1000:10.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for row in results:
+                f.write(json.dumps(row) + "\n")
+
+
+if __name__ == "__main__":
+    main()
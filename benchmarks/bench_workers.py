@@ -0,0 +1,102 @@
+"""Benchmark memori beberapa proses worker yang memuat dataset yang sama.
+
+Setiap worker memuat workbook sintetis lalu membaca semua kolom angka,
+kemudian melaporkan RSS dan PSS (Proportional Set Size, halaman bersama
+dibagi rata antar proses) dari ``/proc/self/smaps_rollup``. Dengan cache
+memory-map, total PSS seharusnya hampir datar saat jumlah worker naik;
+dengan ``read_workbook`` biasa setiap worker menyimpan salinan sendiri.
+Hanya berjalan di Linux.
+
+Jalankan dari root repo::
+
+    python -m benchmarks.bench_workers --rows 200000 --workers 1 2 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+
+import numpy as np
+
+from benchmarks.synthetic import write_workbook
+from dashboard.cache import load_workbook_cached
+from dashboard.workbook import read_workbook
+
+SHEETS = ["DATA_PROVINSI", "KEMISKINAN_KABKOTA", "TPAK_JENISKELAMIN"]
+
+
+def _memory_kb():
+    usage = {}
+    with open("/proc/self/smaps_rollup", encoding="ascii") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                usage[parts[0][:-1].lower()] = int(parts[1])
+    return usage
+
+
+def _worker(mode, path, cache_dir, ready, done, results):
+    if mode == "mmap":
+        frames, _ = load_workbook_cached(path, SHEETS, cache_dir=cache_dir)
+    else:
+        frames = read_workbook(path, SHEETS)
+    # Sentuh semua kolom angka agar halamannya benar-benar dimuat
+    for df in frames.values():
+        for col in df.columns:
+            values = df[col].to_numpy()
+            if values.dtype.kind == "f":
+                float(np.nansum(values))
+    ready.wait()
+    results.put(_memory_kb())
+    done.wait()
+
+
+def measure(mode, path, cache_dir, n_workers):
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Barrier(n_workers + 1)
+    done = ctx.Barrier(n_workers + 1)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(mode, path, cache_dir, ready, done, results))
+             for _ in range(n_workers)]
+    for p in procs:
+        p.start()
+    # Semua worker diukur saat masih hidup bersamaan agar PSS terbagi dengan benar
+    ready.wait()
+    usage = [results.get() for _ in procs]
+    done.wait()
+    for p in procs:
+        p.join()
+    return {"rss_kb": sum(u["rss"] for u in usage), "pss_kb": sum(u["pss"] for u in usage)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000, help="baris kab/kota pada workbook sintetis")
+    parser.add_argument("--provinces", type=int, default=38)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--json", help="simpan hasil sebagai JSON lines ke file ini")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_workbook(os.path.join(tmp, "synthetic.xlsx"), args.rows, args.provinces)
+        cache_dir = os.path.join(tmp, "cache")
+        load_workbook_cached(path, SHEETS, cache_dir=cache_dir)  # bangun cache sekali
+
+        for mode in ("copy", "mmap"):
+            for n_workers in args.workers:
+                usage = measure(mode, path, cache_dir, n_workers)
+                results.append({"mode": mode, "workers": n_workers, **usage})
+                print(f"{mode:<5} {n_workers:>3} worker  RSS {usage['rss_kb'] / 1024:8.1f} MB"
+                      f"  PSS {usage['pss_kb'] / 1024:8.1f} MB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for row in results:
+                f.write(json.dumps(row) + "\n")
+
+
+if __name__ == "__main__":
+    main()
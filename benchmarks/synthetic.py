@@ -0,0 +1,115 @@
+"""Pembuat workbook sintetis dengan struktur sama seperti data_python.xlsx.
+
+Dengan ``n_years`` lebih dari satu, setiap sheet mendapat kolom ``TAHUN``
+dan memuat satu blok baris per tahun (format panjang seperti rilis BPS).
+``write_geojson`` membuat batas wilayah sintetis (sel grid dengan tepi
+berkelok) untuk menguji peta choropleth tanpa file GeoJSON asli.
+"""
+
+import json
+
+import numpy as np
+from openpyxl import Workbook
+
+PROVINSI_COLUMNS = [
+    "PROVINSI", "PENDUDUK_MISKIN", "TPT (%)", "7-12", "13-15", "16-18", "19-23",
+    "LATITUDE", "LONGITUDE",
+]
+KABKOTA_COLUMNS = ["Provinsi", "Kota/Kab", "Jumlah Penduduk Miskin (Ribu Jiwa)"]
+TPAK_COLUMNS = ["PROVINSI", "LAKI-LAKI", "PEREMPUAN"]
+
+
+def province_names(n_provinsi):
+    return [f"PROVINSI {i:05d}" for i in range(n_provinsi)]
+
+
+def _drift(rng, values, n_years):
+    """Nilai per tahun: nilai awal dikalikan perubahan acak kumulatif (maks. +-5% per tahun)."""
+    if n_years == 1:
+        # Tanpa mengambil angka acak tambahan agar workbook satu tahun tetap sama
+        return values[np.newaxis].round(2)
+    factors = np.cumprod(rng.uniform(0.95, 1.05, (n_years,) + values.shape), axis=0)
+    factors[0] = 1.0
+    return (values * factors).round(2)
+
+
+def write_workbook(path, n_kabkota, n_provinsi=38, seed=0, n_years=1, last_year=2024):
+    """Tulis workbook sintetis dengan ``n_provinsi`` provinsi dan ``n_kabkota`` baris kab/kota.
+
+    ``n_years > 1`` menambah kolom ``TAHUN`` dengan tahun ``last_year - n_years + 1``
+    sampai ``last_year``; jumlah baris per tahun tetap sama.
+    """
+    rng = np.random.default_rng(seed)
+    names = province_names(n_provinsi)
+    years = list(range(last_year - n_years + 1, last_year + 1))
+    year_cols = ["TAHUN"] if n_years > 1 else []
+
+    def year_cell(year):
+        return [year] if n_years > 1 else []
+
+    wb = Workbook(write_only=True)
+
+    ws = wb.create_sheet("DATA_PROVINSI")
+    ws.append(PROVINSI_COLUMNS + year_cols)
+    poverty = _drift(rng, rng.gamma(2.0, 300.0, n_provinsi), n_years)
+    tpt = _drift(rng, rng.uniform(1.0, 9.0, n_provinsi), n_years)
+    aps = _drift(rng, rng.uniform([95, 85, 60, 15], [100, 99, 90, 45], (n_provinsi, 4)), n_years)
+    lat = rng.uniform(-10.0, 6.0, n_provinsi).round(4)
+    lon = rng.uniform(95.0, 141.0, n_provinsi).round(4)
+    for t, year in enumerate(years):
+        for i, name in enumerate(names):
+            ws.append([name, poverty[t, i], tpt[t, i], *aps[t, i], lat[i], lon[i]] + year_cell(year))
+
+    ws = wb.create_sheet("KEMISKINAN_KABKOTA")
+    ws.append(KABKOTA_COLUMNS + year_cols)
+    kab_poverty = _drift(rng, rng.gamma(2.0, 25.0, n_kabkota), n_years)
+    owners = np.sort(rng.integers(0, n_provinsi, n_kabkota))
+    for t, year in enumerate(years):
+        for i in range(n_kabkota):
+            # Sebagian kecil sel berisi '-' seperti data BPS asli
+            value = "-" if i % 50 == 49 else kab_poverty[t, i]
+            ws.append([names[owners[i]], f"Kab {i:06d}", value] + year_cell(year))
+
+    ws = wb.create_sheet("TPAK_JENISKELAMIN")
+    ws.append(TPAK_COLUMNS + year_cols)
+    male = _drift(rng, rng.uniform(75.0, 92.0, n_provinsi), n_years)
+    female = _drift(rng, rng.uniform(45.0, 80.0, n_provinsi), n_years)
+    for t, year in enumerate(years):
+        for i, name in enumerate(names):
+            ws.append([name, male[t, i], female[t, i]] + year_cell(year))
+
+    wb.save(path)
+    return path
+
+
+def region_features(names, n_vertices, seed=0, bounds=(95.0, -10.0, 141.0, 6.0)):
+    """Fitur GeoJSON sintetis: satu sel grid per nama dengan ``n_vertices`` titik tepi berkelok."""
+    rng = np.random.default_rng(seed)
+    lon_min, lat_min, lon_max, lat_max = bounds
+    columns = int(np.ceil(np.sqrt(len(names) * (lon_max - lon_min) / (lat_max - lat_min))))
+    rows = int(np.ceil(len(names) / columns))
+    width, height = (lon_max - lon_min) / columns, (lat_max - lat_min) / rows
+    features = []
+    for i, name in enumerate(names):
+        x0, y0 = lon_min + (i % columns) * width, lat_min + (i // columns) * height
+        # Keliling sel sebagai parameter t in [0, 4), lalu digeser acak tegak lurus tepi
+        t = np.linspace(0.0, 4.0, n_vertices, endpoint=False)
+        side, frac = np.floor(t).astype(int), t % 1.0
+        x = np.choose(side, [frac, np.ones_like(t), 1 - frac, np.zeros_like(t)])
+        y = np.choose(side, [np.zeros_like(t), frac, np.ones_like(t), 1 - frac])
+        wiggle = np.cumsum(rng.normal(0.0, 0.01, n_vertices))
+        wiggle = 0.05 * np.clip(wiggle - wiggle.mean(), -1.0, 1.0)
+        cx, cy = x - 0.5, y - 0.5
+        scale = 0.9 + wiggle / np.maximum(np.hypot(cx, cy), 1e-9)
+        ring = np.stack([x0 + width * (0.5 + cx * scale), y0 + height * (0.5 + cy * scale)], axis=1)
+        ring = np.vstack([ring, ring[:1]]).round(6)
+        features.append({"type": "Feature", "properties": {"PROVINSI": name},
+                         "geometry": {"type": "Polygon", "coordinates": [ring.tolist()]}})
+    return features
+
+
+def write_geojson(path, names, n_vertices, seed=0):
+    """Tulis FeatureCollection sintetis (lihat ``region_features``)."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": region_features(names, n_vertices, seed)}, f)
+    return path
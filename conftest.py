@@ -0,0 +1 @@
+"""Konfigurasi pytest: root repo ada di ``sys.path`` agar paket ``dashboard`` bisa diimpor."""
@@ -0,0 +1 @@
+"""Modul pendukung Dashboard Kemiskinan Indonesia (kemiskinan.py)."""
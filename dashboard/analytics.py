@@ -0,0 +1,205 @@
+"""Analisis lintas indikator: korelasi, peringkat, outlier z-score, selisih TPAK.
+
+Semua indikator (penduduk miskin, TPT, APS per kelompok usia, TPAK
+laki-laki dan perempuan, serta selisih TPAK laki-laki − perempuan)
+disusun sekali per versi data menjadi satu matriks ``baris × indikator``.
+Data TPAK digabung ke data provinsi lewat kolom ``PROVINSI``.
+
+Korelasi dihitung pairwise-complete (pasangan nilai yang dua-duanya ada)
+dari jumlah aditif hasil perkalian matriks: jumlah pasangan valid,
+jumlah nilai, jumlah kuadrat, dan jumlah hasil kali. Nilai dipusatkan
+dulu pada rata-rata seluruh tabel agar jumlah kuadrat tidak kehilangan
+presisi. Karena jumlahnya aditif, saat subset baris (filter provinsi)
+berubah, jumlah subset baru cukup diperbarui dari subset sebelumnya
+dengan menambah baris yang masuk dan mengurangi baris yang keluar; biaya
+ikut jumlah baris yang berubah, bukan ukuran tabel.
+"""
+
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from dashboard.storage import widen_values
+
+GAP_COLUMN = "GAP TPAK (L-P)"
+# Batas |z| untuk menandai outlier
+OUTLIER_Z = 2.0
+
+# correlation/counts: indikator × indikator; ranks/zscores: baris subset × indikator;
+# outliers: baris panjang (nama, indikator, nilai, z)
+AnalyticsResult = namedtuple("AnalyticsResult", ["correlation", "counts", "ranks", "zscores", "outliers"])
+
+
+def indicator_columns(roles):
+    """Kolom indikator provinsi dan TPAK sesuai peran kolomnya (urutan tampil)."""
+    provinsi = roles.get("provinsi", {})
+    tpak = roles.get("tpak", {})
+    columns = [provinsi.get(role) for role in ("poverty", "tpt")] + list(provinsi.get("aps", []))
+    return [col for col in columns if col], [tpak.get(role) for role in ("male", "female") if tpak.get(role)]
+
+
+def _pair_sums(values, valid):
+    """Jumlah aditif untuk korelasi pairwise: (n, sx, sxx, sxy) berbentuk k × k.
+
+    ``sx[i, j]`` adalah jumlah indikator ``i`` pada baris yang indikator
+    ``j``-nya juga valid; ``sxx`` sama untuk kuadratnya.
+    """
+    mask = valid.astype(np.float64)
+    return (mask.T @ mask, values.T @ mask, (values * values).T @ mask, values.T @ values)
+
+
+class IndicatorAnalytics:
+    """Matriks indikator satu tabel (per versi data) dan analisisnya per subset baris.
+
+    Aman dipakai bersama banyak sesi; jumlah subset terakhir disimpan agar
+    perubahan filter berikutnya bisa dihitung secara inkremental.
+    """
+
+    def __init__(self, names, columns, values):
+        self.names = np.asarray(names, dtype=object)
+        self.columns = list(columns)
+        values = np.asarray(values, dtype=np.float64)
+        self.values = values
+        self.valid = ~np.isnan(values)
+        # Dipusatkan pada rata-rata seluruh tabel; nilai kosong menjadi 0 (tidak ikut dijumlah)
+        self.center = np.array([values[self.valid[:, j], j].mean() if self.valid[:, j].any() else 0.0
+                                for j in range(values.shape[1])])
+        self._centered = np.where(self.valid, values - self.center, 0.0)
+        self.index = pd.Index(self.names)
+        # Urutan menurun per indikator (kosong di akhir) dan awal kelompok nilai sama,
+        # dihitung sekali agar peringkat subset tidak perlu mengurutkan ulang.
+        # Disimpan indikator × baris agar tiap indikator berurutan di memori.
+        self._order = np.argsort(-values.T, axis=1, kind="stable")
+        ordered = np.take_along_axis(values.T, self._order, axis=1)
+        new_run = np.ones(ordered.shape, dtype=bool)
+        new_run[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+        positions = np.arange(len(values))
+        self._run_start = np.maximum.accumulate(np.where(new_run, positions, 0), axis=1)
+        self._ordered_valid = ~np.isnan(ordered)
+        self._lock = threading.Lock()
+        self._last = None  # (mask baris, jumlah) dari subset terakhir
+        self.incremental_updates = 0
+        self.full_updates = 0
+
+    @classmethod
+    def from_tables(cls, data_provinsi, roles, data_tpak=None, key_col="PROVINSI"):
+        """Gabungkan indikator provinsi dan TPAK (per ``key_col``) menjadi satu matriks."""
+        provinsi_cols, tpak_cols = indicator_columns(roles)
+        columns = [widen_values(data_provinsi[col].to_numpy()) for col in provinsi_cols]
+        labels = list(provinsi_cols)
+
+        tpak_key = roles.get("tpak", {}).get("province")
+        if data_tpak is not None and tpak_key and tpak_cols:
+            # Baris TPAK pertama per provinsi, sama seperti tab TPAK
+            tpak = data_tpak.drop_duplicates(subset=[tpak_key])
+            position = pd.Index(tpak[tpak_key].astype(str)).get_indexer(data_provinsi[key_col].astype(str))
+            for col in tpak_cols:
+                source = widen_values(tpak[col].to_numpy())
+                joined = np.where(position >= 0, source[np.maximum(position, 0)] if len(source) else np.nan, np.nan)
+                columns.append(joined)
+                labels.append(col)
+            if len(tpak_cols) == 2:
+                columns.append(columns[-2] - columns[-1])
+                labels.append(GAP_COLUMN)
+
+        values = (np.column_stack([np.asarray(col, dtype=np.float64) for col in columns])
+                  if columns else np.empty((len(data_provinsi), 0)))
+        return cls(data_provinsi[key_col].to_numpy(), labels, values)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _subset_sums(self, rows):
+        mask = np.zeros(len(self), dtype=bool)
+        mask[slice(None) if rows is None else rows] = True
+        # Lock dipegang dari membaca sampai menulis ``_last`` agar dua sesi tidak
+        # menghitung delta dari subset yang sama lalu saling menimpa
+        with self._lock:
+            last = self._last
+            if last is not None:
+                added = mask & ~last[0]
+                removed = last[0] & ~mask
+                changed = np.count_nonzero(added) + np.count_nonzero(removed)
+                if changed == 0:
+                    return mask, last[1]
+            if last is not None and changed < np.count_nonzero(mask):
+                plus = _pair_sums(self._centered[added], self.valid[added])
+                minus = _pair_sums(self._centered[removed], self.valid[removed])
+                sums = tuple(base + p - m for base, p, m in zip(last[1], plus, minus))
+                self.incremental_updates += 1
+            else:
+                sums = _pair_sums(self._centered[mask], self.valid[mask])
+                self.full_updates += 1
+            self._last = (mask, sums)
+        return mask, sums
+
+    def _ranks(self, mask):
+        """Peringkat (1 = tertinggi, nilai sama mendapat peringkat terkecil) di dalam subset.
+
+        Sama dengan ``DataFrame.rank(ascending=False, method="min")`` pada
+        baris subset, tetapi cukup satu cumsum di atas urutan yang sudah ada.
+        """
+        selected = mask[self._order]
+        before = np.cumsum(selected, axis=1) - selected
+        ordered_ranks = np.take_along_axis(before, self._run_start, axis=1) + 1.0
+        ordered_ranks[~self._ordered_valid] = np.nan
+        ranks = np.empty(ordered_ranks.shape)
+        np.put_along_axis(ranks, self._order, ordered_ranks, axis=1)
+        return ranks[:, mask].T
+
+    def correlation(self, rows=None):
+        """Tuple ``(korelasi, jumlah pasangan)`` sebagai DataFrame indikator × indikator."""
+        _, sums = self._subset_sums(rows)
+        return self._correlation(sums)
+
+    def _correlation(self, sums):
+        n, sx, sxx, sxy = sums
+        sy, syy = sx.T, sxx.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            covariance = sxy - sx * sy / n
+            variance = (sxx - sx * sx / n) * (syy - sy * sy / n)
+            corr = covariance / np.sqrt(variance)
+        corr = np.where((n >= 3) & (variance > 0), np.clip(corr, -1.0, 1.0), np.nan)
+        return (pd.DataFrame(corr, index=self.columns, columns=self.columns),
+                pd.DataFrame(n.astype(np.int64), index=self.columns, columns=self.columns))
+
+    def analyze(self, rows=None, outlier_z=OUTLIER_Z):
+        """Korelasi, peringkat, z-score, dan outlier untuk subset baris ``rows``."""
+        mask, sums = self._subset_sums(rows)
+        correlation, counts = self._correlation(sums)
+        n, sx, sxx, _ = sums
+
+        # Rata-rata dan simpangan baku (ddof=1) subset dari diagonal jumlah aditif
+        count = np.diag(n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.diag(sx) / count
+            std = np.sqrt((np.diag(sxx) - np.diag(sx) * mean) / (count - 1))
+        std = np.where(count >= 2, std, np.nan)
+
+        values = self.values[mask]
+        index = self.index[mask]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = (values - self.center - mean) / std
+        zscores = pd.DataFrame(z, index=index, columns=self.columns)
+        ranks = pd.DataFrame(self._ranks(mask), index=index, columns=self.columns)
+        names = self.names[mask]
+
+        with np.errstate(invalid="ignore"):
+            hit_rows, hit_cols = np.nonzero(np.abs(z) > outlier_z)
+        outliers = pd.DataFrame({
+            "PROVINSI": names[hit_rows],
+            "Indikator": np.asarray(self.columns, dtype=object)[hit_cols] if len(self.columns) else [],
+            "Nilai": values[hit_rows, hit_cols],
+            "Z-score": z[hit_rows, hit_cols],
+        })
+        outliers = outliers.reindex(outliers["Z-score"].abs().sort_values(ascending=False).index)
+        return AnalyticsResult(correlation, counts, ranks, zscores, outliers.reset_index(drop=True))
+
+    def frame(self, rows=None):
+        """DataFrame indikator (dengan kolom nama) untuk subset baris, mis. untuk scatter matrix."""
+        mask = slice(None) if rows is None else rows
+        frame = pd.DataFrame(self.values[mask], columns=self.columns)
+        frame.insert(0, "PROVINSI", self.names[mask])
+        return frame
@@ -0,0 +1,572 @@
+"""API HTTP read-only untuk tabel dashboard (JSON, NDJSON, Arrow IPC).
+
+Tool lain bisa mengambil data yang sama dengan dashboard tanpa membuka
+``data_python.xlsx`` sendiri. ``QueryService`` membaca snapshot
+``DataStore`` yang sama dengan dashboard, sehingga tabel, reload otomatis,
+dan versi datanya selalu sama, dan memakai filter sidebar yang sama
+(``FilterIndex.select``): provinsi terpilih lalu rentang
+``PENDUDUK_MISKIN``. Tabel kab/kota dan TPAK diambil untuk provinsi hasil
+filter itu (nama provinsi dicocokkan lewat ``normalize_name``).
+
+Endpoint (GET):
+
+- ``/api/meta``: versi data, tahun, kolom dan jumlah baris setiap tabel
+- ``/api/rows/<tabel>``: baris hasil filter (``provinsi``, ``kabkota``, ``tpak``)
+- ``/api/summary/<tabel>``: count/total/mean/std/min/max setiap kolom angka
+  (lewat ``GroupStats``); ``by=provinsi`` untuk ringkasan per provinsi
+
+Parameter query:
+
+- ``year``: tahun data (default tahun terakhir, seperti slider sidebar)
+- ``provinsi``: boleh diulang; tanpa parameter ini semua provinsi terpilih
+  (keadaan awal multiselect sidebar). ``provinsi=`` tanpa nilai sama dengan
+  multiselect yang dikosongkan: semua baris lolos dan rentang penduduk
+  miskin tidak diterapkan
+- ``poverty_min`` / ``poverty_max``: rentang penduduk miskin (ribu), inklusif;
+  seperti slider sidebar, hanya berlaku jika ada provinsi terpilih
+- ``columns``: daftar kolom dipisah koma
+- ``offset`` / ``limit``: halaman baris (``limit`` default ``PAGE_ROWS``,
+  paling banyak ``MAX_PAGE_ROWS``); halaman berikutnya ada di field
+  ``next`` (JSON) atau header ``Link``
+- ``format``: ``json`` (default), ``ndjson``, atau ``arrow`` (Arrow IPC
+  stream, perlu paket opsional ``pyarrow``)
+- ``stream=1``: kirim semua baris mulai ``offset`` dengan chunked transfer
+  encoding, ``STREAM_CHUNK_ROWS`` baris per potongan, sehingga server
+  maupun klien tidak perlu memegang seluruh hasil di memori
+
+Data satu versi tidak pernah berubah, jadi ``ETag`` cukup dihitung dari
+versi data dan query; ``If-None-Match`` yang cocok dijawab ``304`` tanpa
+menyentuh tabel. Respons yang tidak di-stream disimpan di
+``ResponseCache`` (LRU berdasarkan ETag).
+
+Dari dashboard, API dijalankan di thread background jika
+``DASHBOARD_API_PORT`` diisi. Tanpa Streamlit::
+
+    python -m dashboard.api --port 8502
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from dashboard.dataset import EXTRA_SOURCES, load_dataset
+from dashboard.figcache import make_key
+from dashboard.filtering import FilterIndex
+from dashboard.geometry import normalize_name
+from dashboard.refresh import DataStore
+from dashboard.stats import GroupStats
+from dashboard.storage import widen
+
+API_HOST = os.environ.get("DASHBOARD_API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("DASHBOARD_API_PORT") or "8502")
+PAGE_ROWS = 1000
+MAX_PAGE_ROWS = 50000
+STREAM_CHUNK_ROWS = 5000
+RESPONSE_CACHE_BYTES = 32 * 1024 * 1024
+
+TABLES = ("provinsi", "kabkota", "tpak")
+CONTENT_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+SUMMARY_FIELDS = ["count", "total", "mean", "std", "min", "max"]
+
+Query = namedtuple("Query", [
+    "year", "provinces", "poverty_range", "columns", "offset", "limit", "format", "stream", "by",
+])
+# body: bytes (respons biasa) atau None; chunks: iterator bytes (respons stream) atau None
+Response = namedtuple("Response", ["status", "content_type", "headers", "body", "chunks"])
+
+
+class QueryError(ValueError):
+    """Query tidak valid atau data belum siap; ``status`` adalah kode HTTP respons."""
+
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+def arrow_available():
+    """True jika ``pyarrow`` terpasang sehingga respons bisa dikirim sebagai Arrow IPC."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _param(params, name, default=None):
+    values = params.get(name)
+    return values[-1] if values and values[-1] != "" else default
+
+
+def _number(params, name, cast, default=None):
+    value = _param(params, name)
+    if value is None:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        raise QueryError(f"Parameter {name} harus berupa angka: {value!r}") from None
+
+
+def parse_query(params):
+    """``Query`` dari parameter URL (hasil ``parse_qs``)."""
+    fmt = _param(params, "format", "json")
+    if fmt not in CONTENT_TYPES:
+        raise QueryError(f"Format tidak dikenal: {fmt!r} (pilihan: {', '.join(CONTENT_TYPES)})")
+    if fmt == "arrow" and not arrow_available():
+        raise QueryError("Format arrow memerlukan paket pyarrow", HTTPStatus.NOT_ACCEPTABLE)
+
+    stream = _param(params, "stream", "0").lower() in ("1", "true", "yes")
+    offset = _number(params, "offset", int, 0)
+    limit = _number(params, "limit", int, None if stream else PAGE_ROWS)
+    if offset < 0 or (limit is not None and not 0 < limit <= (MAX_PAGE_ROWS if not stream else math.inf)):
+        raise QueryError(f"offset harus >= 0 dan limit antara 1 dan {MAX_PAGE_ROWS}")
+
+    poverty_min = _number(params, "poverty_min", float)
+    poverty_max = _number(params, "poverty_max", float)
+    poverty_range = None
+    if poverty_min is not None or poverty_max is not None:
+        poverty_range = (-np.inf if poverty_min is None else poverty_min,
+                         np.inf if poverty_max is None else poverty_max)
+
+    columns = _param(params, "columns")
+    by = _param(params, "by")
+    if by not in (None, "provinsi"):
+        raise QueryError(f"Parameter by hanya mendukung 'provinsi', bukan {by!r}")
+    provinces = params.get("provinsi")
+    return Query(
+        year=_number(params, "year", int),
+        # None: semua provinsi terpilih; []: multiselect dikosongkan (lihat FilterIndex.select)
+        provinces=None if provinces is None else [province for province in provinces if province],
+        poverty_range=poverty_range,
+        columns=[col.strip() for col in columns.split(",")] if columns else None,
+        offset=offset,
+        limit=limit,
+        format=fmt,
+        stream=stream,
+        by=by,
+    )
+
+
+def etag_matches(header, etag):
+    """True jika header ``If-None-Match`` memuat ``etag`` (atau ``*``)."""
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+class ResponseCache:
+    """Cache LRU body respons per ETag dengan batas total byte; aman dipakai banyak thread."""
+
+    def __init__(self, max_bytes=RESPONSE_CACHE_BYTES, max_items=1024):
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, etag):
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(etag)
+            self.hits += 1
+            return entry
+
+    def put(self, etag, content_type, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if etag in self._entries:
+                self._bytes -= len(self._entries.pop(etag)[1])
+            self._entries[etag] = (content_type, body)
+            self._bytes += len(body)
+            while len(self._entries) > self.max_items or self._bytes > self.max_bytes:
+                _, (_, old) = self._entries.popitem(last=False)
+                self._bytes -= len(old)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._bytes}
+
+
+class _YearTables:
+    """Tabel satu versi data dan satu tahun, beserta index filter dan statistiknya."""
+
+    def __init__(self, data, year):
+        panels, roles = data["panels"], data["roles"]
+        self.tables = {name: panels[name].year(year) for name in TABLES if name in panels}
+        self.province_cols = {name: "PROVINSI" if name == "provinsi" else roles[name].get("province")
+                              for name in self.tables}
+        provinsi = self.tables["provinsi"]
+        self.provinces = list(provinsi["PROVINSI"].dropna().unique())
+        # Filter sidebar (provinsi + rentang PENDUDUK_MISKIN) atas tabel provinsi
+        self.filter_index = FilterIndex(provinsi)
+        self._indexes = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def table(self, name):
+        if name not in TABLES:
+            raise QueryError(f"Tabel tidak dikenal: {name!r} (pilihan: {', '.join(TABLES)})",
+                             HTTPStatus.NOT_FOUND)
+        if name not in self.tables:
+            raise QueryError(f"Tabel {name} belum dimuat, coba lagi", HTTPStatus.SERVICE_UNAVAILABLE)
+        if not self.province_cols[name]:
+            raise QueryError(f"Kolom provinsi tabel {name} tidak ditemukan", HTTPStatus.NOT_FOUND)
+        return self.tables[name]
+
+    def _province_index(self, name):
+        # Index nama provinsi yang dinormalisasi, dibangun sekali per tabel
+        with self._lock:
+            index = self._indexes.get(name)
+        if index is None:
+            names = self.tables[name][self.province_cols[name]]
+            normalized = pd.DataFrame({"PROVINSI": names.map(normalize_name, na_action="ignore")})
+            index = FilterIndex(normalized, value_col=None)
+            with self._lock:
+                self._indexes[name] = index
+        return index
+
+    def group_stats(self, name):
+        with self._lock:
+            stats = self._stats.get(name)
+        if stats is None:
+            stats = GroupStats(self.tables[name], self.province_cols[name])
+            with self._lock:
+                self._stats[name] = stats
+        return stats
+
+    def rows(self, name, provinces, poverty_range):
+        """Posisi baris tabel ``name`` untuk provinsi yang lolos filter sidebar."""
+        table = self.table(name)
+        provinsi = self.tables["provinsi"]
+        view = self.filter_index.select(provinsi, self.provinces if provinces is None else provinces,
+                                        poverty_range)
+        if name == "provinsi":
+            return np.arange(len(table)) if view.rows is None else view.rows
+        selected = [normalize_name(province) for province in view.column("PROVINSI").dropna().unique()]
+        return self._province_index(name).query(selected)
+
+
+def _records_json(frame):
+    """Baris ``frame`` sebagai array JSON (NaN menjadi null)."""
+    return frame.to_json(orient="records", force_ascii=False, date_format="iso").encode("utf-8")
+
+
+def _ndjson(frame):
+    if frame.empty:
+        return b""
+    lines = frame.to_json(orient="records", lines=True, force_ascii=False, date_format="iso")
+    return (lines if lines.endswith("\n") else lines + "\n").encode("utf-8")
+
+
+def _arrow_chunks(frames):
+    """Arrow IPC stream: skema dari potongan pertama, lalu satu record batch per potongan."""
+    import pyarrow as pa
+
+    sink = io.BytesIO()
+    writer = None
+    for frame in frames:
+        batch = pa.RecordBatch.from_pandas(frame, schema=writer.schema if writer else None,
+                                           preserve_index=False)
+        if writer is None:
+            writer = pa.ipc.new_stream(sink, batch.schema)
+        writer.write_batch(batch)
+        yield _drain(sink)
+    if writer is not None:
+        writer.close()
+        yield _drain(sink)
+
+
+def _drain(sink):
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
+def _finite(value):
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+class QueryService:
+    """Jawab query API dari snapshot dataset aktif (``snapshot()`` -> ``refresh.Snapshot``)."""
+
+    def __init__(self, snapshot, cache=None):
+        self._snapshot = snapshot
+        self.cache = cache if cache is not None else ResponseCache()
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def _year_tables(self, data, year):
+        years = data["panels"]["provinsi"].years
+        year = years[-1] if year is None else year
+        if year not in years:
+            raise QueryError(f"Tahun {year} tidak ada di data (tersedia: {', '.join(map(str, years))})",
+                             HTTPStatus.NOT_FOUND)
+        # Snapshot parsial dan lengkap punya versi sama tetapi tabel berbeda
+        key = (data["version"], year, tuple(sorted(data["panels"])))
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                # Versi data lama tidak akan diminta lagi
+                self._states = {k: v for k, v in self._states.items() if k[0] == data["version"]}
+                state = self._states[key] = _YearTables(data, year)
+        return year, state
+
+    def respond(self, path, params, if_none_match=None):
+        """``Response`` untuk satu request GET; ``QueryError`` untuk query yang tidak valid."""
+        snapshot = self._snapshot()
+        if snapshot.data is None:
+            raise QueryError("Data belum dimuat, coba lagi", HTTPStatus.SERVICE_UNAVAILABLE)
+        data = snapshot.data
+
+        etag = '"' + make_key(data["version"], snapshot.complete, path,
+                              sorted((name, tuple(values)) for name, values in params.items())) + '"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Data-Version": data["version"]}
+        if etag_matches(if_none_match, etag):
+            return Response(HTTPStatus.NOT_MODIFIED, None, headers, b"", None)
+        cached = self.cache.get(etag)
+        if cached is not None:
+            return Response(HTTPStatus.OK, cached[0], headers, cached[1], None)
+
+        query = parse_query(params)
+        parts = [part for part in path.split("/") if part]
+        if parts == ["api", "meta"]:
+            response = self._meta(data, snapshot.complete, query)
+        elif len(parts) == 3 and parts[:2] == ["api", "rows"]:
+            response = self._rows(data, parts[2], path, params, query)
+        elif len(parts) == 3 and parts[:2] == ["api", "summary"]:
+            response = self._summary(data, parts[2], path, params, query)
+        else:
+            raise QueryError(f"Endpoint tidak dikenal: {path}", HTTPStatus.NOT_FOUND)
+
+        response.headers.update(headers)
+        if response.body is not None:
+            self.cache.put(etag, response.content_type, response.body)
+        return response
+
+    def _meta(self, data, complete, query):
+        year, state = self._year_tables(data, query.year)
+        body = {
+            "version": data["version"],
+            "complete": complete,
+            "year": year,
+            "years": [int(y) if isinstance(y, (int, np.integer)) else y for y in data["panels"]["provinsi"].years],
+            "tables": {name: {"rows": len(table), "columns": [str(col) for col in table.columns],
+                              "province_column": state.province_cols[name]}
+                       for name, table in state.tables.items()},
+            "formats": [fmt for fmt in CONTENT_TYPES if fmt != "arrow" or arrow_available()],
+        }
+        return Response(HTTPStatus.OK, CONTENT_TYPES["json"], {},
+                        json.dumps(body, ensure_ascii=False).encode("utf-8"), None)
+
+    def _rows(self, data, name, path, params, query):
+        year, state = self._year_tables(data, query.year)
+        table = state.table(name)
+        positions = state.rows(name, query.provinces, query.poverty_range)
+        columns = query.columns or list(table.columns)
+        missing = [col for col in columns if col not in table.columns]
+        if missing:
+            raise QueryError(f"Kolom tidak ada di tabel {name}: {', '.join(missing)}")
+        meta = {"table": name, "year": year, "version": data["version"]}
+        return self._encode(table[columns], positions, meta, path, params, query)
+
+    def _summary(self, data, name, path, params, query):
+        year, state = self._year_tables(data, query.year)
+        table = state.table(name)
+        positions = state.rows(name, query.provinces, query.poverty_range)
+        stats = state.group_stats(name)
+        columns = [col for col in (query.columns or table.columns) if col in stats]
+
+        if query.by is None:
+            groups = [(None, positions)]
+        else:
+            # Pecah posisi per provinsi (urutan kemunculan); grup utuh memakai agregat GroupStats
+            codes, keys = pd.factorize(table[state.province_cols[name]].to_numpy()[positions])
+            order = np.argsort(codes, kind="stable")
+            counts = np.bincount(codes + 1, minlength=len(keys) + 1)
+            groups = list(zip(keys, np.split(positions[order], np.cumsum(counts)[:-1])[1:]))
+
+        records = []
+        for key, rows in groups:
+            for col in columns:
+                summary = stats.summary(col, rows)
+                record = {} if key is None else {"PROVINSI": key}
+                record.update({
+                    "kolom": col,
+                    "count": summary.count,
+                    "total": _finite(summary.total) if summary.count else None,
+                    "mean": _finite(summary.mean),
+                    "std": _finite(summary.std),
+                    "min": _finite(summary.minimum),
+                    "max": _finite(summary.maximum),
+                })
+                records.append(record)
+        frame = pd.DataFrame.from_records(
+            records, columns=(["PROVINSI"] if query.by else []) + ["kolom"] + SUMMARY_FIELDS)
+        meta = {"table": name, "year": year, "version": data["version"], "rows_matched": len(positions)}
+        return self._encode(frame, np.arange(len(frame)), meta, path, params, query)
+
+    def _encode(self, frame, positions, meta, path, params, query):
+        """Halaman atau stream baris ``frame.iloc[positions]`` dalam format query."""
+        total = len(positions)
+        stop = total if query.limit is None else min(total, query.offset + query.limit)
+        selected = positions[query.offset:stop]
+        headers = {"X-Total-Count": str(total)}
+        next_url = None
+        if not query.stream and stop < total:
+            next_params = {**params, "offset": [str(stop)], "limit": [str(query.limit)]}
+            next_url = f"{path}?{urlencode(next_params, doseq=True)}"
+            headers["Link"] = f'<{next_url}>; rel="next"'
+
+        def frames():
+            # Selalu minimal satu potongan agar skema Arrow/JSON tetap terkirim walau kosong
+            for start in range(0, max(len(selected), 1), STREAM_CHUNK_ROWS):
+                yield widen(frame.iloc[selected[start:start + STREAM_CHUNK_ROWS]])
+
+        content_type = CONTENT_TYPES[query.format]
+        if query.format == "arrow":
+            chunks = _arrow_chunks(frames())
+        elif query.format == "ndjson":
+            chunks = (_ndjson(chunk) for chunk in frames())
+        else:
+            meta = {**meta, "total": total, "offset": query.offset, "limit": query.limit, "next": next_url}
+            chunks = self._json_chunks(meta, frames())
+
+        if query.stream:
+            return Response(HTTPStatus.OK, content_type, headers, None, chunks)
+        return Response(HTTPStatus.OK, content_type, headers, b"".join(chunks), None)
+
+    @staticmethod
+    def _json_chunks(meta, frames):
+        # {"table": ..., "rows": [ ...potongan... ]}, ditulis bertahap
+        yield json.dumps(meta, ensure_ascii=False)[:-1].encode("utf-8") + b', "rows": ['
+        first = True
+        for chunk in frames:
+            if chunk.empty:
+                continue
+            if not first:
+                yield b","
+            yield _records_json(chunk)[1:-1]
+            first = False
+        yield b"]}"
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """Handler GET untuk ``ApiServer``; semua error dikirim sebagai JSON ``{"error": ...}``."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "DashboardAPI/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            response = self.server.service.respond(url.path, parse_qs(url.query, keep_blank_values=True),
+                                                   self.headers.get("If-None-Match"))
+        except QueryError as e:
+            response = self._error(e.status, str(e))
+        except Exception as e:
+            # Error tak terduga tidak boleh mematikan thread server
+            response = self._error(HTTPStatus.INTERNAL_SERVER_ERROR, f"Error: {e}")
+        self._send(response)
+
+    @staticmethod
+    def _error(status, message):
+        body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+        return Response(status, CONTENT_TYPES["json"], {}, body, None)
+
+    def _send(self, response):
+        self.send_response(response.status)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        if response.status == HTTPStatus.NOT_MODIFIED:
+            self.end_headers()
+            return
+        self.send_header("Content-Type", response.content_type)
+        if response.chunks is None:
+            self.send_header("Content-Length", str(len(response.body)))
+            self.end_headers()
+            self.wfile.write(response.body)
+            return
+
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for chunk in response.chunks:
+                if chunk:
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        except Exception:
+            # Header sudah terkirim: putuskan koneksi agar klien tahu respons tidak lengkap
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ApiServer(ThreadingHTTPServer):
+    """Server HTTP berthread untuk ``QueryService``."""
+
+    daemon_threads = True
+
+    def __init__(self, address, service, verbose=False):
+        super().__init__(address, QueryHandler)
+        self.service = service
+        self.verbose = verbose
+
+
+def start_api_server(service, host=API_HOST, port=API_PORT, verbose=False):
+    """Jalankan API di thread daemon; ``server.server_address`` berisi port sebenarnya."""
+    server = ApiServer((host, port), service, verbose=verbose)
+    threading.Thread(target=server.serve_forever, name="query-api", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=os.environ.get("DASHBOARD_DATA_FILE", "data_python.xlsx"),
+                        help="workbook sumber (default sama dengan dashboard)")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--verbose", action="store_true", help="log setiap request ke stderr")
+    args = parser.parse_args(argv)
+
+    # Reload otomatis saat file sumber berubah, sama seperti dashboard
+    store = DataStore(args.data, load_dataset, watch=[args.data] + EXTRA_SOURCES).start()
+    if store.snapshot().data is None:
+        parser.exit(1, f"Data gagal dimuat: {store.snapshot().error}\n")
+    server = ApiServer((args.host, args.port), QueryService(store.snapshot), verbose=args.verbose)
+    host, port = server.server_address[:2]
+    print(f"API berjalan di http://{host}:{port}/api/meta")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
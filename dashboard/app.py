@@ -0,0 +1,1048 @@
+"""Dashboard Kemiskinan Indonesia: cache, tampilan per tab, dan alur halaman.
+
+Entry point Streamlit (``kemiskinan.py``) hanya memanggil :func:`main`.
+Modul ini diimpor sekali per proses server, sehingga definisi fungsi,
+factory cache, CSS, dan konstanta lain tidak dibangun ulang setiap rerun;
+yang dijalankan per rerun hanya isi :func:`main`. Modul berat diimpor di
+tempat yang memakainya: Plotly Express (``dashboard.figures``) di dalam tab
+saat figure perlu dibangun, API hanya jika diaktifkan.
+"""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+from datetime import datetime
+import os
+
+from dashboard import instrument
+from dashboard.analytics import GAP_COLUMN, IndicatorAnalytics
+from dashboard.cache import default_cache_dir, mapped_bytes
+from dashboard.dataset import EXTRA_SOURCES, load_dataset
+from dashboard.figcache import FigureCache, figure_namespace, make_key
+from dashboard.filtering import FilterIndex, Partitions
+from dashboard.geometry import RegionGeometry, geojson_path, normalize_name
+from dashboard.mapping import CHOROPLETH_MODE, MAP_MODES, MAP_POINT_THRESHOLD, grid_aggregate, resolve_mode
+from dashboard.refresh import DataStore, DataValidationError
+from dashboard.resultstore import RESULT_STORE_NAME, open_result_store
+from dashboard.stats import GroupStats
+from dashboard.storage import memory_report
+
+
+# -------------------------------
+# Page Configuration
+# -------------------------------
+PAGE_CONFIG = dict(
+    page_title="Dashboard Kemiskinan Indonesia 2024",
+    page_icon="📊",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS untuk styling yang lebih menarik
+CUSTOM_CSS = """
+<style>
+    .main-header {
+        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+        padding: 2rem;
+        border-radius: 10px;
+        margin-bottom: 2rem;
+        color: white;
+        text-align: center;
+    }
+    
+    .metric-card {
+        background: linear-gradient(135deg, #74b9ff 0%, #0984e3 100%);
+        padding: 1rem;
+        border-radius: 10px;
+        color: white;
+        text-align: center;
+        margin: 0.5rem 0;
+    }
+    
+    .stButton > button {
+        background: linear-gradient(90deg, #74b9ff 0%, #0984e3 100%);
+        color: white;
+        border: none;
+        border-radius: 20px;
+        padding: 0.5rem 2rem;
+        font-weight: bold;
+        transition: all 0.3s ease;
+    }
+    
+    .stButton > button:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 5px 15px rgba(0,0,0,0.2);
+    }
+    
+    .chart-container {
+        background: white;
+        padding: 1rem;
+        border-radius: 10px;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+        margin: 1rem 0;
+    }
+    
+    .data-status {
+        padding: 1rem;
+        border-radius: 5px;
+        margin: 1rem 0;
+        font-weight: bold;
+    }
+    
+    .status-success {
+        background-color: #d4edda;
+        border: 1px solid #c3e6cb;
+        color: #155724;
+    }
+    
+    .status-error {
+        background-color: #f8d7da;
+        border: 1px solid #f5c6cb;
+        color: #721c24;
+    }
+</style>
+"""
+
+HEADER_HTML = """
+<div class="main-header">
+    <h1> Dashboard Kemiskinan Indonesia {year}</h1>
+    <p>Analisis Komprehensif Data Kemiskinan dan Ketenagakerjaan</p>
+    <p><strong>Data ter-update:</strong> {updated}</p>
+</div>
+"""
+
+FOOTER_HTML = """
+<div style='text-align: center; color: #666;'>
+<p>Dashboard Kemiskinan Indonesia 2024 | Dibuat oleh Kelompok 10</p>
+<p>Ana Rovidhoh (M0722010) | Bernadeta Chrisma Damai S (M0722025) | Novita Eka Permatasari (M0722060)</p>
+<p>Data source: BPS Indonesia | Last updated: {updated}</p>
+</div>
+"""
+
+# File pembuat figure; dipakai untuk namespace store disk tanpa mengimpor Plotly Express
+FIGURES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "figures.py")
+
+
+# -------------------------------
+# Direct Data Loading Function
+# -------------------------------
+# Path relatif terhadap folder kerja; bisa diganti lewat DASHBOARD_DATA_FILE (mis. untuk benchmark)
+DATA_FILE = os.environ.get("DASHBOARD_DATA_FILE", 'data_python.xlsx')
+# Store figure di disk, bersama antar proses dan restart; "off" untuk mematikan
+RESULT_STORE_PATH = os.environ.get("DASHBOARD_RESULT_CACHE") or os.path.join(
+    os.path.dirname(default_cache_dir(DATA_FILE)), RESULT_STORE_NAME
+)
+# API read-only (dashboard.api) ikut dijalankan jika DASHBOARD_API_PORT diisi
+API_ENABLED = bool(os.environ.get("DASHBOARD_API_PORT"))
+# Jeda polling saat menunggu load pertama selesai
+LOAD_POLL_SECONDS = 0.25
+
+
+def describe_load_error(error, file_path):
+    """Pesan error yang ditampilkan jika data gagal dimuat"""
+    if isinstance(error, DataValidationError):
+        return str(error)
+    if isinstance(error, FileNotFoundError):
+        return f"❌ File tidak ditemukan di: {file_path}"
+    if isinstance(error, ValueError):
+        return f"❌ Error sheet Excel: {str(error)}"
+    return f"❌ Error loading data: {str(error)}"
+
+
+@st.cache_resource
+def get_data_store():
+    """Dataset aktif bersama semua sesi; di-reload di background jika file berubah"""
+    return DataStore(DATA_FILE, load_dataset, watch=[DATA_FILE] + EXTRA_SOURCES, partial=True).start()
+
+
+def load_data_direct():
+    """Ambil snapshot data aktif tanpa menunggu reload yang sedang berjalan.
+
+    Saat load pertama, tunggu sampai setidaknya tabel provinsi siap.
+    """
+    store = get_data_store()
+    snapshot = store.snapshot()
+    while snapshot.data is None and snapshot.error is None:
+        snapshot = store.wait(LOAD_POLL_SECONDS)
+
+    if snapshot.data is None:
+        return None, None, None, describe_load_error(snapshot.error, DATA_FILE)
+
+    data = snapshot.data
+    if snapshot.error is not None and not snapshot.complete:
+        message = f"⚠️ Sebagian data gagal dimuat. {describe_load_error(snapshot.error, DATA_FILE)}"
+    elif snapshot.error is not None:
+        message = f"⚠️ Reload data gagal, memakai data sebelumnya. {describe_load_error(snapshot.error, DATA_FILE)}"
+    else:
+        message = f"✅ Data berhasil dimuat dari: {DATA_FILE}"
+    return data["panels"], data["roles"], data["version"], message
+
+
+def wait_full_data():
+    """Tunggu load pertama selesai sambil menampilkan progress; kembalikan snapshot terakhir"""
+    store = get_data_store()
+    snapshot = store.snapshot()
+    if snapshot.complete or snapshot.error is not None:
+        return snapshot
+
+    progress_bar = st.progress(0.0)
+    while not snapshot.complete and snapshot.error is None:
+        done, total = snapshot.data["progress"]
+        progress_bar.progress(done / total, text=f"⏳ Memuat data kab/kota dan TPAK... ({done}/{total} sumber)")
+        snapshot = store.wait(LOAD_POLL_SECONDS)
+    progress_bar.empty()
+    return snapshot
+
+
+def year_table(data_panels, name, year):
+    """Partisi satu tahun dari panel ``name`` (None jika tabel belum dimuat)"""
+    panel = data_panels.get(name)
+    return panel.year(year) if panel is not None else None
+
+
+@st.cache_resource
+def get_query_api():
+    """API JSON/Arrow read-only di thread background, memakai dataset aktif yang sama dengan dashboard"""
+    if not API_ENABLED:
+        return None
+    from dashboard.api import QueryService, start_api_server
+
+    try:
+        return start_api_server(QueryService(get_data_store().snapshot))
+    except OSError:
+        # Port sudah dipakai (mis. proses server lain sudah menjalankan API)
+        return None
+
+
+@st.cache_resource
+def get_profiler():
+    """Timer dan counter per bagian dashboard, bersama untuk semua sesi"""
+    return instrument.Profiler()
+
+
+@st.cache_resource
+def get_result_store():
+    """Store figure di disk (tingkat kedua cache figure); dibuang isinya jika kode figure berubah"""
+    if RESULT_STORE_PATH == "off":
+        return None
+    return open_result_store(RESULT_STORE_PATH, namespace=figure_namespace(__file__, FIGURES_FILE))
+
+
+@st.cache_resource
+def get_figure_cache():
+    """Cache figure bersama untuk semua sesi dalam satu proses server"""
+    return FigureCache(store=get_result_store())
+
+
+@st.cache_resource
+def prune_result_store(dataset_version):
+    """Buang figure versi data lain yang sudah lama tidak diakses dari store disk, sekali per versi data"""
+    store = get_result_store()
+    return store.retain(dataset_version) if store is not None else 0
+
+
+@st.cache_resource
+def get_filter_index(_data_provinsi, data_version):
+    """Index filter sidebar, dibangun sekali per versi data"""
+    return FilterIndex(_data_provinsi)
+
+
+@st.cache_resource
+def get_group_stats(_data_provinsi, data_version):
+    """Agregat dan sketsa kuantil per provinsi, dihitung sekali per versi data"""
+    return GroupStats(_data_provinsi, "PROVINSI")
+
+
+@st.cache_resource
+def get_indicator_analytics(_data_provinsi, _data_tpak, _roles, data_version):
+    """Matriks indikator provinsi + TPAK untuk analisis lintas indikator, sekali per versi data"""
+    return IndicatorAnalytics.from_tables(_data_provinsi, _roles, _data_tpak)
+
+
+@st.cache_resource
+def get_kabkota_partitions(_data_kabkota, prov_col, data_version):
+    """Data kabupaten/kota yang sudah dipartisi per provinsi, sekali per versi data"""
+    return Partitions(_data_kabkota, prov_col)
+
+
+@st.cache_resource
+def get_kabkota_regions(_data_kabkota, prov_col, data_version):
+    """Kab/kota dipartisi per nama provinsi yang dinormalisasi (ejaan antar sheet bisa berbeda)"""
+    return Partitions(_data_kabkota, prov_col, normalize=normalize_name)
+
+
+@st.cache_resource
+def get_region_geometry(path, table, mtime_ns):
+    """Batas wilayah yang sudah disederhanakan per level zoom, sekali per versi file GeoJSON"""
+    return RegionGeometry.from_file(path, table)
+
+
+def region_geometry(table):
+    """Geometri tingkat wilayah ``table`` (provinsi/kabkota), None jika file GeoJSON tidak ada"""
+    path = geojson_path(table)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return get_region_geometry(path, table, mtime_ns)
+
+
+@st.cache_resource
+def get_shared_memory_report(_tables, data_version):
+    """Byte memory-map (dibagi antar proses server) per tabel, sekali per versi data"""
+    return {name: mapped_bytes(table) for name, table in _tables.items() if table is not None}
+
+
+@st.cache_resource
+def get_storage_report(_tables, data_version):
+    """Byte tipe ringkas vs tipe lebar (object/float64) per tabel, sekali per versi data"""
+    return {name: memory_report(table) for name, table in _tables.items() if table is not None}
+
+
+# -------------------------------
+# Render Functions per Tampilan
+# -------------------------------
+VIEW_LABELS = [
+    "🗺️ Pemetaan Kemiskinan", 
+    "📊 Tingkat Pengangguran Terbuka (%)", 
+    "👥 Analisis TPAK", 
+    "💰 Kemiskinan", 
+    "📈 Boxplot",
+    "🎓 Angka Partisipasi Sekolah",
+    "📉 Tren Tahunan",
+    "🔗 Analisis Lintas Indikator"
+]
+
+
+def show_chart(fig):
+    """Tampilkan figure; waktu serialisasi dan pengiriman dicatat sebagai plotly_chart"""
+    with instrument.section("plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+# Indikator yang bisa dilihat trennya: (tabel, peran kolom)
+TREND_INDICATORS = [("provinsi", "poverty"), ("provinsi", "tpt"), ("tpak", "male"), ("tpak", "female")]
+
+
+def region_locations(geometry, data, name_col, parent_col=None):
+    """Id fitur geometri per baris data; None untuk wilayah tanpa geometri"""
+    parents = data[parent_col].tolist() if parent_col else None
+    return np.array(geometry.match(data[name_col].tolist(), parents), dtype=object)
+
+
+def choropleth_map(geometry, data, name_col, value_col, locations, zoom, region):
+    """Choropleth untuk baris yang punya geometri dan nilai, berpusat pada wilayah yang tampil"""
+    from dashboard import figures
+
+    matched = pd.notna(locations) & data[value_col].notna().to_numpy()
+    ids = locations[matched].tolist()
+    return figures.choropleth_figure(
+        data[matched], name_col, value_col, ids, geometry.feature_collection(zoom, ids), zoom,
+        center=geometry.center(ids), region=region
+    )
+
+
+@st.fragment
+@instrument.timed("tab1")
+def render_peta(filtered_view, data_provinsi, data_kabkota, roles, data_version, figure_cache):
+    """Tab 1: peta sebaran penduduk miskin"""
+    from dashboard import figures
+
+    st.markdown("### 🗺️ Peta Kemiskinan Indonesia (Tingkat Provinsi)")
+
+    try:
+        if data_provinsi is not None and not data_provinsi.empty:
+            # Kolom koordinat dan kemiskinan sudah ditentukan saat load data
+            lat_col = roles["provinsi"]["latitude"]
+            lon_col = roles["provinsi"]["longitude"]
+            poverty_col = roles["provinsi"]["poverty"]
+
+            if lat_col and lon_col and poverty_col:
+                # Choropleth hanya jika batas wilayah (GeoJSON lokal) tersedia
+                geometries = {table: region_geometry(table) for table in ("provinsi", "kabkota")}
+                map_modes = MAP_MODES + ([CHOROPLETH_MODE] if geometries["provinsi"] is not None else [])
+
+                # Mode peta: titik per baris, agregasi grid, density layer, atau batas wilayah
+                map_col1, map_col2 = st.columns([2, 1])
+                with map_col1:
+                    map_mode = st.radio(
+                        "Mode Peta",
+                        options=map_modes,
+                        horizontal=True,
+                        key="map_mode",
+                        help=f"Otomatis memakai agregasi grid jika titik lebih dari {MAP_POINT_THRESHOLD}"
+                    )
+                with map_col2:
+                    map_zoom = st.slider("Tingkat Zoom", min_value=3, max_value=10, value=4, key="map_zoom")
+                if geometries["provinsi"] is None:
+                    # Batas wilayah tidak ikut repo: mode choropleth opsional
+                    st.caption(f"Mode {CHOROPLETH_MODE} (opsional) aktif jika file batas wilayah "
+                               f"{geojson_path('provinsi')} tersedia (folder diatur lewat DASHBOARD_GEOJSON_DIR)")
+
+                map_mode = resolve_mode(map_mode, len(filtered_view))
+                if map_mode == CHOROPLETH_MODE:
+                    kab_col = roles.get("kabkota", {}).get("name")
+                    kab_prov_col = roles.get("kabkota", {}).get("province")
+                    kabkota_poverty_col = roles.get("kabkota", {}).get("poverty")
+                    regions = ["Provinsi"]
+                    if (geometries["kabkota"] is not None and data_kabkota is not None
+                            and kab_col and kab_prov_col and kabkota_poverty_col):
+                        regions.append("Kabupaten/Kota")
+                    region = st.radio("Tingkat Wilayah", options=regions, horizontal=True, key="map_region")
+
+                    if region == "Provinsi":
+                        geometry, region_data = geometries["provinsi"], filtered_view.frame()
+                        name_col, value_col, parent_col = "PROVINSI", poverty_col, None
+                    else:
+                        # Kab/kota di provinsi hasil filter sidebar
+                        geometry = geometries["kabkota"]
+                        partitions = get_kabkota_regions(data_kabkota, kab_prov_col, data_version)
+                        provinces = dict.fromkeys(normalize_name(p) for p in filtered_view.column("PROVINSI").dropna())
+                        parts = [partitions.get(key) for key in provinces if key in partitions]
+                        region_data = pd.concat(parts) if parts else data_kabkota.iloc[:0]
+                        name_col, value_col, parent_col = kab_col, kabkota_poverty_col, kab_prov_col
+
+                    locations = region_locations(geometry, region_data, name_col, parent_col)
+                    fig_map = figure_cache.get_or_build(
+                        make_key("choropleth", data_version, geometry.version, filtered_view.key, region, value_col,
+                                 map_zoom),
+                        lambda: choropleth_map(geometry, region_data, name_col, value_col, locations, map_zoom,
+                                               region),
+                        name="choropleth", version=data_version
+                    )
+                    unmatched = region_data[name_col][pd.isna(locations)].tolist()
+                    if unmatched:
+                        st.caption(f"Tanpa batas wilayah: {', '.join(map(str, unmatched))}")
+                elif map_mode == "Grid":
+                    fig_map = figure_cache.get_or_build(
+                        make_key("map_grid", data_version, filtered_view.key, lat_col, lon_col, poverty_col, map_zoom),
+                        lambda: figures.map_grid_figure(
+                            grid_aggregate(filtered_view.frame(), lat_col, lon_col, poverty_col, map_zoom), map_zoom
+                        ),
+                        name="map_grid", version=data_version
+                    )
+                elif map_mode == "Densitas":
+                    fig_map = figure_cache.get_or_build(
+                        make_key("map_density", data_version, filtered_view.key, lat_col, lon_col, poverty_col, map_zoom),
+                        lambda: figures.map_density_figure(filtered_view.frame(), lat_col, lon_col, poverty_col, map_zoom),
+                        name="map_density", version=data_version
+                    )
+                else:
+                    fig_map = figure_cache.get_or_build(
+                        make_key("map", data_version, filtered_view.key, lat_col, lon_col, poverty_col, map_zoom),
+                        lambda: figures.map_figure(filtered_view.frame(), lat_col, lon_col, poverty_col, map_zoom),
+                        name="map", version=data_version
+                    )
+
+                if fig_map is not None:
+                    show_chart(fig_map)
+
+                else:
+                    st.warning("⚠️ Tidak ada data yang valid untuk ditampilkan")
+
+            else:
+                st.error("❌ Kolom koordinat atau kemiskinan tidak ditemukan")
+                with st.expander("📋 Informasi Kolom yang Dibutuhkan"):
+                    st.write("**Kolom yang tersedia dalam data:**", ', '.join(list(data_provinsi.columns)))
+
+        else:
+            st.warning("❌ Data provinsi tidak tersedia")
+
+    except Exception as e:
+        st.error(f"❌ Error di Tab 1: {str(e)}")
+
+
+@st.fragment
+@instrument.timed("tab2")
+def render_tpt(filtered_view, sort_order, data_version, figure_cache):
+    """Tab 2: Tingkat Pengangguran Terbuka"""
+    from dashboard import figures
+
+    st.markdown("### 📊 Tingkat Pengangguran Terbuka (%)")
+
+    try:
+        if "TPT (%)" in filtered_view.columns:
+            fig_tpt = figure_cache.get_or_build(
+                make_key("tpt", data_version, filtered_view.key, sort_order),
+                lambda: figures.tpt_bar(filtered_view.frame(), ascending=(sort_order == "Ascending")),
+                name="tpt", version=data_version
+            )
+            show_chart(fig_tpt)
+        else:
+            st.warning("Kolom 'TPT (%)' tidak ditemukan")
+    except Exception as e:
+        st.error(f"❌ Error di Tab 2: {str(e)}")
+
+
+@st.fragment
+@instrument.timed("tab3")
+def render_tpak(data_tpak, roles, data_version, figure_cache):
+    """Tab 3: TPAK berdasarkan jenis kelamin"""
+    from dashboard import figures
+
+    st.markdown("### 👥 Analisis TPAK Berdasarkan Jenis Kelamin")
+
+    try:
+        if data_tpak is not None and not data_tpak.empty:
+            # Debug info
+            with st.expander("🔍 Debug: Struktur Data TPAK"):
+                st.write("**Kolom dalam data TPAK:**", list(data_tpak.columns))
+                st.dataframe(data_tpak.head())
+
+            # Cek kolom yang dibutuhkan
+            required_cols = ['PROVINSI', 'LAKI-LAKI', 'PEREMPUAN']
+            missing_cols = [col for col in required_cols if col not in roles["tpak"].values()]
+
+            if not missing_cols:
+                fig_tpak_line = figure_cache.get_or_build(
+                    make_key("tpak", data_version),
+                    lambda: figures.tpak_line(data_tpak),
+                    name="tpak", version=data_version
+                )
+
+                if fig_tpak_line is not None:
+                    show_chart(fig_tpak_line)
+                else:
+                    st.error("Data TPAK tidak valid - semua nilai kosong atau non-numerik")
+
+            else:
+                st.error(f"Kolom yang dibutuhkan tidak ditemukan: {missing_cols}")
+                st.write("**Kolom yang tersedia:**", list(data_tpak.columns))
+        else:
+            st.warning("Data TPAK tidak tersedia")
+    except Exception as e:
+        st.error(f"❌ Error di Tab 3: {str(e)}")
+
+
+@st.fragment
+@instrument.timed("tab4")
+def render_kemiskinan(filtered_view, sort_order, data_kabkota, roles, data_version, figure_cache):
+    """Tab 4: kemiskinan provinsi dan detail kabupaten/kota"""
+    from dashboard import figures
+
+    st.markdown("### 💰 Kemiskinan")
+
+    try:
+        # Poverty bar chart dengan pengecekan kolom
+        poverty_col = roles["provinsi"]["poverty"]
+
+        if poverty_col:
+            # Gunakan sort_order yang sama seperti di tab2
+            fig_poverty = figure_cache.get_or_build(
+                make_key("poverty", data_version, filtered_view.key, poverty_col, sort_order),
+                lambda: figures.poverty_bar(filtered_view.frame(), poverty_col, ascending=(sort_order == "Ascending")),
+                name="poverty", version=data_version
+            )
+            show_chart(fig_poverty)
+
+            # Detail kabupaten/kota jika data tersedia
+            if data_kabkota is not None and not data_kabkota.empty:
+                st.markdown("#### 🏘️ Detail Kabupaten/Kota")
+
+                # Interactive kabupaten/kota selector
+                prov_col = roles["kabkota"]["province"]
+
+                if prov_col:
+                    kabkota_partitions = get_kabkota_partitions(data_kabkota, prov_col, data_version)
+                    selected_prov_detail = st.selectbox(
+                        "Pilih Provinsi untuk Detail Kabupaten/Kota",
+                        options=kabkota_partitions.keys,
+                        key="prov_detail_selector"  # Tambahkan key unik
+                    )
+
+                    # Ambil partisi provinsi terpilih (tanpa scan seluruh tabel)
+                    kabkota_filtered = kabkota_partitions.get(selected_prov_detail)
+
+                    if not kabkota_filtered.empty:
+                        kab_col = roles["kabkota"]["name"]
+                        kabkota_poverty_col = roles["kabkota"]["poverty"]
+
+                        if kab_col and kabkota_poverty_col:
+                            fig_kabkota = figure_cache.get_or_build(
+                                make_key("kabkota", data_version, selected_prov_detail, kab_col, kabkota_poverty_col),
+                                lambda: figures.kabkota_bar(kabkota_filtered, kab_col, kabkota_poverty_col, selected_prov_detail),
+                                name="kabkota", version=data_version
+                            )
+                            show_chart(fig_kabkota)
+                        else:
+                            st.warning("Kolom kabupaten/kota atau kemiskinan tidak ditemukan")
+                    else:
+                        st.warning(f"Tidak ada data kabupaten/kota untuk {selected_prov_detail}")
+                else:
+                    st.warning("Data kabupaten/kota tidak memiliki kolom PROVINSI")
+            else:
+                st.info("Data detail kabupaten/kota tidak tersedia")
+        else:
+            st.warning("Kolom penduduk miskin tidak ditemukan")
+    except Exception as e:
+        st.error(f"❌ Error di Tab 4: {str(e)}")
+
+
+@st.fragment
+@instrument.timed("tab5")
+def render_boxplot(filtered_view, box_filter, group_stats, data_version, figure_cache):
+    """Tab 5: boxplot variabel terpilih"""
+    from dashboard import figures
+
+    st.markdown("### 📊 Boxplot")
+
+    try:
+        if box_filter:
+            if box_filter in group_stats:
+                # Kuartil dan whisker dari sketsa per provinsi; browser tidak menerima data mentah
+                build = lambda: figures.box_stats_figure(group_stats.box(box_filter, filtered_view.rows), box_filter)
+            else:
+                build = lambda: figures.box_figure(filtered_view.frame(), box_filter)
+            fig_box = figure_cache.get_or_build(
+                make_key("box", data_version, filtered_view.key, box_filter), build,
+                name="box", version=data_version
+            )
+            if fig_box is not None:
+                show_chart(fig_box)
+            else:
+                st.warning(f"Tidak ada data {box_filter} untuk filter yang dipilih")
+        else:
+            st.info("Pilih variabel untuk menampilkan boxplot dari sidebar")
+    except Exception as e:
+        st.error(f"❌ Error di Tab 5: {str(e)}")
+
+
+@st.fragment
+@instrument.timed("tab6")
+def render_aps(filtered_view, roles, data_version, figure_cache):
+    """Tab 6: Angka Partisipasi Sekolah"""
+    from dashboard import figures
+
+    st.markdown("### 🎓 Angka Partisipasi Sekolah")
+
+    try:
+        # Interactive provinsi selector
+        available_provinces_aps = sorted(filtered_view.column("PROVINSI").unique())
+        selected_prov_aps = st.selectbox(
+            "Pilih Provinsi untuk Detail Angka Partisipasi Sekolah",
+            options=available_provinces_aps,
+            key="aps_selector"  # Tambahkan key unik
+        )
+
+        if selected_prov_aps:
+            # Ambil baris provinsi yang dipilih
+            aps_row = filtered_view.first_row("PROVINSI", selected_prov_aps)
+
+            if aps_row is not None:
+                fig_pie = figure_cache.get_or_build(
+                    make_key("aps", data_version, selected_prov_aps),
+                    lambda: figures.aps_pie(aps_row, roles["provinsi"]["aps"]),
+                    name="aps", version=data_version
+                )
+
+                if fig_pie is not None:
+                    show_chart(fig_pie)
+                else:
+                    st.warning("Data APS tidak ditemukan untuk provinsi yang dipilih. Pastikan kolom APS tersedia dengan format yang benar.")
+            else:
+                st.warning(f"Provinsi '{selected_prov_aps}' tidak ditemukan")
+        else:
+            st.info("Pilih provinsi untuk melihat data Angka Partisipasi Sekolah")
+    except Exception as e:
+        st.error(f"❌ Error di Tab 6: {str(e)}")
+
+
+@st.fragment
+@instrument.timed("tab7")
+def render_tren(data_panels, roles, provinces, selected_year, panel_version, figure_cache):
+    """Tab 7: tren antar tahun dan perubahan terhadap tahun sebelumnya"""
+    from dashboard import figures
+
+    st.markdown("### 📉 Tren Tahunan")
+
+    try:
+        # Hanya indikator yang tabelnya memiliki lebih dari satu tahun
+        indicators = {}
+        for table, role in TREND_INDICATORS:
+            col = roles.get(table, {}).get(role)
+            panel = data_panels.get(table)
+            if panel is not None and col is not None and col in panel.value_cols and len(panel.years) > 1:
+                indicators[col] = panel
+
+        if not indicators:
+            st.info("Data hanya memuat satu tahun. Tambahkan kolom TAHUN di setiap sheet "
+                    "(satu baris per provinsi per tahun) untuk melihat tren antar tahun.")
+            return
+
+        trend_col = st.selectbox("Pilih Indikator", options=list(indicators), key="trend_indicator")
+        panel = indicators[trend_col]
+        year_col = panel.year_col
+
+        fig_trend = figure_cache.get_or_build(
+            make_key("tren", panel_version, trend_col, tuple(provinces)),
+            lambda: figures.trend_line(panel.trend(trend_col, provinces), panel.key_col,
+                                       year_col, trend_col, panel.window),
+            name="tren", version=panel_version
+        )
+        if fig_trend is not None:
+            show_chart(fig_trend)
+        else:
+            st.warning(f"Tidak ada data {trend_col} untuk provinsi yang dipilih")
+
+        fig_yoy = figure_cache.get_or_build(
+            make_key("yoy", panel_version, trend_col, selected_year, tuple(provinces)),
+            lambda: figures.yoy_bar(panel.year_change(trend_col, selected_year, provinces),
+                                    panel.key_col, trend_col, selected_year),
+            name="yoy", version=panel_version
+        )
+        if fig_yoy is not None:
+            show_chart(fig_yoy)
+        else:
+            st.info(f"Tidak ada data tahun sebelum {selected_year} untuk dibandingkan")
+    except Exception as e:
+        st.error(f"❌ Error di Tab 7: {str(e)}")
+
+
+@st.fragment
+@instrument.timed("tab8")
+def render_analitik(filtered_view, data_provinsi, data_tpak, roles, data_version, figure_cache):
+    """Tab 8: korelasi, peringkat, dan outlier lintas indikator untuk provinsi terfilter"""
+    from dashboard import figures
+
+    st.markdown("### 🔗 Analisis Lintas Indikator")
+
+    try:
+        analytics = get_indicator_analytics(data_provinsi, data_tpak, roles, data_version)
+        if len(analytics.columns) < 2:
+            st.warning("Minimal dua kolom indikator diperlukan untuk analisis lintas indikator")
+            return
+
+        # Satu pass untuk semua indikator; jumlah subset diperbarui dari filter sebelumnya
+        with instrument.section("analytics"):
+            result = analytics.analyze(filtered_view.rows)
+
+        fig_corr = figure_cache.get_or_build(
+            make_key("corr", data_version, filtered_view.key),
+            lambda: figures.correlation_heatmap(result.correlation),
+            name="corr", version=data_version
+        )
+        if fig_corr is not None:
+            show_chart(fig_corr)
+        else:
+            st.warning("Data tidak cukup untuk menghitung korelasi (minimal 3 provinsi)")
+
+        default_dims = [col for col in analytics.columns if col != GAP_COLUMN][:4]
+        matrix_cols = st.multiselect(
+            "Indikator untuk Scatter Matrix",
+            options=analytics.columns,
+            default=default_dims,
+            key="matrix_indicators"
+        )
+        if len(matrix_cols) >= 2:
+            fig_matrix = figure_cache.get_or_build(
+                make_key("matrix", data_version, filtered_view.key, tuple(matrix_cols)),
+                lambda: figures.scatter_matrix(analytics.frame(filtered_view.rows), matrix_cols, "PROVINSI"),
+                name="matrix", version=data_version
+            )
+            if fig_matrix is not None:
+                show_chart(fig_matrix)
+        else:
+            st.info("Pilih minimal dua indikator untuk scatter matrix")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("#### 🏅 Peringkat per Indikator (1 = tertinggi)")
+            st.dataframe(result.ranks.astype("Int64"), use_container_width=True)
+        with col2:
+            st.markdown("#### ⚠️ Outlier (|z| > 2)")
+            if result.outliers.empty:
+                st.info("Tidak ada outlier pada provinsi yang dipilih")
+            else:
+                st.dataframe(result.outliers.round(2), use_container_width=True, hide_index=True)
+
+        if GAP_COLUMN in analytics.columns:
+            gap = analytics.frame(filtered_view.rows)[["PROVINSI", GAP_COLUMN]].dropna()
+            gap = gap.sort_values(GAP_COLUMN, ascending=False)
+            st.markdown("#### 👫 Selisih TPAK Laki-laki − Perempuan (poin %)")
+            st.dataframe(gap.round(2), use_container_width=True, hide_index=True)
+    except Exception as e:
+        st.error(f"❌ Error di Tab 8: {str(e)}")
+
+
+
+def main():
+    """Satu rerun halaman dashboard (dipanggil entry point setiap kali script dijalankan)"""
+    st.set_page_config(**PAGE_CONFIG)
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+    # -------------------------------
+    # Load Data
+    # -------------------------------
+
+    # Instrumentasi: aktif lewat DASHBOARD_PROFILE=1 atau ?profile=<token> (panel admin)
+    profile_admin = instrument.query_enabled(st.query_params)
+    instrument.start_run(get_profiler() if profile_admin or instrument.env_enabled() else None)
+
+    # Load data
+    with instrument.section("load"):
+        data_panels, roles, data_version, message = load_data_direct()
+    get_query_api()
+
+    # Waktu data aktif dimuat (bukan waktu rerun); None selama load pertama belum selesai
+    loaded_at = get_data_store().snapshot().loaded_at
+    data_updated = datetime.fromtimestamp(loaded_at) if loaded_at else datetime.now()
+
+    # Tahun data: partisi tahun terpilih diambil dari panel tanpa membaca ulang workbook
+    data_provinsi = data_kabkota = data_tpak = None
+    if data_panels is not None:
+        data_years = data_panels["provinsi"].years
+        with st.sidebar:
+            st.markdown("### 🎛️ Kontrol Dashboard")
+            if len(data_years) > 1:
+                selected_year = st.select_slider("Tahun Data", options=data_years, value=data_years[-1],
+                                                 key="data_year")
+            else:
+                selected_year = data_years[-1]
+
+        # Saat load pertama kab/kota dan TPAK bisa belum siap (None); ditunggu sebelum visualisasi
+        data_provinsi = data_panels["provinsi"].year(selected_year)
+        data_kabkota = year_table(data_panels, "kabkota", selected_year)
+        data_tpak = year_table(data_panels, "tpak", selected_year)
+
+        # Index, partisi, dan figure di-cache per tahun; tren memakai versi seluruh panel
+        panel_version = data_version
+        data_version = f"{data_version}:{selected_year}"
+
+
+    # -------------------------------
+    # Main Dashboard (hanya jika data berhasil dimuat)
+    # -------------------------------
+    if data_provinsi is not None and not data_provinsi.empty:
+
+        # -------------------------------
+        # Header Dashboard
+        # -------------------------------
+        st.markdown(HEADER_HTML.format(year=selected_year, updated=data_updated.strftime("%d %B %Y")),
+                    unsafe_allow_html=True)
+
+        # Reload terakhir gagal: data versi sebelumnya tetap ditampilkan
+        if get_data_store().snapshot().error is not None:
+            st.warning(message)
+
+        # -------------------------------
+        # Sidebar Controls
+        # -------------------------------
+        with st.sidebar:
+            # Enhanced filters (tanpa statistik cepat)
+            st.markdown("#### 🔍 Filter Data")
+
+            # Detect available columns dynamically
+            available_columns = [col for col in data_provinsi.columns
+                                 if col not in ['PROVINSI', roles["provinsi"].get("year")]]
+
+            if available_columns:
+                box_filter = st.selectbox(
+                    "Pilih Variabel untuk Boxplot", 
+                    options=available_columns,
+                    help="Pilih variabel untuk analisis distribusi data"
+                )
+            else:
+                box_filter = None
+
+            sort_order = st.radio(
+                "Urutkan Bar Chart", 
+                options=["Descending", "Ascending"],
+                help="Pilih urutan data TPT"
+            )
+
+            # Province filter
+            selected_provinces = st.multiselect(
+                "Filter Provinsi Spesifik",
+                options=data_provinsi["PROVINSI"].tolist(),
+                default=data_provinsi["PROVINSI"].tolist(),
+                help="Pilih provinsi untuk analisis detail"
+            )
+
+            # Data range slider
+            if "PENDUDUK_MISKIN" in data_provinsi.columns:
+                poverty_range = st.slider(
+                    "Range Penduduk Miskin (Ribu)",
+                    min_value=int(data_provinsi["PENDUDUK_MISKIN"].min()),
+                    max_value=int(data_provinsi["PENDUDUK_MISKIN"].max()),
+                    value=(int(data_provinsi["PENDUDUK_MISKIN"].min()), 
+                           int(data_provinsi["PENDUDUK_MISKIN"].max())),
+                    help="Filter data berdasarkan jumlah penduduk miskin"
+                )
+            else:
+                # Default values jika kolom tidak ada
+                poverty_range = (0, 1000)
+
+        # Filter data berdasarkan selection (lewat index yang dibangun sekali saat load)
+        with instrument.section("filter"):
+            filter_index = get_filter_index(data_provinsi, data_version)
+            filtered_view = filter_index.select(data_provinsi, selected_provinces, poverty_range)
+
+        figure_cache = get_figure_cache()
+        group_stats = get_group_stats(data_provinsi, data_version)
+
+        # -------------------------------
+        # Interactive Metrics Dashboard
+        # -------------------------------
+        st.markdown("### 📊 Ringkasan Eksekutif")
+
+        # Metrik digabung dari agregat per provinsi, tanpa menjumlah ulang baris
+        with instrument.section("metrics"):
+            if len(filtered_view):
+                col1, col2, col3 = st.columns(3)
+
+                with col1:
+                    if "PENDUDUK_MISKIN" in group_stats:
+                        total_poverty = group_stats.summary("PENDUDUK_MISKIN", filtered_view.rows).total
+                        st.metric(
+                            "Total Penduduk Miskin", 
+                            f"{total_poverty:,.0f}K"
+                        )
+                    else:
+                        st.metric("Total Penduduk Miskin", "N/A")
+
+                with col2:
+                    if "PENDUDUK_MISKIN" in group_stats:
+                        avg_poverty_filtered = group_stats.summary("PENDUDUK_MISKIN", filtered_view.rows).mean
+                        st.metric(
+                            "Rata-rata Kemiskinan", 
+                            f"{avg_poverty_filtered:.1f}K"
+                        )
+                    else:
+                        st.metric("Rata-rata Kemiskinan", "N/A")
+
+                with col3:
+                    if "TPT (%)" in group_stats:
+                        avg_tpt = group_stats.summary("TPT (%)", filtered_view.rows).mean
+                        st.metric(
+                            "Rata-rata TPT", 
+                            f"{avg_tpt:.2f}%"
+                        )
+                    else:
+                        st.metric("Rata-rata TPT", "N/A")
+
+        # -------------------------------
+        # Visualizations
+        # -------------------------------
+        st.markdown("### 🗺️ Visualisasi Data Kemiskinan Indonesia")
+
+        # Ringkasan di atas sudah tampil; tunggu tabel lain jika load pertama belum selesai
+        if data_kabkota is None or data_tpak is None:
+            with instrument.section("load_rest"):
+                snapshot = wait_full_data()
+            if snapshot.complete:
+                data_panels, roles = snapshot.data["panels"], snapshot.data["roles"]
+                data_kabkota = year_table(data_panels, "kabkota", selected_year)
+                data_tpak = year_table(data_panels, "tpak", selected_year)
+                panel_version = snapshot.data["version"]
+                data_version = f"{panel_version}:{selected_year}"
+            else:
+                st.error(describe_load_error(snapshot.error, DATA_FILE))
+
+        # Data baru (versi aktif) sudah lengkap: figure versi lama di store disk tidak terpakai lagi
+        active_snapshot = get_data_store().snapshot()
+        if active_snapshot.complete and active_snapshot.data and active_snapshot.data["version"] == panel_version:
+            prune_result_store(panel_version)
+
+        # PENTING: Pastikan ini dalam try-except untuk menangkap error
+        try:
+            # Pemilih tampilan: hanya view yang aktif yang dijalankan setiap rerun.
+            # Setiap view adalah fragment, jadi widget di dalamnya hanya me-rerun view itu.
+            active_view = st.radio(
+                "Pilih Tampilan",
+                options=VIEW_LABELS,
+                horizontal=True,
+                key="active_view",
+                label_visibility="collapsed"
+            )
+
+            if active_view == VIEW_LABELS[0]:
+                render_peta(filtered_view, data_provinsi, data_kabkota, roles, data_version, figure_cache)
+            elif active_view == VIEW_LABELS[1]:
+                render_tpt(filtered_view, sort_order, data_version, figure_cache)
+            elif active_view == VIEW_LABELS[2]:
+                render_tpak(data_tpak, roles, data_version, figure_cache)
+            elif active_view == VIEW_LABELS[3]:
+                render_kemiskinan(filtered_view, sort_order, data_kabkota, roles, data_version, figure_cache)
+            elif active_view == VIEW_LABELS[4]:
+                render_boxplot(filtered_view, box_filter, group_stats, data_version, figure_cache)
+            elif active_view == VIEW_LABELS[5]:
+                render_aps(filtered_view, roles, data_version, figure_cache)
+            elif active_view == VIEW_LABELS[6]:
+                render_tren(data_panels, roles, list(filtered_view.column("PROVINSI")), selected_year,
+                            panel_version, figure_cache)
+            elif active_view == VIEW_LABELS[7]:
+                render_analitik(filtered_view, data_provinsi, data_tpak, roles, data_version, figure_cache)
+
+        except Exception as e:
+            st.error(f"❌ Error dalam definisi tampilan: {str(e)}")
+            st.info("Silakan refresh halaman atau periksa console untuk detail error")
+
+        # Statistik cache figure (untuk memantau hit/miss saat beban tinggi)
+        with st.sidebar:
+            with st.expander("⚙️ Statistik Cache Grafik"):
+                cache_stats = figure_cache.stats()
+                st.write(f"**Hit:** {cache_stats['hits']} | **Hit disk:** {cache_stats['disk_hits']} | "
+                         f"**Miss:** {cache_stats['misses']}")
+                st.write(f"**Entri:** {cache_stats['entries']} ({cache_stats['bytes'] / 1024:.0f} KB) | "
+                         f"**Dibuang:** {cache_stats['evictions']}")
+                if figure_cache.store is not None:
+                    store_stats = figure_cache.store.stats()
+                    st.write(f"**Store disk:** {store_stats['entries']} entri "
+                             f"({store_stats['bytes'] / 1024:.0f} KB terkompresi)")
+
+                # Ukuran JSON figure sebelum/sesudah diringkas (build terakhir per figure)
+                for name, (raw_bytes, slim_bytes) in sorted(figure_cache.payload_sizes().items()):
+                    saved = 1 - slim_bytes / raw_bytes if raw_bytes else 0
+                    st.write(f"**Payload {name}:** {raw_bytes / 1024:.1f} KB → {slim_bytes / 1024:.1f} KB "
+                             f"(hemat {saved:.0%})")
+
+                # Porsi data yang dibaca zero-copy dari cache memory-map bersama
+                tables = {"provinsi": data_provinsi, "kabkota": data_kabkota, "tpak": data_tpak}
+                shared_report = get_shared_memory_report(tables, data_version)
+                for name, (shared, total) in shared_report.items():
+                    st.write(f"**Data {name}:** {shared / 1024:.0f} KB dari {total / 1024:.0f} KB memory-map bersama")
+
+                # Penghematan tipe ringkas (category/float32) dibanding object/float64
+                for name, (compact, wide) in get_storage_report(tables, data_version).items():
+                    saved = 1 - compact / wide if wide else 0
+                    st.write(f"**Tipe ringkas {name}:** {compact / 1024:.0f} KB "
+                             f"(hemat {(wide - compact) / 1024:.0f} KB, {saved:.0%})")
+
+    else:
+        # Tampilkan pesan error jika data tidak berhasil dimuat
+        st.error("❌ Data tidak dapat dimuat!")
+        st.markdown(f"**Error message:** {message}")
+
+    # -------------------------------
+    # Panel Profiling (admin)
+    # -------------------------------
+    # Hanya untuk sesi dengan ?profile=<token>; nilai terkumpul dari semua sesi yang diprofil
+    if profile_admin:
+        with st.sidebar:
+            with st.expander("⏱️ Profil Performa (Admin)", expanded=True):
+                profiler = get_profiler()
+                sections, counters = profiler.snapshot()
+                if sections:
+                    timing_table = pd.DataFrame.from_dict(sections, orient="index")
+                    timing_table[["total_seconds", "max_seconds", "last_seconds", "mean_seconds"]] *= 1000
+                    timing_table.columns = ["Panggilan", "Total (ms)", "Maks (ms)", "Terakhir (ms)", "Rata-rata (ms)"]
+                    st.dataframe(timing_table.round(1), use_container_width=True)
+                else:
+                    st.info("Belum ada data timing")
+                st.write(" | ".join(f"**{name}:** {value}" for name, value in counters.items()))
+
+                st.download_button("📥 Prometheus", profiler.prometheus(),
+                                   file_name="dashboard_metrics.prom", mime="text/plain")
+                st.download_button("📥 JSON lines", profiler.json_lines(),
+                                   file_name="dashboard_metrics.jsonl", mime="application/jsonl")
+                if st.button("Reset Statistik"):
+                    profiler.reset()
+
+    # -------------------------------
+    # Footer
+    # -------------------------------
+    st.markdown("---")
+    st.markdown(FOOTER_HTML.format(updated=data_updated.strftime("%d %B %Y, %H:%M")), unsafe_allow_html=True)
+
+    # Tulis timing rerun ini ke DASHBOARD_PROFILE_FILE (jika diset)
+    instrument.finish_run()
@@ -0,0 +1,319 @@
+"""Cache kolumnar di disk untuk workbook Excel dashboard.
+
+Workbook hanya di-parse sekali (lihat ``dashboard.workbook``), lalu setiap
+kolom disimpan sebagai file ``.npy`` terpisah. Load berikutnya cukup
+memory-map file tersebut sehingga start proses baru tidak perlu membuka
+Excel lagi. Cache dibangun ulang hanya jika isi file sumber berubah (dicek
+lewat mtime/ukuran lalu hash SHA-256), dan hanya sheet yang sidik jarinya
+berubah yang di-parse ulang.
+
+Karena kolom angka (dan kode kolom kategori) dibaca sebagai memory-map,
+beberapa proses server yang memakai folder cache yang sama berbagi halaman
+memori yang sama (page cache OS) alih-alih masing-masing menyimpan salinan
+sendiri. Arahkan ``DASHBOARD_CACHE_DIR`` ke tmpfs (mis. ``/dev/shm``) agar
+cache sepenuhnya berada di shared memory.
+"""
+
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from dashboard.workbook import read_workbook, sheet_fingerprints
+
+CACHE_FORMAT_VERSION = 4
+MANIFEST_NAME = "manifest.json"
+# Folder .build-/.old- yang lebih tua dari ini sisa proses yang mati di tengah penulisan
+STALE_BUILD_SECONDS = 3600
+
+
+def default_cache_dir(file_path):
+    """Folder cache default: ``$DASHBOARD_CACHE_DIR/<nama file>``.
+
+    Tanpa variabel lingkungan tersebut, cache ditaruh di ``.cache/`` di
+    samping file sumber.
+    """
+    base = os.environ.get("DASHBOARD_CACHE_DIR") or os.path.join(
+        os.path.dirname(os.path.abspath(file_path)), ".cache"
+    )
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(base, stem)
+
+
+def _is_mapped(values):
+    while values is not None:
+        if isinstance(values, (np.memmap, mmap.mmap)):
+            return True
+        values = getattr(values, "base", None)
+    return False
+
+
+def mapped_bytes(data):
+    """Tuple ``(byte kolom memory-map, total byte)`` untuk satu DataFrame.
+
+    Dipakai untuk memastikan kolom angka tetap zero-copy (dibagi antar
+    proses) setelah melewati tahap persiapan data.
+    """
+    shared = total = 0
+    for col in data.columns:
+        series = data[col]
+        nbytes = int(series.memory_usage(index=False, deep=True))
+        total += nbytes
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Hanya kode yang di-memory-map; daftar kategori ada di tiap proses
+            codes = series.array.codes
+            shared += codes.nbytes if _is_mapped(codes) else 0
+        elif _is_mapped(series.to_numpy()):
+            shared += nbytes
+    return shared, total
+
+
+def content_hash(file_path, chunk_size=1 << 20):
+    """Hash SHA-256 dari isi file."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format") != CACHE_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def _write_manifest(cache_dir, manifest):
+    tmp_path = os.path.join(cache_dir, MANIFEST_NAME + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(cache_dir, MANIFEST_NAME))
+
+
+def _save_column(series, directory, index):
+    """Simpan satu kolom dan kembalikan metadata-nya untuk manifest."""
+    meta = {"name": series.name, "file": f"c{index}.npy"}
+    path = os.path.join(directory, meta["file"])
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Kode integer di-memory-map seperti kolom angka; kategori disimpan terpisah
+        meta["kind"] = "cat"
+        meta["categories"] = f"c{index}_cat.npy"
+        np.save(path, np.asarray(series.array.codes), allow_pickle=False)
+        categories = np.asarray(series.cat.categories, dtype=object).astype(str)
+        np.save(os.path.join(directory, meta["categories"]), categories, allow_pickle=False)
+        return meta
+
+    values = series.to_numpy()
+
+    if values.dtype.kind in "biufcmM":
+        meta["kind"] = "num"
+        np.save(path, values, allow_pickle=False)
+        return meta
+
+    # Kolom teks: simpan sebagai array unicode lebar tetap + mask nilai kosong
+    missing = pd.isna(values)
+    present = values[~missing]
+    if all(isinstance(v, str) for v in present):
+        meta["kind"] = "str"
+        text = np.where(missing, "", values).astype(str)
+        np.save(path, text, allow_pickle=False)
+        if missing.any():
+            meta["mask"] = f"c{index}_na.npy"
+            np.save(os.path.join(directory, meta["mask"]), missing, allow_pickle=False)
+        return meta
+
+    # Kolom campuran (mis. angka dan '-') disimpan apa adanya
+    meta["kind"] = "obj"
+    np.save(path, values.astype(object), allow_pickle=True)
+    return meta
+
+
+def _load_column(meta, directory):
+    path = os.path.join(directory, meta["file"])
+    if meta["kind"] == "num":
+        return np.load(path, mmap_mode="r")
+    if meta["kind"] == "cat":
+        categories = np.load(os.path.join(directory, meta["categories"])).astype(object)
+        return pd.Categorical.from_codes(np.load(path, mmap_mode="r"), categories=categories, validate=False)
+    if meta["kind"] == "str":
+        values = np.load(path).astype(object)
+        if "mask" in meta:
+            values[np.load(os.path.join(directory, meta["mask"]))] = np.nan
+        return values
+    return np.load(path, allow_pickle=True)
+
+
+def _write_cache(cache_dir, frames, manifest, fingerprints):
+    """Tulis cache ke folder sementara lalu tukar secara atomik."""
+    parent = os.path.dirname(cache_dir) or "."
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".build-", dir=parent)
+    try:
+        manifest["sheets"] = {}
+        for i, (sheet, df) in enumerate(frames.items()):
+            sheet_dir = os.path.join(staging, f"sheet{i}")
+            os.makedirs(sheet_dir)
+            columns = [_save_column(df[col], sheet_dir, j) for j, col in enumerate(df.columns)]
+            manifest["sheets"][sheet] = {
+                "dir": f"sheet{i}",
+                "rows": len(df),
+                "fingerprint": fingerprints.get(sheet),
+                "columns": columns,
+            }
+        _write_manifest(staging, manifest)
+
+        retired = None
+        if os.path.exists(cache_dir):
+            retired = tempfile.mkdtemp(prefix=".old-", dir=parent)
+            os.replace(cache_dir, os.path.join(retired, "cache"))
+        os.replace(staging, cache_dir)
+        if retired:
+            shutil.rmtree(retired, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    _remove_stale(parent)
+
+
+def _stale_manifest(manifest_path):
+    """Manifest di ``manifest_path`` jika formatnya lebih lama dari ``CACHE_FORMAT_VERSION``."""
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    version = manifest.get("format") if isinstance(manifest, dict) else None
+    # Format lebih baru milik proses dari deploy berikutnya; jangan dihapus
+    return manifest if isinstance(version, int) and version < CACHE_FORMAT_VERSION else None
+
+
+def _remove_stale(parent):
+    """Hapus cache format lama dan sisa build yang gagal di folder ``parent``.
+
+    Cache per sheet tinggal berdampingan (``<stem>/<sheet>``), jadi folder
+    saudara dengan manifest format lama, dan manifest format lama di
+    ``parent`` sendiri (layout satu folder per workbook) beserta folder
+    sheet yang dirujuknya, tidak akan pernah dibaca lagi.
+    """
+    try:
+        entries = list(os.scandir(parent))
+    except OSError:
+        return
+    cutoff = time.time() - STALE_BUILD_SECONDS
+    own_manifest = os.path.join(parent, MANIFEST_NAME)
+    legacy = _stale_manifest(own_manifest)
+    legacy_dirs = set()
+    if legacy and isinstance(legacy.get("sheets"), dict):
+        legacy_dirs = {info.get("dir") for info in legacy["sheets"].values() if isinstance(info, dict)}
+    for entry in entries:
+        try:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            if entry.name.startswith((".build-", ".old-")):
+                stale = entry.stat(follow_symlinks=False).st_mtime < cutoff
+            else:
+                stale = entry.name in legacy_dirs or _stale_manifest(
+                    os.path.join(entry.path, MANIFEST_NAME)) is not None
+        except OSError:
+            continue
+        if stale:
+            shutil.rmtree(entry.path, ignore_errors=True)
+    if legacy:
+        with contextlib.suppress(OSError):
+            os.remove(own_manifest)
+
+
+def _load_cache(cache_dir, manifest, sheet_names):
+    frames = {}
+    for sheet in sheet_names:
+        info = manifest["sheets"][sheet]
+        directory = os.path.join(cache_dir, info["dir"])
+        columns = {meta["name"]: _load_column(meta, directory) for meta in info["columns"]}
+        frames[sheet] = pd.DataFrame(columns, copy=False)
+    return frames
+
+
+def _unchanged(manifest, stat):
+    return manifest["mtime_ns"] == stat.st_mtime_ns and manifest["size"] == stat.st_size
+
+
+def is_fresh(file_path, sheet_names, cache_dir=None):
+    """True jika semua sheet bisa langsung dibaca dari cache tanpa parse atau hash ulang."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return False
+    manifest = _read_manifest(cache_dir or default_cache_dir(file_path))
+    return (manifest is not None and all(s in manifest["sheets"] for s in sheet_names)
+            and _unchanged(manifest, stat))
+
+
+def load_workbook_cached(file_path, sheet_names, cache_dir=None, reader=read_workbook):
+    """Load sheet-sheet workbook lewat cache kolumnar.
+
+    Mengembalikan tuple ``({nama_sheet: DataFrame}, versi)`` dengan versi
+    berupa hash SHA-256 file sumber. Jika file berubah, hanya sheet yang
+    sidik jarinya berbeda yang dibaca ulang lewat ``reader``; sheet lain
+    diambil dari cache lama. Error dari reader (mis. ``FileNotFoundError``
+    atau sheet tidak ada) diteruskan apa adanya. Jika folder cache tidak
+    bisa ditulis, data tetap dikembalikan tanpa cache.
+    """
+    sheet_names = list(sheet_names)
+    cache_dir = cache_dir or default_cache_dir(file_path)
+    stat = os.stat(file_path)
+
+    manifest = _read_manifest(cache_dir)
+    complete = manifest is not None and all(s in manifest["sheets"] for s in sheet_names)
+    if complete and _unchanged(manifest, stat):
+        return _load_cache(cache_dir, manifest, sheet_names), manifest["sha256"]
+
+    sha256 = content_hash(file_path)
+    # mtime berubah tapi isi bisa saja sama (mis. file di-copy ulang saat deploy)
+    if complete and manifest["sha256"] == sha256:
+        manifest.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        try:
+            _write_manifest(cache_dir, manifest)
+        except OSError:
+            pass
+        return _load_cache(cache_dir, manifest, sheet_names), sha256
+
+    try:
+        fingerprints = sheet_fingerprints(file_path, sheet_names)
+    except (zipfile.BadZipFile, KeyError, ValueError):
+        fingerprints = {}
+    cached = manifest["sheets"] if manifest else {}
+    unchanged = [s for s in sheet_names
+                 if s in cached and s in fingerprints and cached[s].get("fingerprint") == fingerprints[s]]
+    changed = [s for s in sheet_names if s not in unchanged]
+
+    frames = _load_cache(cache_dir, manifest, unchanged) if unchanged else {}
+    if changed:
+        frames.update(reader(file_path, changed))
+    frames = {sheet: frames[sheet] for sheet in sheet_names}
+
+    manifest = {
+        "format": CACHE_FORMAT_VERSION,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": sha256,
+    }
+    try:
+        _write_cache(cache_dir, frames, manifest, fingerprints)
+    except OSError:
+        return frames, sha256
+    # Baca balik dari cache agar proses ini juga memakai kolom memory-map bersama
+    return _load_cache(cache_dir, manifest, sheet_names), sha256
@@ -0,0 +1,66 @@
+"""Pipeline load dataset dashboard: sumber data -> tabel tervalidasi -> panel per tahun.
+
+Dipakai oleh dashboard Streamlit (``kemiskinan.py``, lewat ``DataStore``)
+dan oleh mode batch (``dashboard.export``) sehingga keduanya melihat
+tabel, peran kolom, dan versi data yang sama.
+"""
+
+import os
+
+from dashboard.panel import YearPanel
+from dashboard.refresh import DataValidationError
+from dashboard.schema import coerce_numeric, resolve_table_roles
+from dashboard.sources import LoadJob, SourceRegistry
+
+# Sheet workbook -> tabel dashboard, sesuai urutan tampil (provinsi dulu untuk ringkasan eksekutif)
+SHEET_TABLES = {"DATA_PROVINSI": "provinsi", "KEMISKINAN_KABKOTA": "kabkota", "TPAK_JENISKELAMIN": "tpak"}
+# Sumber tambahan (workbook tahunan, ekspor CSV), dipisah os.pathsep; lihat SourceRegistry.add_file
+EXTRA_SOURCES = [path for path in os.environ.get("DASHBOARD_EXTRA_SOURCES", "").split(os.pathsep) if path]
+PANEL_KEYS = {"provinsi": "province", "kabkota": "name", "tpak": "province"}
+
+
+def build_registry(file_path):
+    """Semua sumber data dashboard: workbook utama ditambah sumber tambahan"""
+    registry = SourceRegistry().add_workbook(file_path, SHEET_TABLES)
+    for path in EXTRA_SOURCES:
+        registry.add_file(path, SHEET_TABLES)
+    return registry
+
+
+def prepare_table(name, table):
+    """Validasi satu tabel, tentukan peran kolomnya, lalu pecah menjadi panel per tahun"""
+    if name == "provinsi":
+        if table.empty:
+            raise DataValidationError("Data provinsi kosong!")
+        if "PROVINSI" not in table.columns:
+            raise DataValidationError("Kolom PROVINSI tidak ditemukan di sheet DATA_PROVINSI")
+
+    # Tentukan peran kolom sekali, lalu pastikan kolom angka sudah numerik
+    table_roles = resolve_table_roles(name, table)
+    table = coerce_numeric(table, table_roles)
+
+    # Satu partisi per tahun (satu partisi saja jika tidak ada kolom TAHUN)
+    value_cols = [col for role, col in table_roles.items()
+                  if role in ("poverty", "tpt", "male", "female") and col is not None]
+    value_cols += table_roles.get("aps", [])
+    panel = YearPanel.from_frame(
+        table, table_roles.get(PANEL_KEYS[name]), value_cols, year_col=table_roles.get("year")
+    )
+    return panel, table_roles
+
+
+def load_dataset(file_path, publish=None):
+    """Load, validasi, dan siapkan semua tabel dari file Excel (dan sumber tambahan).
+
+    Sheet yang perlu di-parse ulang dikerjakan paralel; setiap tabel yang
+    siap langsung dipasang lewat ``publish`` agar ringkasan bisa tampil
+    sebelum sheet lain selesai.
+    """
+    panels, roles = {}, {}
+    with LoadJob(build_registry(file_path)) as job:
+        for name in job.as_completed():
+            panels[name], roles[name] = prepare_table(name, job.table(name))
+            if publish is not None and "provinsi" in panels and len(panels) < len(SHEET_TABLES):
+                publish({"panels": dict(panels), "roles": dict(roles), "version": job.version(),
+                         "progress": job.progress()})
+        return {"panels": panels, "roles": roles, "version": job.version()}
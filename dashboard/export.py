@@ -0,0 +1,295 @@
+"""Mode batch: paket laporan statis per provinsi tanpa Streamlit.
+
+Memuat dataset lewat pipeline yang sama dengan dashboard
+(``dashboard.dataset``), menerapkan filter sidebar yang sama
+(``FilterIndex``), lalu untuk setiap provinsi menulis ke
+``<out>/<tahun>/<PROVINSI>/``:
+
+- ``tpt.<fmt>`` dan ``kemiskinan.<fmt>``: Top 10 TPT dan penduduk miskin
+  (tab 2 dan tab 4) atas provinsi hasil filter
+- ``kabkota.<fmt>``: detail kabupaten/kota provinsi itu (tab 4)
+- ``aps.<fmt>``: pie Angka Partisipasi Sekolah (tab 6)
+- ``provinsi.csv``, ``kabkota.csv``, ``tpak.csv``: baris tabel provinsi itu
+- ``ringkasan.csv``: nilai dan peringkat provinsi untuk TPT dan penduduk miskin
+
+Format gambar statis (``png``/``pdf``/``svg``) memerlukan paket opsional
+``kaleido``; tanpa paket itu gambar ditulis sebagai ``html`` interaktif.
+Provinsi dikerjakan paralel di process pool (satu proses jika hanya ada
+satu CPU atau ``--workers 1``). Sidik jarinya (data provinsi, figure
+nasional, format, dan kode pembuat figure) dan daftar file yang ditulis
+dicatat di ``manifest.json``; provinsi yang sidik jarinya sama dengan run
+sebelumnya dan filenya masih lengkap dilewati.
+
+Jalankan dari root repo::
+
+    python -m dashboard.export --out exports --formats png csv
+"""
+
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+from dashboard import figures
+from dashboard.dataset import load_dataset
+from dashboard.figcache import figure_namespace, make_key
+from dashboard.filtering import FilterIndex, Partitions
+from dashboard.geometry import normalize_name
+from dashboard.storage import widen
+
+STATIC_FORMATS = ("png", "pdf", "svg")
+FIGURE_FORMATS = STATIC_FORMATS + ("html", "json")
+MANIFEST_NAME = "manifest.json"
+# Ukuran gambar statis (piksel); tinggi mengikuti layout figure
+IMAGE_WIDTH = 1000
+EXPORT_WORKERS = os.cpu_count() or 1
+
+# Semua input yang menentukan isi paket satu provinsi (dikirim ke worker)
+ProvinceTask = namedtuple("ProvinceTask", [
+    "province", "directory", "formats", "provinsi", "kabkota", "tpak", "summary",
+    "national", "national_key", "roles",
+])
+
+
+def static_export_available():
+    """True jika ``kaleido`` terpasang sehingga figure bisa diekspor ke PNG/PDF/SVG."""
+    try:
+        import kaleido  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_formats(formats, static_available=None):
+    """Format yang benar-benar ditulis: gambar statis diganti ``html`` tanpa kaleido."""
+    if static_available is None:
+        static_available = static_export_available()
+    resolved = []
+    for fmt in formats:
+        if fmt in STATIC_FORMATS and not static_available:
+            fmt = "html"
+        if fmt not in resolved:
+            resolved.append(fmt)
+    return resolved
+
+
+def safe_name(name):
+    """Nama folder dari nama provinsi (``"KEP. RIAU"`` -> ``"KEP_RIAU"``)."""
+    return re.sub(r"[^A-Za-z0-9]+", "_", str(name)).strip("_") or "_"
+
+
+def render(fig, fmt):
+    """Isi file figure dalam satu format (bytes)."""
+    if fmt in STATIC_FORMATS:
+        return fig.to_image(format=fmt, width=IMAGE_WIDTH)
+    if fmt == "html":
+        return fig.to_html(include_plotlyjs="cdn", full_html=True).encode("utf-8")
+    return fig.to_json().encode("utf-8")
+
+
+def _write(path, content):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def export_province(task):
+    """Worker: tulis paket satu provinsi; kembalikan daftar file yang ditulis."""
+    os.makedirs(task.directory, exist_ok=True)
+    roles = task.roles
+    figure_formats = [fmt for fmt in task.formats if fmt in FIGURE_FORMATS]
+    written = []
+
+    province_figures = {}
+    kab_col, kab_poverty_col = roles["kabkota"].get("name"), roles["kabkota"].get("poverty")
+    if not task.kabkota.empty and kab_col and kab_poverty_col:
+        province_figures["kabkota"] = figures.kabkota_bar(task.kabkota, kab_col, kab_poverty_col, task.province)
+    if not task.provinsi.empty:
+        province_figures["aps"] = figures.aps_pie(task.provinsi.iloc[0], roles["provinsi"].get("aps", []))
+
+    for fmt in figure_formats:
+        for name, content in task.national.get(fmt, {}).items():
+            _write(os.path.join(task.directory, f"{name}.{fmt}"), content)
+            written.append(f"{name}.{fmt}")
+        for name, fig in province_figures.items():
+            if fig is not None:
+                _write(os.path.join(task.directory, f"{name}.{fmt}"), render(fig, fmt))
+                written.append(f"{name}.{fmt}")
+
+    if "csv" in task.formats:
+        tables = {"provinsi": task.provinsi, "kabkota": task.kabkota, "tpak": task.tpak, "ringkasan": task.summary}
+        for name, table in tables.items():
+            _write(os.path.join(task.directory, f"{name}.csv"),
+                   widen(table).to_csv(index=False).encode("utf-8"))
+            written.append(f"{name}.csv")
+    return written
+
+
+def fingerprint(task, namespace):
+    """Sidik jari semua input paket satu provinsi."""
+    parts = [namespace, task.province, tuple(task.formats), json.dumps(task.roles, sort_keys=True)]
+    for table in (task.provinsi, task.kabkota, task.tpak, task.summary):
+        parts += [tuple(map(str, table.columns)), pd.util.hash_pandas_object(table, index=False).to_numpy()]
+    # Figure nasional lewat JSON-nya: HTML hasil render berisi id acak
+    parts.append(task.national_key)
+    return make_key(*parts)
+
+
+def _read_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def rank_summary(frame, province, columns):
+    """Nilai dan peringkat (1 = tertinggi) provinsi di antara provinsi hasil filter."""
+    rows = []
+    for col in columns:
+        if col not in frame.columns:
+            continue
+        ranks = frame[col].rank(ascending=False, method="min")
+        match = (frame["PROVINSI"] == province).to_numpy()
+        if match.any():
+            value = frame[col].to_numpy()[match][0]
+            rank = ranks.to_numpy()[match][0]
+            rows.append({"indikator": col, "nilai": value,
+                         "peringkat": None if pd.isna(rank) else int(rank), "dari": int(ranks.notna().sum())})
+    return pd.DataFrame(rows, columns=["indikator", "nilai", "peringkat", "dari"])
+
+
+def build_tasks(dataset, out_dir, formats, year=None, provinces=None, poverty_range=None, ascending=False):
+    """Tahun terpakai dan ``ProvinceTask`` untuk setiap provinsi hasil filter."""
+    panels, roles = dataset["panels"], dataset["roles"]
+    years = panels["provinsi"].years
+    year = years[-1] if year is None else year
+    if year not in years:
+        raise ValueError(f"Tahun {year} tidak ada di data (tersedia: {', '.join(map(str, years))})")
+
+    data_provinsi = panels["provinsi"].year(year)
+    data_kabkota = panels["kabkota"].year(year) if "kabkota" in panels else None
+    data_tpak = panels["tpak"].year(year) if "tpak" in panels else None
+
+    # Filter yang sama dengan sidebar dashboard
+    filter_index = FilterIndex(data_provinsi)
+    selected = list(data_provinsi["PROVINSI"].dropna().unique()) if provinces is None else provinces
+    rows = filter_index.query(selected, poverty_range if "PENDUDUK_MISKIN" in data_provinsi.columns else None)
+    filtered = filter_index.view(data_provinsi, rows).frame()
+
+    poverty_col = roles["provinsi"].get("poverty")
+    national_figures = {}
+    if "TPT (%)" in filtered.columns:
+        national_figures["tpt"] = figures.tpt_bar(filtered, ascending=ascending)
+    if poverty_col:
+        national_figures["kemiskinan"] = figures.poverty_bar(filtered, poverty_col, ascending=ascending)
+    national = {fmt: {name: render(fig, fmt) for name, fig in national_figures.items()}
+                for fmt in formats if fmt in FIGURE_FORMATS}
+    national_key = make_key(*(fig.to_json() for fig in national_figures.values()))
+
+    # Ejaan provinsi antar sheet berbeda (mis. "DI YOGYAKARTA" vs "D I YOGYAKARTA"),
+    # jadi kab/kota dan TPAK dicocokkan lewat nama yang dinormalisasi
+    kab_prov_col = roles.get("kabkota", {}).get("province")
+    kabkota_partitions = (Partitions(data_kabkota, kab_prov_col, normalize=normalize_name)
+                          if data_kabkota is not None and kab_prov_col else None)
+    tpak_prov_col = roles.get("tpak", {}).get("province")
+    tpak_partitions = (Partitions(data_tpak, tpak_prov_col, normalize=normalize_name)
+                       if data_tpak is not None and tpak_prov_col else None)
+
+    tasks = []
+    for province in filtered["PROVINSI"].dropna().unique():
+        provinsi_rows = filtered[filtered["PROVINSI"] == province]
+        key = normalize_name(province)
+        kabkota_rows = kabkota_partitions.get(key) if kabkota_partitions is not None else pd.DataFrame()
+        tpak_rows = tpak_partitions.get(key) if tpak_partitions is not None else pd.DataFrame()
+        tasks.append(ProvinceTask(
+            province=str(province),
+            directory=os.path.join(out_dir, str(year), safe_name(province)),
+            formats=list(formats),
+            provinsi=provinsi_rows,
+            kabkota=kabkota_rows,
+            tpak=tpak_rows,
+            summary=rank_summary(filtered, province, [col for col in ("TPT (%)", poverty_col) if col]),
+            national=national,
+            national_key=national_key,
+            roles={name: {role: col for role, col in table_roles.items()}
+                   for name, table_roles in roles.items()},
+        ))
+    return year, tasks
+
+
+def run_export(tasks, manifest_path, namespace, workers=EXPORT_WORKERS, force=False, log=print):
+    """Tulis paket semua provinsi yang berubah; kembalikan ``(ditulis, dilewati)``."""
+    manifest = _read_manifest(manifest_path)
+    pending = []
+    for task in tasks:
+        key = fingerprint(task, namespace)
+        previous = manifest.get(task.province) or {}
+        complete = all(os.path.exists(os.path.join(task.directory, name)) for name in previous.get("files", []))
+        if not force and previous.get("key") == key and complete:
+            log(f"  {task.province}: tidak berubah, dilewati")
+            continue
+        pending.append((task, key))
+
+    def finish(task, key, written):
+        manifest[task.province] = {"key": key, "files": written}
+        log(f"  {task.province}: {len(written)} file ditulis")
+
+    workers = min(workers, len(pending))
+    if workers > 1:
+        # spawn: sama seperti loader paralel, aman dari lock yang diwarisi fork
+        with concurrent.futures.ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {executor.submit(export_province, task): (task, key) for task, key in pending}
+            for future in concurrent.futures.as_completed(futures):
+                finish(*futures[future], future.result())
+    else:
+        for task, key in pending:
+            finish(task, key, export_province(task))
+
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+    _write(manifest_path, json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8"))
+    return len(pending), len(tasks) - len(pending)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=os.environ.get("DASHBOARD_DATA_FILE", "data_python.xlsx"),
+                        help="workbook sumber (default sama dengan dashboard)")
+    parser.add_argument("--out", default="exports", help="folder hasil")
+    parser.add_argument("--year", type=int, help="tahun data (default tahun terakhir)")
+    parser.add_argument("--formats", nargs="+", default=["png", "csv"], choices=FIGURE_FORMATS + ("csv",))
+    parser.add_argument("--provinces", nargs="+", help="hanya provinsi ini (default semua)")
+    parser.add_argument("--poverty-range", type=float, nargs=2, metavar=("MIN", "MAX"),
+                        help="rentang penduduk miskin (ribu), seperti slider sidebar")
+    parser.add_argument("--ascending", action="store_true", help="urutan bar chart naik")
+    parser.add_argument("--workers", type=int, default=EXPORT_WORKERS)
+    parser.add_argument("--force", action="store_true", help="tulis ulang walaupun input tidak berubah")
+    args = parser.parse_args(argv)
+
+    formats = resolve_formats(args.formats)
+    if formats != list(dict.fromkeys(args.formats)):
+        print("kaleido tidak terpasang: gambar statis ditulis sebagai html", file=sys.stderr)
+
+    start = time.perf_counter()
+    dataset = load_dataset(args.data)
+    year, tasks = build_tasks(dataset, args.out, formats, args.year, args.provinces,
+                              tuple(args.poverty_range) if args.poverty_range else None, args.ascending)
+    print(f"Tahun {year}: {len(tasks)} provinsi, format {', '.join(formats)}")
+
+    namespace = figure_namespace(figures.__file__, __file__)
+    written, skipped = run_export(tasks, os.path.join(args.out, str(year), MANIFEST_NAME), namespace,
+                                  workers=args.workers, force=args.force)
+    print(f"Selesai dalam {time.perf_counter() - start:.1f} s: {written} provinsi ditulis, {skipped} dilewati")
+
+
+if __name__ == "__main__":
+    main()
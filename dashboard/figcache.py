@@ -0,0 +1,147 @@
+"""Cache figure Plotly berbasis LRU dengan batas memori.
+
+Figure disimpan sebagai JSON hasil serialisasi, dengan key berupa hash
+dari semua input yang memengaruhi figure (versi data, baris hasil filter,
+urutan sort, variabel boxplot, provinsi terpilih, dan sebagainya). Saat
+input tidak berubah, figure langsung dikirim dari cache tanpa memanggil
+Plotly Express lagi.
+
+Sebelum disimpan, figure diringkas lewat ``dashboard.payload.slim_figure``;
+ukuran JSON sebelum dan sesudah diringkas dicatat per nama figure.
+
+Dengan ``store`` (``dashboard.resultstore.ResultStore``), cache memori ini
+menjadi tingkat pertama: figure yang tidak ada di memori dicari di store
+disk bersama sebelum dibangun ulang, dan figure baru ikut ditulis ke sana.
+"""
+
+import hashlib
+import inspect
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly
+import plotly.io as pio
+
+from dashboard import instrument
+from dashboard.payload import slim_figure
+from dashboard.resultstore import source_version
+
+
+def make_key(*parts):
+    """Hash stabil dari bagian-bagian key (string, angka, tuple, array NumPy)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            digest.update(b"nd:" + str(part.dtype).encode() + b":")
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def figure_namespace(*paths):
+    """Namespace store disk: hash file pembuat figure ``paths``, kode peringkas, dan versi Plotly."""
+    return source_version(*paths, inspect.getsourcefile(slim_figure), extra=[plotly.__version__])
+
+
+class FigureCache:
+    """Cache LRU untuk figure yang sudah diserialisasi ke JSON.
+
+    Entri terlama dibuang jika jumlah entri melebihi ``max_items`` atau total
+    ukuran JSON melebihi ``max_bytes``. Aman dipakai bersama oleh banyak sesi.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_items=512, slim=True, store=None):
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self.slim = slim
+        self.store = store
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._payload_sizes = {}  # nama figure -> (byte sebelum, byte sesudah diringkas)
+
+    def _store(self, key, payload):
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= len(self._entries.pop(key))
+            self._entries[key] = payload
+            self._bytes += size
+            while len(self._entries) > self.max_items or self._bytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self._bytes -= len(old)
+                self.evictions += 1
+
+    def get_or_build(self, key, build, name="figure", version=""):
+        """Kembalikan figure (dict) untuk ``key``, bangun lewat ``build()`` jika belum ada.
+
+        ``build`` boleh mengembalikan ``None`` (tidak ada data); hasil ini tidak
+        di-cache dan diteruskan apa adanya. ``name`` dipakai untuk laporan
+        ukuran payload (lihat ``payload_sizes``). ``version`` (versi data
+        yang juga ada di ``key``) dicatat di store disk untuk invalidasi.
+        """
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if payload is None and self.store is not None:
+            with instrument.section("figure_store_get"):
+                payload = self.store.get(key)
+            if payload is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._store(key, payload)
+
+        if payload is None:
+            with self._lock:
+                self.misses += 1
+            with instrument.section("figure_build"):
+                fig = build()
+            if fig is None:
+                return None
+            with instrument.section("figure_json"):
+                payload = fig.to_json()
+            if self.slim:
+                with instrument.section("figure_slim"):
+                    raw_bytes = len(payload)
+                    payload = pio.to_json(slim_figure(json.loads(payload)), validate=False)
+                with self._lock:
+                    self._payload_sizes[name] = (raw_bytes, len(payload))
+            self._store(key, payload)
+            if self.store is not None:
+                with instrument.section("figure_store_put"):
+                    self.store.put(key, payload, version=version, name=name)
+        return json.loads(payload)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def payload_sizes(self):
+        """Dict nama figure -> ``(byte JSON asli, byte setelah diringkas)`` dari build terakhir."""
+        with self._lock:
+            return dict(self._payload_sizes)
@@ -0,0 +1,464 @@
+"""Pembuat figure Plotly untuk setiap tab dashboard.
+
+Setiap fungsi hanya membangun figure dari data yang diberikan, tanpa
+memanggil Streamlit, sehingga hasilnya bisa di-cache dan dipakai ulang.
+Fungsi mengembalikan ``None`` jika tidak ada data valid untuk digambar.
+Kolom ``float32`` dilebarkan dulu ke desimal aslinya (``storage.widen``)
+agar nilai di hover dan teks sama dengan sumber data.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from dashboard.storage import widen, widen_values
+
+POVERTY_COLORSCALE = [
+    [0, '#74b9ff'],      # Biru untuk rendah
+    [0.25, '#00b894'],   # Hijau untuk sedang-rendah
+    [0.5, '#fdcb6e'],    # Kuning untuk sedang
+    [0.75, '#e17055'],   # Orange untuk tinggi
+    [1, '#d63031']       # Merah untuk sangat tinggi
+]
+
+
+def map_figure(data, lat_col, lon_col, poverty_col, zoom=4):
+    """Peta sebaran penduduk miskin per provinsi (scatter_mapbox).
+
+    Kolom koordinat dan kemiskinan diasumsikan sudah numerik
+    (lihat ``dashboard.schema.coerce_numeric``).
+    """
+    # Hapus data yang tidak lengkap
+    map_data = widen(data.dropna(subset=[lat_col, lon_col, poverty_col]))
+
+    if map_data.empty:
+        return None
+
+    # === MEMBUAT PETA DENGAN SCATTER_MAPBOX ===
+    fig_map = px.scatter_mapbox(
+        map_data,
+        lat=lat_col,
+        lon=lon_col,
+        size=poverty_col,
+        color=poverty_col,
+        hover_name="PROVINSI",
+        hover_data={
+            poverty_col: ':.1f',
+            'TPT (%)': ':.2f' if 'TPT (%)' in map_data.columns else False,
+            lat_col: False,
+            lon_col: False
+        },
+        color_continuous_scale=POVERTY_COLORSCALE,
+        size_max=60,
+        zoom=zoom,
+        mapbox_style="open-street-map",
+        title=f'Peta Kemiskinan Indonesia - {len(map_data)} Provinsi',
+        labels={
+            poverty_col: 'Penduduk Miskin (Ribu)',
+            lat_col: 'Lintang',
+            lon_col: 'Bujur'
+        },
+        center=dict(lat=-2.5, lon=118)  # Pusat Indonesia
+    )
+
+    # PERBAIKAN UTAMA: Update layout untuk peta yang lebih baik dengan PROPER colorbar
+    fig_map.update_layout(
+        height=600,
+        margin=dict(r=0, t=50, l=0, b=0),
+        # FIXED: Gunakan struktur yang benar untuk colorbar
+        coloraxis_colorbar=dict(
+            title=dict(
+                text="Penduduk Miskin<br>(Ribu)",
+                side="right"  # Gunakan "side" bukan "titleside"
+            ),
+            len=0.7,
+            thickness=15,
+            x=1.02,  # Posisi colorbar
+            xanchor="left"
+        ),
+        title=dict(
+            text=f'Peta Kemiskinan Indonesia - {len(map_data)} Provinsi',
+            x=0.5,
+            font=dict(size=18, color='darkblue'),
+            pad=dict(t=20)
+        )
+    )
+
+    # Update traces untuk hover yang lebih baik
+    fig_map.update_traces(
+        hovertemplate='<b>%{hovertext}</b><br>' +
+                     'Penduduk Miskin: %{marker.size:.1f} ribu<br>' +
+                     ('<br>TPT: %{customdata[0]:.2f}%' if 'TPT (%)' in map_data.columns else '') +
+                     '<extra></extra>',
+        hovertext=map_data['PROVINSI'],
+        customdata=map_data[['TPT (%)']].values if 'TPT (%)' in map_data.columns else None
+    )
+    return fig_map
+
+
+def map_grid_figure(grid, zoom, center=None):
+    """Peta hasil agregasi grid (lihat ``dashboard.mapping.grid_aggregate``).
+
+    Hover hanya memuat jumlah penduduk miskin dan jumlah titik per sel.
+    """
+    if grid.empty:
+        return None
+
+    fig_map = px.scatter_mapbox(
+        grid,
+        lat="lat",
+        lon="lon",
+        size="value",
+        color="value",
+        color_continuous_scale=POVERTY_COLORSCALE,
+        size_max=40,
+        zoom=zoom,
+        mapbox_style="open-street-map",
+        center=center or dict(lat=-2.5, lon=118)
+    )
+    fig_map.update_layout(
+        height=600,
+        margin=dict(r=0, t=50, l=0, b=0),
+        coloraxis_colorbar=dict(
+            title=dict(text="Penduduk Miskin<br>(Ribu)", side="right"),
+            len=0.7,
+            thickness=15,
+            x=1.02,
+            xanchor="left"
+        ),
+        title=dict(
+            text=f'Peta Kemiskinan Indonesia - {int(grid["count"].sum())} titik dalam {len(grid)} sel',
+            x=0.5,
+            font=dict(size=18, color='darkblue'),
+            pad=dict(t=20)
+        )
+    )
+    fig_map.update_traces(
+        customdata=grid[["count"]].to_numpy(),
+        hovertemplate='Penduduk Miskin: %{marker.color:.1f} ribu<br>' +
+                      'Jumlah titik: %{customdata[0]}<extra></extra>'
+    )
+    return fig_map
+
+
+def map_density_figure(data, lat_col, lon_col, poverty_col, zoom, center=None):
+    """Peta kepadatan (density layer WebGL) berbobot jumlah penduduk miskin."""
+    map_data = widen(data.dropna(subset=[lat_col, lon_col, poverty_col]))
+    if map_data.empty:
+        return None
+
+    fig_map = px.density_mapbox(
+        map_data,
+        lat=lat_col,
+        lon=lon_col,
+        z=poverty_col,
+        radius=20,
+        color_continuous_scale=POVERTY_COLORSCALE,
+        zoom=zoom,
+        mapbox_style="open-street-map",
+        center=center or dict(lat=-2.5, lon=118)
+    )
+    fig_map.update_layout(
+        height=600,
+        margin=dict(r=0, t=50, l=0, b=0),
+        title=dict(
+            text=f'Kepadatan Kemiskinan Indonesia - {len(map_data)} titik',
+            x=0.5,
+            font=dict(size=18, color='darkblue'),
+            pad=dict(t=20)
+        )
+    )
+    # Hover dimatikan: density layer tidak perlu mengirim teks per titik
+    fig_map.update_traces(hoverinfo="skip", hovertemplate=None)
+    return fig_map
+
+
+def choropleth_figure(data, name_col, value_col, locations, geojson, zoom, center=None, region="Provinsi"):
+    """Peta choropleth dari geometri lokal (lihat ``dashboard.geometry``).
+
+    ``locations`` berisi id fitur untuk setiap baris ``data`` (baris tanpa
+    geometri sudah dibuang). Latar peta ``white-bg`` tidak memuat tile dari
+    internet, jadi peta tetap tampil offline.
+    """
+    map_data = widen(data[[name_col, value_col]]).assign(_location=locations)
+    map_data = map_data.dropna(subset=[value_col])
+    if map_data.empty:
+        return None
+
+    fig_map = px.choropleth_mapbox(
+        map_data,
+        geojson=geojson,
+        locations="_location",
+        color=value_col,
+        hover_name=name_col,
+        color_continuous_scale=POVERTY_COLORSCALE,
+        zoom=zoom,
+        mapbox_style="white-bg",
+        opacity=0.85,
+        center=center or dict(lat=-2.5, lon=118)
+    )
+    fig_map.update_layout(
+        height=600,
+        margin=dict(r=0, t=50, l=0, b=0),
+        coloraxis_colorbar=dict(
+            title=dict(text="Penduduk Miskin<br>(Ribu)", side="right"),
+            len=0.7,
+            thickness=15,
+            x=1.02,
+            xanchor="left"
+        ),
+        title=dict(
+            text=f'Peta Kemiskinan Indonesia - {len(map_data)} {region}',
+            x=0.5,
+            font=dict(size=18, color='darkblue'),
+            pad=dict(t=20)
+        )
+    )
+    fig_map.update_traces(
+        marker_line_width=0.5,
+        marker_line_color="white",
+        hovertemplate='<b>%{hovertext}</b><br>Penduduk Miskin: %{z:.1f} ribu<extra></extra>'
+    )
+    return fig_map
+
+
+def top_rows(data, column, n, ascending):
+    """``n`` baris teratas/terbawah tanpa mengurutkan seluruh tabel (nlargest/nsmallest)."""
+    rows = data.nsmallest(n, column) if ascending else data.nlargest(n, column)
+    return widen(rows)
+
+
+def tpt_bar(data, ascending):
+    """Top 10 provinsi berdasarkan Tingkat Pengangguran Terbuka."""
+    fig_tpt = px.bar(
+        top_rows(data, "TPT (%)", 10, ascending),
+        x="TPT (%)",
+        y="PROVINSI",
+        orientation='h',
+        title="Top 10 Provinsi - Tingkat Pengangguran Terbuka (%)",
+        color="TPT (%)",
+        color_continuous_scale="Reds"
+    )
+    fig_tpt.update_layout(height=500)
+    return fig_tpt
+
+
+def tpak_line(data_tpak):
+    """Perbandingan TPAK laki-laki vs perempuan per provinsi.
+
+    Kolom LAKI-LAKI dan PEREMPUAN diasumsikan sudah numerik.
+    """
+    # Remove rows with NaN values
+    data_tpak_clean = widen(data_tpak.dropna(subset=['LAKI-LAKI', 'PEREMPUAN']))
+
+    if data_tpak_clean.empty:
+        return None
+
+    # Line chart perbandingan TPAK
+    fig_tpak_line = px.line(
+        data_tpak_clean,
+        x="PROVINSI",
+        y=["LAKI-LAKI", "PEREMPUAN"],
+        title="Perbandingan TPAK Laki-laki vs Perempuan per Provinsi",
+        labels={'value': 'TPAK (%)', 'PROVINSI': 'Provinsi', 'variable': 'Jenis Kelamin'},
+        color_discrete_map={'LAKI-LAKI': '#3498db', 'PEREMPUAN': '#e74c3c'},
+        height=600,
+        markers=True
+    )
+    fig_tpak_line.update_layout(
+        xaxis_tickangle=-45,
+        xaxis_title="Provinsi",
+        yaxis_title="TPAK (%)",
+        legend_title="Jenis Kelamin"
+    )
+    fig_tpak_line.update_traces(mode='lines+markers', line=dict(width=3), marker=dict(size=8))
+    return fig_tpak_line
+
+
+def poverty_bar(data, poverty_col, ascending):
+    """Top 10 provinsi berdasarkan jumlah penduduk miskin."""
+    fig_poverty = px.bar(
+        top_rows(data, poverty_col, 10, ascending),
+        x=poverty_col,
+        y="PROVINSI",
+        orientation='h',
+        title=f"Top 10 Provinsi - {poverty_col}",
+        color=poverty_col,
+        color_continuous_scale="Blues"
+    )
+    fig_poverty.update_layout(height=500)
+    return fig_poverty
+
+
+def kabkota_bar(kabkota_data, kab_col, poverty_col, province):
+    """Tingkat kemiskinan kabupaten/kota dalam satu provinsi."""
+    fig_kabkota = px.bar(
+        widen(kabkota_data.head(15)),
+        x=kab_col,
+        y=poverty_col,
+        color=poverty_col,
+        title=f"Tingkat Kemiskinan di Kabupaten/Kota - {province}",
+        color_continuous_scale="Reds",
+        text=poverty_col
+    )
+    # Pakai nilai y (bukan text) agar format tetap benar setelah figure diserialisasi
+    fig_kabkota.update_traces(texttemplate='%{y:.1f}%', textposition='outside')
+    fig_kabkota.update_layout(xaxis_tickangle=-45, height=400)
+    return fig_kabkota
+
+
+def box_figure(data, column):
+    """Boxplot distribusi satu variabel."""
+    fig_box = px.box(
+        widen(data[[column]]),
+        y=column,
+        title=f"Distribusi Data: {column}",
+        color_discrete_sequence=["#74b9ff"]
+    )
+    fig_box.update_layout(height=400)
+    return fig_box
+
+
+def box_stats_figure(box, column):
+    """Boxplot dari statistik yang sudah dihitung (lihat ``dashboard.stats.GroupStats.box``).
+
+    Hanya kuartil, pagar whisker, mean, dan sd yang dikirim ke browser, jadi
+    ukuran figure tetap sama berapa pun jumlah barisnya.
+    """
+    if box is None:
+        return None
+
+    fig_box = go.Figure(go.Box(
+        x=[column],
+        q1=[box["q1"]],
+        median=[box["median"]],
+        q3=[box["q3"]],
+        lowerfence=[box["lowerfence"]],
+        upperfence=[box["upperfence"]],
+        mean=[box["mean"]],
+        sd=[box["sd"]] if np.isfinite(box["sd"]) else None,
+        boxmean="sd" if np.isfinite(box["sd"]) else True,
+        name=column,
+        marker_color="#74b9ff",
+        boxpoints=False
+    ))
+    fig_box.update_layout(
+        title=f"Distribusi Data: {column} ({box['count']} data, min {box['min']:,.2f}, maks {box['max']:,.2f})",
+        yaxis_title=column,
+        height=400
+    )
+    return fig_box
+
+
+def aps_pie(province_row, aps_cols):
+    """Pie chart Angka Partisipasi Sekolah untuk satu baris provinsi."""
+    # Ambil nilai dari kolom APS yang tersedia
+    aps_categories = []
+    aps_values = []
+
+    for col in aps_cols:
+        if pd.notna(province_row[col]):
+            aps_categories.append(col)
+            aps_values.append(float(widen_values(np.asarray([province_row[col]]))[0]))
+
+    if not aps_categories:
+        return None
+
+    # Buat DataFrame untuk pie chart
+    aps_df = pd.DataFrame({
+        'Kategori': aps_categories,
+        'Nilai': aps_values
+    })
+
+    # Pie chart
+    fig_pie = px.pie(
+        aps_df,
+        values='Nilai',
+        names='Kategori',
+        title=f"Angka Partisipasi Sekolah - {province_row['PROVINSI']}",
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig_pie.update_traces(textposition='inside', textinfo='percent+label')
+    fig_pie.update_layout(height=500)
+    return fig_pie
+
+
+def trend_line(trend, key_col, year_col, column, window):
+    """Tren satu indikator per tahun, satu garis per entitas (lihat ``YearPanel.trend``)."""
+    trend = trend.dropna(subset=[column])
+    if trend.empty:
+        return None
+
+    fig_trend = px.line(
+        trend,
+        x=year_col,
+        y=column,
+        color=key_col,
+        markers=True,
+        hover_data={"delta": ':.2f', "rolling": ':.2f'},
+        labels={
+            year_col: 'Tahun',
+            key_col: 'Provinsi',
+            "delta": 'Perubahan YoY',
+            "rolling": f'Rata-rata {window} Tahun'
+        },
+        title=f"Tren {column} per Tahun",
+        height=550
+    )
+    fig_trend.update_layout(xaxis=dict(dtick=1))
+    return fig_trend
+
+
+def yoy_bar(change, key_col, column, year):
+    """Perubahan satu indikator terhadap tahun sebelumnya (lihat ``YearPanel.year_change``)."""
+    if change.empty:
+        return None
+
+    fig_yoy = px.bar(
+        change.sort_values("delta", ascending=False),
+        x=key_col,
+        y="delta",
+        color="delta",
+        color_continuous_scale="RdYlGn_r",
+        color_continuous_midpoint=0,
+        labels={key_col: 'Provinsi', "delta": 'Perubahan'},
+        title=f"Perubahan {column} Tahun {year} dibanding Tahun Sebelumnya"
+    )
+    fig_yoy.update_layout(xaxis_tickangle=-45, height=450)
+    return fig_yoy
+
+
+def correlation_heatmap(correlation):
+    """Heatmap korelasi antar indikator (lihat ``IndicatorAnalytics.correlation``)."""
+    if correlation.empty or correlation.isna().all().all():
+        return None
+
+    fig_corr = px.imshow(
+        correlation.round(2),
+        text_auto=".2f",
+        color_continuous_scale="RdBu_r",
+        zmin=-1,
+        zmax=1,
+        aspect="auto",
+        title="Korelasi Antar Indikator"
+    )
+    fig_corr.update_layout(height=600, coloraxis_colorbar=dict(title="r"))
+    return fig_corr
+
+
+def scatter_matrix(data, columns, name_col):
+    """Scatter matrix beberapa indikator, satu titik per baris ``data``."""
+    data = data.dropna(subset=columns, how="all")
+    if data.empty or len(columns) < 2:
+        return None
+
+    fig_matrix = px.scatter_matrix(
+        data,
+        dimensions=columns,
+        hover_name=name_col,
+        title="Scatter Matrix Indikator"
+    )
+    fig_matrix.update_traces(diagonal_visible=False, marker=dict(size=5, opacity=0.7))
+    fig_matrix.update_layout(height=200 * len(columns) + 150)
+    return fig_matrix
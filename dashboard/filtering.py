@@ -0,0 +1,152 @@
+"""Index untuk filter sidebar (provinsi + rentang penduduk miskin).
+
+Index dibangun sekali saat data dimuat: kode kategori untuk kolom provinsi
+dan urutan hasil ``argsort`` untuk kolom nilai. Query rentang cukup dua
+kali ``searchsorted`` lalu disaring dengan bitset provinsi terpilih,
+tanpa membuat mask boolean sepanjang tabel pada setiap interaksi.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class FilterIndex:
+    """Index filter provinsi dan rentang nilai untuk satu tabel."""
+
+    def __init__(self, data, province_col="PROVINSI", value_col="PENDUDUK_MISKIN"):
+        codes, uniques = pd.factorize(data[province_col])
+        self.n_rows = len(data)
+        self._codes = codes
+        self._code_of = {name: i for i, name in enumerate(uniques)}
+
+        if value_col in data.columns:
+            values = data[value_col].to_numpy(dtype=np.float64)
+            # NaN otomatis berada di ujung sehingga tidak pernah masuk rentang
+            self._order = np.argsort(values, kind="stable")
+            self._sorted = values[self._order]
+        else:
+            self._order = None
+            self._sorted = None
+
+    def _province_bitset(self, provinces):
+        # Slot terakhir untuk kode -1 (nama provinsi kosong), selalu False
+        selected = np.zeros(len(self._code_of) + 1, dtype=bool)
+        for name in provinces:
+            code = self._code_of.get(name)
+            if code is not None:
+                selected[code] = True
+        return selected
+
+    def query(self, provinces, value_range=None):
+        """Posisi baris yang lolos filter, terurut sesuai urutan tabel asli.
+
+        ``value_range`` berupa ``(min, max)`` inklusif; ``None`` berarti hanya
+        filter provinsi.
+        """
+        selected = self._province_bitset(provinces)
+        if value_range is None or self._order is None:
+            return np.flatnonzero(selected[self._codes])
+
+        lo = np.searchsorted(self._sorted, value_range[0], side="left")
+        hi = np.searchsorted(self._sorted, value_range[1], side="right")
+        candidates = self._order[lo:hi]
+        rows = candidates[selected[self._codes[candidates]]]
+        rows.sort()
+        return rows
+
+    def view(self, data, rows):
+        """Bungkus hasil ``query`` sebagai ``FilteredView`` tanpa menyalin data."""
+        return FilteredView(data, None if len(rows) == self.n_rows else rows)
+
+    def select(self, data, provinces, value_range=None):
+        """Filter sidebar: provinsi terpilih dalam rentang ``value_range`` sebagai ``FilteredView``.
+
+        Tanpa provinsi terpilih (multiselect dikosongkan) semua baris lolos
+        dan rentang nilai tidak diterapkan.
+        """
+        if not provinces:
+            return FilteredView(data)
+        return self.view(data, self.query(provinces, value_range))
+
+
+class FilteredView:
+    """Hasil filter tanpa salinan: tabel sumber + posisi baris yang lolos.
+
+    DataFrame hasil filter baru dibuat (sekali) saat ``frame()`` dipanggil,
+    yaitu hanya ketika sebuah figure harus dibangun ulang. Metrik dan
+    pilihan widget cukup membaca kolom yang dibutuhkan lewat ``column()``.
+    """
+
+    def __init__(self, data, rows=None):
+        self.data = data
+        self.rows = rows  # None berarti semua baris
+        self.key = "all" if rows is None else rows
+        self._frame = None
+
+    @property
+    def columns(self):
+        return self.data.columns
+
+    def __len__(self):
+        return len(self.data) if self.rows is None else len(self.rows)
+
+    def column(self, name):
+        """Satu kolom (Series) untuk baris yang lolos filter."""
+        series = self.data[name]
+        return series if self.rows is None else series.iloc[self.rows]
+
+    def first_row(self, col, value):
+        """Baris pertama dengan ``col == value`` (Series), atau ``None``."""
+        matches = np.flatnonzero(self.column(col).to_numpy() == value)
+        if not len(matches):
+            return None
+        position = matches[0] if self.rows is None else self.rows[matches[0]]
+        return self.data.iloc[position]
+
+    def frame(self):
+        """DataFrame hasil filter (dibuat sekali lalu disimpan)."""
+        if self.rows is None:
+            return self.data
+        if self._frame is None:
+            self._frame = self.data.iloc[self.rows]
+        return self._frame
+
+
+class Partitions:
+    """Tabel yang dipartisi per nilai kunci (mis. provinsi) menjadi slice kontigu.
+
+    Jika baris dengan kunci yang sama sudah berurutan (seperti ekspor BPS),
+    tabel asli dipakai apa adanya sehingga setiap partisi hanyalah slice dari
+    kolom yang di-memory-map. Jika tidak, tabel diurutkan sekali secara stabil.
+    ``normalize`` (mis. ``geometry.normalize_name``) dipakai pada nilai kunci
+    sebelum dipartisi, sehingga ``get`` menerima kunci yang sudah dinormalisasi.
+    """
+
+    def __init__(self, data, key_col, normalize=None):
+        keys = data[key_col]
+        if normalize is not None:
+            keys = keys.map(normalize, na_action="ignore")
+        codes, uniques = pd.factorize(keys)
+        # Urutan kunci sama dengan Series.unique() (urutan kemunculan pertama)
+        self.keys = list(uniques)
+
+        valid = codes >= 0
+        grouped = valid.all() and np.count_nonzero(np.diff(codes)) == max(len(uniques) - 1, 0)
+        if not grouped:
+            # Baris tanpa kunci (NaN) ditaruh di akhir lalu dibuang
+            order = np.argsort(np.where(valid, codes, len(uniques)), kind="stable")
+            order = order[: np.count_nonzero(valid)]
+            data = data.iloc[order]
+            codes = codes[order]
+
+        starts = np.searchsorted(codes, np.arange(len(uniques)), side="left")
+        stops = np.searchsorted(codes, np.arange(len(uniques)), side="right")
+        self.data = data
+        self._slices = {key: slice(int(a), int(b)) for key, a, b in zip(self.keys, starts, stops)}
+
+    def __contains__(self, key):
+        return key in self._slices
+
+    def get(self, key):
+        """Baris untuk satu kunci (tabel kosong jika kunci tidak dikenal)."""
+        return self.data.iloc[self._slices.get(key, slice(0, 0))]
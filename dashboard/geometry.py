@@ -0,0 +1,339 @@
+"""Geometri batas wilayah (GeoJSON lokal) untuk peta choropleth offline.
+
+Batas provinsi dan kabupaten/kota dibaca dari file GeoJSON di folder
+``DASHBOARD_GEOJSON_DIR`` (default ``geo/``): ``provinsi.geojson`` dan
+``kabkota.geojson``. File tidak ikut repo; tanpa file tersebut mode
+choropleth tidak ditawarkan.
+
+Setiap ring poligon disederhanakan dengan Douglas-Peucker satu kali untuk
+semua level toleransi (``TOLERANCES``): pohon pemisahan Douglas-Peucker
+tidak bergantung pada toleransi, jadi cukup dicatat "kepentingan" setiap
+titik (jarak pemisahnya, dibatasi oleh kepentingan titik induknya) lalu
+setiap level mengambil titik yang kepentingannya melebihi toleransi level
+itu. Hasil semua level disimpan di folder cache (lihat
+``dashboard.cache.default_cache_dir``) sehingga start berikutnya tidak
+perlu menyederhanakan ulang. Level dipilih dari zoom peta agar galat
+penyederhanaan tidak lebih dari sekitar ``PIXEL_TOLERANCE`` piksel,
+lalu dikasarkan lagi jika total titik fitur yang tampil melebihi
+``MAX_VERTICES`` agar payload figure tetap kecil.
+
+Fitur di-index dengan nama wilayah yang dinormalisasi (``normalize_name``)
+sehingga bisa digabung dengan kolom ``PROVINSI`` atau nama kab/kota di
+data; id fitur ini juga yang dipakai sebagai ``locations`` di figure.
+"""
+
+import json
+import math
+import os
+import re
+
+import numpy as np
+
+from dashboard.cache import default_cache_dir
+
+GEOJSON_DIR = os.environ.get("DASHBOARD_GEOJSON_DIR", "geo")
+GEOJSON_FILES = {"provinsi": "provinsi.geojson", "kabkota": "kabkota.geojson"}
+GEOMETRY_FORMAT_VERSION = 2
+GEOMETRY_CACHE_NAME = "geometry.json"
+
+# Toleransi Douglas-Peucker (derajat) per level, dari kasar ke halus
+TOLERANCES = (0.1, 0.05, 0.02, 0.01, 0.005, 0.002)
+# Galat penyederhanaan maksimum yang masih boleh terlihat di layar
+PIXEL_TOLERANCE = 1.0
+# Batas jumlah titik per figure; di atasnya dipakai level yang lebih kasar
+MAX_VERTICES = int(os.environ.get("DASHBOARD_MAP_MAX_VERTICES", "20000"))
+
+# Nama properti GeoJSON yang dicari (tanpa membedakan huruf besar/kecil)
+NAME_PROPERTIES = {
+    "provinsi": ["PROVINSI", "PROPINSI", "WADMPR", "NAME_1", "NAMOBJ", "NAME"],
+    "kabkota": ["KABKOT", "KAB_KOTA", "KABUPATEN", "WADMKK", "NAME_2", "NAMOBJ", "NAME"],
+}
+PARENT_PROPERTIES = {"kabkota": ["PROVINSI", "PROPINSI", "WADMPR", "NAME_1"]}
+
+# Bentuk panjang -> singkatan yang dipakai data BPS
+_ABBREVIATIONS = [
+    (re.compile(r"\bDAERAH ISTIMEWA\b"), "DI"),
+    (re.compile(r"\bD I\b"), "DI"),
+    (re.compile(r"\bDAERAH KHUSUS IBUKOTA\b"), "DKI"),
+    (re.compile(r"\bKEPULAUAN\b"), "KEP"),
+    (re.compile(r"\bKABUPATEN\b"), "KAB"),
+]
+_PREFIXES = re.compile(r"^(?:PROVINSI|PROPINSI|KAB) ")
+
+
+def normalize_name(name):
+    """Nama wilayah dalam bentuk baku untuk penggabungan data dan geometri.
+
+    ``"Kep. Bangka Belitung"``, ``"KEPULAUAN BANGKA BELITUNG"`` dan
+    ``"Provinsi Kepulauan Bangka Belitung"`` menjadi ``"KEP BANGKA BELITUNG"``;
+    awalan ``KABUPATEN``/``KAB`` dibuang, awalan ``KOTA`` dipertahankan.
+    """
+    text = " ".join(re.split(r"[^A-Z0-9]+", str(name).upper())).strip()
+    for pattern, short in _ABBREVIATIONS:
+        text = pattern.sub(short, text)
+    return _PREFIXES.sub("", text)
+
+
+def geojson_path(level, directory=None):
+    return os.path.join(directory or GEOJSON_DIR, GEOJSON_FILES[level])
+
+
+def zoom_tolerance(zoom):
+    """Toleransi (derajat) yang setara ``PIXEL_TOLERANCE`` piksel pada zoom tertentu."""
+    return PIXEL_TOLERANCE * 360.0 / (256 * 2 ** zoom)
+
+
+def level_for_zoom(zoom, tolerances=TOLERANCES):
+    """Index level paling kasar yang toleransinya tidak melebihi ukuran piksel zoom."""
+    limit = zoom_tolerance(zoom)
+    for level, tolerance in enumerate(tolerances):
+        if tolerance <= limit:
+            return level
+    return len(tolerances) - 1
+
+
+def _decimals(tolerance):
+    # Pembulatan koordinat jauh di bawah toleransi (galat <= tolerance / 20)
+    return max(0, math.ceil(-math.log10(tolerance))) + 1
+
+
+def point_importance(points, min_tolerance):
+    """Kepentingan setiap titik menurut Douglas-Peucker (ujung garis = tak hingga).
+
+    Titik ``i`` dipertahankan pada toleransi ``t`` jika
+    ``importance[i] > t``. Pemisahan berhenti di ``min_tolerance`` sehingga
+    titik di bawahnya bernilai 0.
+    """
+    n = len(points)
+    importance = np.zeros(n)
+    importance[0] = importance[-1] = np.inf
+    stack = [(0, n - 1, np.inf)]
+    while stack:
+        start, end, limit = stack.pop()
+        if end - start < 2:
+            continue
+        a, b = points[start], points[end]
+        inner = points[start + 1:end]
+        dx, dy = b - a
+        length = math.hypot(dx, dy)
+        if length == 0:
+            # Ring tertutup: ujung sama, pakai jarak ke titik ujung
+            dist = np.hypot(inner[:, 0] - a[0], inner[:, 1] - a[1])
+        else:
+            dist = np.abs(dx * (inner[:, 1] - a[1]) - dy * (inner[:, 0] - a[0])) / length
+        i = int(np.argmax(dist))
+        if dist[i] <= min_tolerance:
+            continue
+        split = start + 1 + i
+        # Titik anak tidak mungkin bertahan lebih lama dari titik induknya
+        importance[split] = min(dist[i], limit)
+        stack.append((start, split, importance[split]))
+        stack.append((split, end, importance[split]))
+    return importance
+
+
+def _polygons(geometry):
+    if geometry is None:
+        return []
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    raise ValueError(f"Tipe geometri tidak didukung: {geometry['type']}")
+
+
+def simplify_levels(geometry, tolerances=TOLERANCES):
+    """Geometri (dict GeoJSON) untuk setiap toleransi, sekali jalan per ring.
+
+    Ring yang tersisa kurang dari 4 titik dibuang (pulau kecil dan lubang);
+    jika semua poligon habis, poligon dengan ring luar terpanjang tetap
+    dipakai dalam bentuk aslinya agar wilayah tidak hilang dari peta.
+    """
+    polygons = [[np.asarray(ring, dtype=np.float64)[:, :2] for ring in polygon]
+                for polygon in _polygons(geometry) if polygon]
+    if not polygons:
+        return [None] * len(tolerances)
+    finest = min(tolerances)
+    importance = [[point_importance(ring, finest) for ring in polygon] for polygon in polygons]
+
+    levels = []
+    for tolerance in tolerances:
+        decimals = _decimals(tolerance)
+        kept_polygons = []
+        for rings, scores in zip(polygons, importance):
+            kept_rings = []
+            for ring, score in zip(rings, scores):
+                kept = ring[score > tolerance]
+                if len(kept) < 4:
+                    if not kept_rings:
+                        break  # ring luar hilang: seluruh poligon dibuang
+                    continue
+                kept_rings.append(np.round(kept, decimals).tolist())
+            if kept_rings:
+                kept_polygons.append(kept_rings)
+        if not kept_polygons:
+            largest = max(polygons, key=lambda rings: len(rings[0]))
+            kept_polygons = [[np.round(largest[0], decimals).tolist()]]
+        if len(kept_polygons) == 1:
+            levels.append({"type": "Polygon", "coordinates": kept_polygons[0]})
+        else:
+            levels.append({"type": "MultiPolygon", "coordinates": kept_polygons})
+    return levels
+
+
+def _vertex_count(geometry):
+    return sum(len(ring) for polygon in _polygons(geometry) for ring in polygon)
+
+
+def _bounds(geometry):
+    points = np.array([point for polygon in _polygons(geometry) for ring in polygon for point in ring])
+    return points.min(axis=0), points.max(axis=0)
+
+
+def _property(properties, keys):
+    upper = {str(k).upper(): v for k, v in (properties or {}).items()}
+    for key in keys:
+        if upper.get(key) not in (None, ""):
+            return upper[key]
+    return None
+
+
+class RegionGeometry:
+    """Batas wilayah satu tingkat dengan geometri per level toleransi.
+
+    ``ids`` berisi nama baku tiap fitur; ``match`` memetakan nama di data ke
+    id tersebut, dan ``feature_collection`` menghasilkan FeatureCollection
+    siap pakai untuk zoom tertentu.
+    """
+
+    def __init__(self, ids, parents, levels, bounds, tolerances=TOLERANCES, version=None):
+        self.ids = ids
+        self.parents = parents
+        self.tolerances = tuple(tolerances)
+        # Penanda file sumber (mtime/ukuran) untuk key cache figure
+        self.version = version
+        self._levels = levels  # level -> [geometri per fitur]
+        self._bounds = bounds  # [lon_min, lat_min, lon_max, lat_max] per fitur
+        self._index = {}
+        names = {}
+        for i, (feature_id, parent) in enumerate(zip(ids, parents)):
+            name = feature_id.split("/")[-1]
+            names.setdefault(name, []).append(i)
+            if parent is not None:
+                self._index[f"{parent}/{name}"] = i
+        # Nama tanpa induk hanya dipakai jika tidak ambigu (mis. kab/kota bernama sama)
+        self._index.update({name: found[0] for name, found in names.items() if len(found) == 1})
+        self._vertices = np.array([[_vertex_count(geometry) for geometry in level] for level in levels])
+        self._collections = {}
+
+    @classmethod
+    def from_features(cls, features, table, tolerances=TOLERANCES):
+        ids, parents, levels, bounds = [], [], [[] for _ in tolerances], []
+        for feature in features:
+            name = _property(feature.get("properties"), NAME_PROPERTIES[table])
+            if name is None or not feature.get("geometry"):
+                continue
+            simplified = simplify_levels(feature["geometry"], tolerances)
+            if simplified[-1] is None:
+                continue
+            parent = _property(feature.get("properties"), PARENT_PROPERTIES.get(table, []))
+            parent = normalize_name(parent) if parent is not None else None
+            name = normalize_name(name)
+            ids.append(f"{parent}/{name}" if parent is not None else name)
+            parents.append(parent)
+            for level, geometry in enumerate(simplified):
+                levels[level].append(geometry)
+            low, high = _bounds(simplified[-1])
+            bounds.append([*low, *high])
+        return cls(ids, parents, levels, bounds, tolerances)
+
+    @classmethod
+    def from_file(cls, path, table, tolerances=TOLERANCES, cache_path=None):
+        """Baca GeoJSON, memakai hasil penyederhanaan di cache jika file belum berubah."""
+        stat = os.stat(path)
+        cache_path = cache_path or os.path.join(default_cache_dir(path), GEOMETRY_CACHE_NAME)
+        stamp = {"format": GEOMETRY_FORMAT_VERSION, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                 "table": table, "tolerances": list(tolerances)}
+        version = f"{stat.st_mtime_ns}:{stat.st_size}"
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("stamp") == stamp:
+                return cls(cached["ids"], cached["parents"], cached["levels"], cached["bounds"], tolerances,
+                           version)
+        except (OSError, ValueError, KeyError):
+            pass
+
+        with open(path, encoding="utf-8") as f:
+            collection = json.load(f)
+        geometry = cls.from_features(collection.get("features", []), table, tolerances)
+        geometry.version = version
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"stamp": stamp, "ids": geometry.ids, "parents": geometry.parents,
+                           "levels": geometry._levels, "bounds": geometry._bounds},
+                          f, separators=(",", ":"))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+        return geometry
+
+    def __len__(self):
+        return len(self.ids)
+
+    def match(self, names, parents=None):
+        """Id fitur untuk setiap nama di data (``None`` jika tidak ada geometrinya)."""
+        matched = []
+        for i, name in enumerate(names):
+            name = normalize_name(name)
+            found = None
+            if parents is not None:
+                found = self._index.get(f"{normalize_name(parents[i])}/{name}")
+            if found is None:
+                found = self._index.get(name)
+            matched.append(self.ids[found] if found is not None else None)
+        return matched
+
+    def _rows(self, ids):
+        if ids is None:
+            return np.arange(len(self.ids))
+        wanted = set(ids)
+        return np.array([i for i, feature_id in enumerate(self.ids) if feature_id in wanted], dtype=np.int64)
+
+    def center(self, ids=None):
+        """Titik tengah kotak batas fitur ``ids`` (semua fitur jika ``None``)."""
+        rows = self._rows(ids)
+        if not len(rows):
+            return None
+        bounds = np.asarray(self._bounds)[rows]
+        return dict(lat=float(bounds[:, 1].min() + bounds[:, 3].max()) / 2,
+                    lon=float(bounds[:, 0].min() + bounds[:, 2].max()) / 2)
+
+    def vertex_count(self, level, ids=None):
+        """Total titik fitur ``ids`` pada satu level."""
+        return int(self._vertices[level, self._rows(ids)].sum())
+
+    def level(self, zoom, ids=None, max_vertices=MAX_VERTICES):
+        """Level untuk zoom, dikasarkan sampai total titik fitur ``ids`` <= ``max_vertices``."""
+        level = level_for_zoom(zoom, self.tolerances)
+        while level > 0 and self.vertex_count(level, ids) > max_vertices:
+            level -= 1
+        return level
+
+    def feature_collection(self, zoom, ids=None, max_vertices=MAX_VERTICES):
+        """FeatureCollection level yang sesuai zoom, hanya berisi fitur ``ids``.
+
+        Properti fitur tidak ikut dikirim; hover memakai data dashboard.
+        """
+        level = self.level(zoom, ids, max_vertices)
+        if level not in self._collections:
+            self._collections[level] = [
+                {"type": "Feature", "id": feature_id, "geometry": geometry}
+                for feature_id, geometry in zip(self.ids, self._levels[level])
+            ]
+        features = self._collections[level]
+        if ids is not None:
+            features = [features[i] for i in self._rows(ids)]
+        return {"type": "FeatureCollection", "features": features}
@@ -0,0 +1,197 @@
+"""Instrumentasi ringan untuk jalur panas dashboard.
+
+Setiap bagian bernama (``load``, ``filter``, ``metrics``, ``tab1`` ...)
+dibungkus ``section(name)``. Jika profiling aktif untuk sesi ini, durasi
+bagian dicatat ke ``Profiler`` bersama (jumlah panggilan, total, maksimum,
+nilai terakhir); jika tidak, ``section`` mengembalikan context manager
+kosong yang sama setiap kali sehingga overhead-nya hanya satu lookup.
+
+Profiling aktif untuk semua sesi dengan ``DASHBOARD_PROFILE=1``, atau per
+sesi lewat query param ``?profile=<token>`` (token dari
+``DASHBOARD_PROFILE_TOKEN``; tanpa token, query param diabaikan). Panel
+admin hanya ditampilkan untuk sesi dengan query param tersebut. Hasil bisa diekspor sebagai teks
+Prometheus atau JSON lines; dengan ``DASHBOARD_PROFILE_FILE`` setiap rerun
+penuh juga ditambahkan sebagai satu baris JSON ke file itu.
+
+Status profiling disimpan per thread: Streamlit menjalankan script (dan
+fragment) setiap sesi di thread-nya sendiri.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+PROFILE_ENV = "DASHBOARD_PROFILE"
+PROFILE_TOKEN_ENV = "DASHBOARD_PROFILE_TOKEN"
+PROFILE_FILE_ENV = "DASHBOARD_PROFILE_FILE"
+QUERY_PARAM = "profile"
+
+
+class _State(threading.local):
+    # Default di level kelas: lookup tanpa AttributeError saat profiling mati
+    profiler = None
+    run = None
+
+
+_local = _State()
+_NULL = contextlib.nullcontext()
+
+
+def env_enabled(environ=os.environ):
+    """True jika profiling diaktifkan untuk semua sesi lewat variabel lingkungan."""
+    return environ.get(PROFILE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def query_enabled(query_params, environ=os.environ):
+    """True jika query param sesi ini cocok dengan token profiling (akses admin).
+
+    Tanpa ``DASHBOARD_PROFILE_TOKEN`` selalu False: panel admin (unduhan
+    metrik, reset statistik) tidak boleh terbuka lewat token yang bisa ditebak.
+    """
+    token = environ.get(PROFILE_TOKEN_ENV)
+    return bool(token) and query_params.get(QUERY_PARAM) == token
+
+
+class Profiler:
+    """Kumpulan timer dan counter bersama untuk satu proses server."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sections = {}  # nama -> [jumlah, total detik, maksimum, terakhir]
+        self._counters = {}
+
+    def record(self, name, seconds):
+        with self._lock:
+            stats = self._sections.get(name)
+            if stats is None:
+                self._sections[name] = [1, seconds, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+                stats[3] = seconds
+
+    def count(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def reset(self):
+        with self._lock:
+            self._sections.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        """Tuple ``(bagian, counter)``; bagian berupa dict nama -> statistik."""
+        with self._lock:
+            sections = {
+                name: {"calls": calls, "total_seconds": total, "max_seconds": peak,
+                       "last_seconds": last, "mean_seconds": total / calls}
+                for name, (calls, total, peak, last) in self._sections.items()
+            }
+            return sections, dict(self._counters)
+
+    def prometheus(self):
+        """Ekspor dalam format teks Prometheus (exposition format 0.0.4)."""
+        sections, counters = self.snapshot()
+        lines = [
+            "# HELP dashboard_section_seconds_total Total waktu per bagian dashboard.",
+            "# TYPE dashboard_section_seconds_total counter",
+        ]
+        lines += [f'dashboard_section_seconds_total{{section="{name}"}} {s["total_seconds"]:.6f}'
+                  for name, s in sections.items()]
+        lines += [
+            "# HELP dashboard_section_calls_total Jumlah eksekusi per bagian dashboard.",
+            "# TYPE dashboard_section_calls_total counter",
+        ]
+        lines += [f'dashboard_section_calls_total{{section="{name}"}} {s["calls"]}'
+                  for name, s in sections.items()]
+        lines += [
+            "# HELP dashboard_section_max_seconds Waktu terlama per bagian dashboard.",
+            "# TYPE dashboard_section_max_seconds gauge",
+        ]
+        lines += [f'dashboard_section_max_seconds{{section="{name}"}} {s["max_seconds"]:.6f}'
+                  for name, s in sections.items()]
+        lines += [
+            "# HELP dashboard_events_total Counter kejadian dashboard.",
+            "# TYPE dashboard_events_total counter",
+        ]
+        lines += [f'dashboard_events_total{{event="{name}"}} {value}' for name, value in counters.items()]
+        return "\n".join(lines) + "\n"
+
+    def json_lines(self):
+        """Ekspor sebagai JSON lines: satu baris per bagian dan per counter."""
+        sections, counters = self.snapshot()
+        rows = [{"section": name, **stats} for name, stats in sections.items()]
+        rows += [{"counter": name, "value": value} for name, value in counters.items()]
+        return "".join(json.dumps(row) + "\n" for row in rows)
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        self.profiler.record(self.name, seconds)
+        run = _local.run
+        if run is not None:
+            run[self.name] = run.get(self.name, 0.0) + seconds
+        return False
+
+
+def start_run(profiler):
+    """Mulai satu rerun script; ``None`` mematikan profiling untuk thread ini."""
+    _local.profiler = profiler
+    _local.run = {} if profiler is not None else None
+    if profiler is not None:
+        profiler.count("rerun")
+
+
+def finish_run(environ=os.environ):
+    """Selesaikan rerun: tulis durasi per bagian ke ``DASHBOARD_PROFILE_FILE`` jika diset."""
+    run = _local.run
+    _local.run = None
+    path = environ.get(PROFILE_FILE_ENV)
+    if run and path:
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"time": time.time(), "sections": run}) + "\n")
+        except OSError:
+            pass
+    return run
+
+
+def section(name):
+    """Context manager timer untuk satu bagian (no-op jika profiling mati)."""
+    profiler = _local.profiler
+    if profiler is None:
+        return _NULL
+    return _Section(profiler, name)
+
+
+def count(name, n=1):
+    """Tambah counter kejadian (no-op jika profiling mati)."""
+    profiler = _local.profiler
+    if profiler is not None:
+        profiler.count(name, n)
+
+
+def timed(name):
+    """Dekorator: seluruh pemanggilan fungsi dicatat sebagai bagian ``name``."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with section(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,62 @@
+"""Agregasi titik peta di sisi server untuk data berukuran besar.
+
+Titik dikelompokkan ke dalam sel grid lintang/bujur yang ukurannya
+mengikuti tingkat zoom (setiap tile 256 px dibagi ``CELLS_PER_TILE`` sel),
+sehingga jumlah titik yang dikirim ke browser dibatasi oleh jumlah sel
+yang terlihat, bukan oleh jumlah baris data.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# Di atas jumlah titik ini mode "Otomatis" beralih ke agregasi grid
+MAP_POINT_THRESHOLD = int(os.environ.get("DASHBOARD_MAP_MAX_POINTS", "2000"))
+CELLS_PER_TILE = 8
+
+MAP_MODES = ["Otomatis", "Titik", "Grid", "Densitas"]
+# Mode choropleth hanya ditawarkan jika file GeoJSON tersedia (lihat dashboard.geometry)
+CHOROPLETH_MODE = "Batas Wilayah"
+
+
+def cell_size(zoom):
+    """Lebar sel grid (derajat) untuk tingkat zoom tertentu."""
+    return 360.0 / (2 ** zoom) / CELLS_PER_TILE
+
+
+def resolve_mode(mode, n_points, threshold=MAP_POINT_THRESHOLD):
+    """Terjemahkan mode "Otomatis" menjadi "Titik" atau "Grid"."""
+    if mode == "Otomatis":
+        return "Titik" if n_points <= threshold else "Grid"
+    return mode
+
+
+def grid_aggregate(data, lat_col, lon_col, value_col, zoom):
+    """Jumlahkan ``value_col`` per sel grid.
+
+    Hasilnya DataFrame dengan kolom ``lat``/``lon`` (rata-rata posisi titik
+    dalam sel), ``value`` (jumlah nilai) dan ``count`` (jumlah titik).
+    Baris dengan koordinat atau nilai kosong diabaikan.
+    """
+    lat = data[lat_col].to_numpy(dtype=np.float64)
+    lon = data[lon_col].to_numpy(dtype=np.float64)
+    value = data[value_col].to_numpy(dtype=np.float64)
+    valid = ~(np.isnan(lat) | np.isnan(lon) | np.isnan(value))
+    lat, lon, value = lat[valid], lon[valid], value[valid]
+    if not len(lat):
+        return pd.DataFrame({"lat": [], "lon": [], "value": [], "count": []})
+
+    size = cell_size(zoom)
+    iy = np.floor(lat / size).astype(np.int64)
+    ix = np.floor(lon / size).astype(np.int64)
+    cells, inverse = np.unique(np.stack([iy, ix], axis=1), axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+
+    count = np.bincount(inverse, minlength=len(cells))
+    return pd.DataFrame({
+        "lat": np.bincount(inverse, weights=lat, minlength=len(cells)) / count,
+        "lon": np.bincount(inverse, weights=lon, minlength=len(cells)) / count,
+        "value": np.bincount(inverse, weights=value, minlength=len(cells)),
+        "count": count,
+    })
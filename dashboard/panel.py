@@ -0,0 +1,137 @@
+"""Model data panel (entitas x tahun) untuk tren antar tahun.
+
+Setiap tabel dipecah menjadi partisi per tahun berdasarkan kolom tahun
+(mis. ``TAHUN``). Jika baris sudah berurutan per tahun, partisi hanyalah
+slice dari tabel asli (lihat ``dashboard.filtering.Partitions``), jadi
+berpindah tahun cukup mengambil slice tanpa membaca ulang workbook. Rilis
+tahun baru ditambahkan sebagai partisi baru lewat ``append``.
+
+Untuk setiap kolom nilai disusun matriks ``entitas x tahun`` sekali saat
+panel dibuat, lalu selisih tahunan (YoY) dan rata-rata bergulir dihitung
+dengan operasi NumPy pada seluruh matriks. Tabel tanpa kolom tahun
+dianggap satu rilis (``DEFAULT_YEAR``) yang berlaku untuk semua tahun.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard.filtering import Partitions
+from dashboard.storage import widen_values
+
+YEAR_COLUMN = "TAHUN"
+DEFAULT_YEAR = 2024
+ROLLING_WINDOW = 3
+
+
+def _rolling_mean(matrix, window):
+    """Rata-rata bergulir per baris yang mengabaikan NaN (butuh minimal satu nilai)."""
+    valid = ~np.isnan(matrix)
+    sums = np.cumsum(np.where(valid, matrix, 0.0), axis=1)
+    counts = np.cumsum(valid, axis=1)
+    # Kurangi jumlah kumulatif window sebelumnya
+    sums[:, window:] = sums[:, window:] - sums[:, :-window]
+    counts[:, window:] = counts[:, window:] - counts[:, :-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+class YearPanel:
+    """Tabel per tahun untuk satu sheet, plus matriks nilai entitas x tahun."""
+
+    def __init__(self, partitions, key_col, value_cols, year_col=None, window=ROLLING_WINDOW):
+        self.partitions = dict(sorted(partitions.items()))
+        self.key_col = key_col
+        self.year_col = year_col
+        self.window = window
+        self.years = list(self.partitions)
+
+        keys = [frame[key_col] for frame in self.partitions.values() if key_col in frame.columns]
+        uniques = pd.unique(pd.concat(keys, ignore_index=True).dropna()) if keys else []
+        self.entities = pd.Index(np.asarray(uniques, dtype=object))
+
+        self.value_cols = [col for col in value_cols
+                           if any(col in frame.columns for frame in self.partitions.values())]
+        self._matrices = {col: self._matrix(col) for col in self.value_cols}
+        self._deltas = {}
+        self._rolling = {}
+        for col, matrix in self._matrices.items():
+            delta = np.full_like(matrix, np.nan)
+            delta[:, 1:] = matrix[:, 1:] - matrix[:, :-1]
+            self._deltas[col] = delta
+            self._rolling[col] = _rolling_mean(matrix, window)
+
+    @classmethod
+    def from_frame(cls, data, key_col, value_cols, year_col=None, default_year=DEFAULT_YEAR):
+        """Bangun panel dari satu tabel; tanpa ``year_col`` seluruh tabel satu tahun."""
+        if year_col is None or year_col not in data.columns:
+            return cls({default_year: data}, key_col, value_cols)
+        years = pd.to_numeric(data[year_col], errors="coerce")
+        if years.isna().any():
+            data = data[years.notna()]
+            years = years[years.notna()]
+        if not pd.api.types.is_integer_dtype(data[year_col]):
+            data = data.assign(**{year_col: years.astype(np.int64).to_numpy()})
+        split = Partitions(data, year_col)
+        partitions = {int(year): split.get(year) for year in split.keys}
+        return cls(partitions, key_col, value_cols, year_col=year_col)
+
+    @property
+    def dated(self):
+        """True jika tabel memiliki kolom tahun (bukan satu rilis tanpa tahun)."""
+        return self.year_col is not None
+
+    @property
+    def latest(self):
+        return self.years[-1]
+
+    def year(self, year):
+        """Partisi satu tahun (tabel kosong jika tahun tidak ada).
+
+        Tabel tanpa kolom tahun mengembalikan satu-satunya partisinya untuk
+        tahun berapa pun.
+        """
+        if not self.dated:
+            return self.partitions[self.latest]
+        if year in self.partitions:
+            return self.partitions[year]
+        return self.partitions[self.latest].iloc[0:0]
+
+    def append(self, year, data):
+        """Panel baru dengan partisi ``year`` ditambahkan (atau diganti)."""
+        return YearPanel({**self.partitions, int(year): data}, self.key_col, self.value_cols,
+                         year_col=self.year_col or YEAR_COLUMN, window=self.window)
+
+    def _matrix(self, col):
+        matrix = np.full((len(self.entities), len(self.years)), np.nan)
+        for j, frame in enumerate(self.partitions.values()):
+            if col not in frame.columns or self.key_col not in frame.columns:
+                continue
+            rows = self.entities.get_indexer(np.asarray(frame[self.key_col], dtype=object))
+            # float32 dikembalikan ke desimal aslinya agar delta tidak membawa galat pembulatan
+            values = np.asarray(widen_values(frame[col].to_numpy()), dtype=np.float64)
+            found = rows >= 0
+            matrix[rows[found], j] = values[found]
+        return matrix
+
+    def trend(self, col, entities=None):
+        """Tabel panjang ``[kunci, tahun, nilai, delta, rata-rata bergulir]`` untuk satu kolom."""
+        if entities is None:
+            rows = np.arange(len(self.entities))
+        else:
+            rows = self.entities.get_indexer(list(entities))
+            rows = rows[rows >= 0]
+        n_years = len(self.years)
+        year_col = self.year_col or YEAR_COLUMN
+        return pd.DataFrame({
+            self.key_col: np.repeat(self.entities[rows].to_numpy(), n_years),
+            year_col: np.tile(np.asarray(self.years), len(rows)),
+            col: self._matrices[col][rows].ravel(),
+            "delta": self._deltas[col][rows].ravel(),
+            "rolling": self._rolling[col][rows].ravel(),
+        })
+
+    def year_change(self, col, year, entities=None):
+        """Nilai dan selisih terhadap tahun sebelumnya untuk satu tahun (per entitas)."""
+        trend = self.trend(col, entities)
+        year_col = self.year_col or YEAR_COLUMN
+        return trend[trend[year_col] == year].dropna(subset=["delta"]).reset_index(drop=True)
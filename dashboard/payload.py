@@ -0,0 +1,173 @@
+"""Pengecilan JSON figure Plotly sebelum dikirim ke browser.
+
+``slim_figure`` memproses figure dalam bentuk dict (hasil ``json.loads``
+dari ``fig.to_json()``) dan membuang bagian yang tidak ikut digambar:
+
+- ``layout.template.data`` hanya menyimpan default untuk tipe trace yang
+  benar-benar dipakai figure (template bawaan memuat puluhan tipe trace).
+- ``customdata``/``hovertext``/``text`` per titik dibuang jika trace punya
+  ``hovertemplate`` (dan ``texttemplate`` untuk ``text``) yang tidak
+  merujuknya, mis. label teks per batang yang sudah digantikan
+  ``texttemplate='%{y:.1f}%'``.
+- Angka pecahan di array data trace (``_DATA_KEYS``/``_MARKER_DATA_KEYS``)
+  dibulatkan ke ``DECIMALS`` desimal, cukup untuk semua format hover/label
+  di dashboard (paling banyak 2 desimal) dan koordinat (4 desimal, sekitar
+  11 m). Nilai skalar (``marker.sizeref``, ``marker.cmin``, ...) tidak
+  disentuh: pembulatannya bisa mengubah skala atau warna seluruh trace.
+
+Array angka juga bisa dikodekan sebagai typed array Plotly
+(``{"dtype": "f8", "bdata": <base64>}``) yang dibaca plotly.js tanpa
+mem-parse teks angka. Encoding ini hanya dipakai jika Plotly terpasang
+menerima typed array saat validasi figure (Plotly >= 6; ``st.plotly_chart``
+memvalidasi ulang figure) dan hanya jika hasilnya lebih kecil dari daftar
+angka JSON biasa.
+"""
+
+import base64
+import functools
+import json
+import re
+
+import numpy as np
+
+DECIMALS = 4
+# Array lebih pendek dari ini tidak dicoba dikodekan sebagai typed array
+TYPED_ARRAY_MIN = 16
+
+# Array data per titik yang boleh dibulatkan/dikodekan; atribut lain (label,
+# GeoJSON yang koordinatnya sudah dibulatkan di ``dashboard.geometry``, skalar)
+# dikirim apa adanya
+_DATA_KEYS = ("x", "y", "z", "lat", "lon", "customdata")
+_MARKER_DATA_KEYS = ("size", "color")
+_REFERENCE = re.compile(r"%\{([a-z]+)")
+_INT_TYPES = [("i1", np.int8), ("u1", np.uint8), ("i2", np.int16), ("u2", np.uint16),
+              ("i4", np.int32), ("u4", np.uint32)]
+
+
+@functools.lru_cache(maxsize=None)
+def typed_arrays_supported():
+    """True jika validator Plotly terpasang menerima typed array (``bdata``)."""
+    try:
+        import plotly.graph_objects as go
+        go.Scatter(y={"dtype": "i1", "bdata": "AA=="})
+    except (ImportError, ValueError):
+        return False
+    return True
+
+
+_NUMBER_TYPES = {int, float, type(None)}
+
+
+def _flatten(values):
+    """``(daftar angka datar, shape)`` untuk list angka 1D/2D persegi, atau ``None``."""
+    if set(map(type, values)) <= _NUMBER_TYPES:
+        return values, None
+    if set(map(type, values)) != {list}:
+        return None
+    width = len(values[0])
+    if not width or any(len(row) != width for row in values):
+        return None
+    flat = [v for row in values for v in row]
+    if not set(map(type, flat)) <= _NUMBER_TYPES:
+        return None
+    return flat, (len(values), width)
+
+
+def _typed_array(array, integral, shape):
+    code, dtype = "f8", np.float64
+    if integral:
+        low, high = array.min(), array.max()
+        for code, dtype in _INT_TYPES:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                break
+        else:
+            code, dtype = "f8", np.float64
+    data = array.astype(np.dtype(dtype).newbyteorder("<")).tobytes()
+    spec = {"dtype": code, "bdata": base64.b64encode(data).decode("ascii")}
+    if shape is not None:
+        spec["shape"] = f"{shape[0]},{shape[1]}"
+    return spec
+
+
+def _compact_array(values, decimals, typed):
+    flattened = _flatten(values) if values else None
+    if flattened is None:
+        # Campuran angka dan teks (mis. customdata): bulatkan angkanya saja
+        return [_compact_array(v, decimals, typed) if isinstance(v, list)
+                else round(v, decimals) if type(v) is float else v for v in values]
+    flat, shape = flattened
+    integral = set(map(type, flat)) == {int}
+    # None (null di JSON) menjadi NaN
+    array = np.array(flat, dtype=np.float64)
+    if integral:
+        result = values
+    else:
+        missing = np.isnan(array)
+        array = np.round(array, decimals)
+        rounded = array.tolist()
+        for i in np.flatnonzero(missing):
+            rounded[i] = None
+        if shape is not None:
+            rounded = [rounded[i:i + shape[1]] for i in range(0, len(rounded), shape[1])]
+        result = rounded
+
+    if typed and len(flat) >= TYPED_ARRAY_MIN:
+        spec = _typed_array(array, integral, shape)
+        if len(json.dumps(spec)) < len(json.dumps(result, separators=(",", ":"))):
+            return spec
+    return result
+
+
+def _compact_trace(trace, decimals, typed):
+    for key in _DATA_KEYS:
+        if isinstance(trace.get(key), list):
+            trace[key] = _compact_array(trace[key], decimals, typed)
+    marker = trace.get("marker")
+    if isinstance(marker, dict):
+        marker = trace["marker"] = dict(marker)
+        for key in _MARKER_DATA_KEYS:
+            if isinstance(marker.get(key), list):
+                marker[key] = _compact_array(marker[key], decimals, typed)
+    return trace
+
+
+def _drop_unreferenced(trace):
+    """Buang array per titik yang tidak dirujuk template hover/teks trace."""
+    hover = trace.get("hovertemplate")
+    label = trace.get("texttemplate")
+    if not isinstance(hover, str) or (label is not None and not isinstance(label, str)):
+        # Template per titik (list) atau tanpa hovertemplate: hover memakai atribut bawaan
+        return trace
+    references = set(_REFERENCE.findall(hover + (label or "")))
+    for key in ("customdata", "hovertext"):
+        if key not in references:
+            trace.pop(key, None)
+    if label is not None and "text" not in references:
+        trace.pop("text", None)
+    return trace
+
+
+def slim_figure(figure, decimals=DECIMALS, typed_arrays=None):
+    """Figure (dict) dengan atribut tak terpakai dibuang dan angka diringkas.
+
+    ``typed_arrays=None`` memakai typed array hanya jika didukung Plotly
+    terpasang (lihat ``typed_arrays_supported``).
+    """
+    if typed_arrays is None:
+        typed_arrays = typed_arrays_supported()
+    traces = figure.get("data", [])
+    slim = dict(figure)
+    slim["data"] = [_compact_trace(_drop_unreferenced(dict(trace)), decimals, typed_arrays)
+                    for trace in traces]
+
+    layout = figure.get("layout")
+    template = layout.get("template") if isinstance(layout, dict) else None
+    if isinstance(template, dict) and isinstance(template.get("data"), dict):
+        used = {trace.get("type", "scatter") for trace in traces}
+        template = dict(template)
+        template["data"] = {kind: value for kind, value in template["data"].items() if kind in used}
+        if not template["data"]:
+            del template["data"]
+        slim["layout"] = {**layout, "template": template}
+    return slim
@@ -0,0 +1,120 @@
+"""Penyimpan dataset aktif dengan refresh otomatis di background.
+
+Thread daemon memantau file sumber (mtime/ukuran). Jika berubah, data
+dimuat ulang di background lewat fungsi ``load`` (yang memakai cache
+kolumnar sehingga hanya sheet yang berubah yang di-parse ulang), lalu
+snapshot baru dipasang sekaligus. Sesi yang sedang berjalan tetap membaca
+snapshot lama sampai snapshot baru siap, sehingga tidak pernah menunggu
+reload dan tidak pernah melihat data setengah jadi. Jika load atau
+validasi gagal, snapshot lama tetap dipakai dan error-nya dicatat.
+
+Dengan ``partial=True`` load pertama juga berjalan di background dan
+fungsi ``load`` menerima callback ``publish`` untuk memasang data parsial
+(mis. tabel provinsi sudah siap, tabel kab/kota belum). Snapshot parsial
+ditandai ``complete=False``; sesi bisa menunggu snapshot berikutnya lewat
+``wait``. Reload berikutnya tidak pernah memasang data parsial.
+"""
+
+import os
+import threading
+import time
+from collections import namedtuple
+
+REFRESH_INTERVAL = float(os.environ.get("DASHBOARD_REFRESH_SECONDS", "10"))
+
+# data: hasil fungsi load (None jika belum pernah berhasil)
+# error: exception dari percobaan load terakhir (None jika berhasil)
+# complete: False selama load pertama baru memasang data parsial
+Snapshot = namedtuple("Snapshot", ["data", "error", "loaded_at", "complete"], defaults=(True,))
+
+
+class DataValidationError(ValueError):
+    """Data baru tidak lolos validasi dan tidak akan dipasang."""
+
+
+def _file_state(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DataStore:
+    """Memegang snapshot dataset terbaru dan me-reload-nya saat file berubah."""
+
+    def __init__(self, file_path, load, interval=REFRESH_INTERVAL, watch=None, partial=False):
+        self.file_path = file_path
+        self.interval = interval
+        self._load = load
+        # File yang dipantau (mis. semua file sumber registry); default hanya file_path
+        self._watch = list(watch) if watch else [file_path]
+        self._partial = partial
+        self._lock = threading.Lock()
+        self._published = threading.Condition()
+        self._thread = None
+        self._stop = threading.Event()
+        self._snapshot = Snapshot(None, None, None, not partial)
+        self._state = None
+        self.reload_count = 0
+        if partial:
+            # Load pertama di background; sesi memakai snapshot parsial sambil menunggu
+            threading.Thread(target=self.check, name="data-load", daemon=True).start()
+        else:
+            # Load pertama dilakukan langsung agar sesi pertama langsung punya data
+            self.check()
+
+    def snapshot(self):
+        """Snapshot aktif; tidak pernah menunggu reload yang sedang berjalan."""
+        return self._snapshot
+
+    def wait(self, timeout=None):
+        """Tunggu snapshot berikutnya dipasang (paling lama ``timeout`` detik), lalu kembalikan snapshot aktif."""
+        with self._published:
+            self._published.wait(timeout)
+        return self._snapshot
+
+    def _set(self, snapshot):
+        with self._published:
+            self._snapshot = snapshot
+            self._published.notify_all()
+
+    def _publish(self, data):
+        # Data parsial hanya dipasang selama belum ada snapshot lengkap
+        if not self._snapshot.complete:
+            self._set(Snapshot(data, None, None, False))
+
+    def check(self):
+        """Reload jika file berubah sejak load terakhir. Mengembalikan True jika ada reload."""
+        with self._lock:
+            state = tuple(_file_state(path) for path in self._watch)
+            if None not in state and state == self._state:
+                return False
+            try:
+                if self._partial:
+                    data = self._load(self.file_path, self._publish)
+                else:
+                    data = self._load(self.file_path)
+            except Exception as e:
+                # Snapshot lama tetap dipakai; coba lagi di putaran berikutnya
+                self._set(self._snapshot._replace(error=e))
+                return False
+            self._state = state
+            self._set(Snapshot(data, None, time.time()))
+            self.reload_count += 1
+            return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self):
+        """Mulai thread pemantau (aman dipanggil berkali-kali)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="data-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
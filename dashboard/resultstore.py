@@ -0,0 +1,178 @@
+"""Penyimpanan hasil (JSON figure) di disk, dibagi antar proses dan restart.
+
+``ResultStore`` adalah tingkat kedua di bawah ``FigureCache``: figure yang
+tidak ada di memori proses dicari dulu di file SQLite sebelum dibangun
+ulang, dan setiap figure baru ikut ditulis ke sana. Karena key figure
+berisi versi data dan baris hasil filter (bukan nilai widget), proses lain
+dan proses baru setelah deploy langsung mendapat figure yang sama untuk
+kombinasi filter yang sama.
+
+Setiap entri mencatat versi data pembuatnya. ``retain`` membuang entri
+dari versi data lain (dipanggil sekali setelah ``data_python.xlsx``
+berubah), tetapi hanya yang tidak diakses selama ``RETAIN_IDLE_SECONDS``:
+file SQLite dipakai bersama semua proses, dan proses yang belum memuat
+ulang data (atau masih memakai versi lama saat deploy bergulir) terus
+mengakses entrinya sendiri. Sisa versi lama yang masih baru akhirnya
+dibuang oleh eviction LRU. Store juga punya ``namespace`` (hash kode pembuat figure dan
+versi Plotly); jika berbeda dengan isi file, semua entri dibuang agar
+figure dari kode lama tidak tersaji setelah deploy. Total ukuran dibatasi
+``max_bytes``: entri yang paling lama tidak diakses dibuang lebih dulu.
+
+Payload disimpan terkompresi zlib. Semua error SQLite (file terkunci,
+disk penuh) ditelan: store hanya mempercepat, tidak boleh menggagalkan
+render.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+# Batas total payload (terkompresi) di disk
+RESULT_STORE_MAX_BYTES = int(os.environ.get("DASHBOARD_RESULT_CACHE_MB", "256")) * 1024 * 1024
+# Setelah melewati batas, entri terlama dibuang sampai total <= EVICT_TO * batas
+EVICT_TO = 0.9
+# retain hanya membuang entri versi lain yang tidak diakses selama ini
+RETAIN_IDLE_SECONDS = float(os.environ.get("DASHBOARD_RESULT_CACHE_RETAIN_MINUTES", "60")) * 60
+RESULT_STORE_NAME = "results.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    name TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+
+def source_version(*paths, extra=()):
+    """Hash isi file sumber (dan string tambahan) untuk ``namespace`` store."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    for part in extra:
+        digest.update(str(part).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def open_result_store(path, namespace="", max_bytes=RESULT_STORE_MAX_BYTES):
+    """``ResultStore`` di ``path``, atau ``None`` jika file tidak bisa dibuka/dibuat."""
+    try:
+        return ResultStore(path, max_bytes=max_bytes, namespace=namespace)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+class ResultStore:
+    """Store key -> payload teks di SQLite dengan eviction LRU berdasarkan ukuran.
+
+    Aman dipakai banyak thread (satu koneksi, dikunci) dan banyak proses
+    (mode WAL SQLite).
+    """
+
+    def __init__(self, path, max_bytes=RESULT_STORE_MAX_BYTES, namespace=""):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self.errors = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'namespace'").fetchone()
+        if row is None or row[0] != namespace:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('namespace', ?)", (namespace,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get(self, key):
+        """Payload untuk ``key`` atau ``None``; waktu akses entri diperbarui."""
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT payload FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error:
+            self.errors += 1
+            return None
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def put(self, key, payload, version="", name=""):
+        """Simpan payload; entri terlama dibuang jika total melebihi ``max_bytes``."""
+        blob = zlib.compress(payload.encode("utf-8"), 6)
+        if len(blob) > self.max_bytes:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, version, name, blob, len(blob), time.time()),
+                )
+                self._evict()
+        except sqlite3.Error:
+            self.errors += 1
+
+    def _evict(self):
+        # Total dihitung dari tabel: proses lain juga menulis ke file yang sama
+        total = self._conn.execute("SELECT coalesce(sum(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Turunkan sampai EVICT_TO dari batas agar tidak evict di setiap put berikutnya
+        excess = total - int(self.max_bytes * EVICT_TO)
+        self._conn.execute(
+            "DELETE FROM entries WHERE key IN (SELECT key FROM (SELECT key, sum(size) OVER "
+            "(ORDER BY accessed ROWS UNBOUNDED PRECEDING) - size AS before FROM entries) WHERE before < ?)",
+            (excess,),
+        )
+
+    def retain(self, version, max_idle=RETAIN_IDLE_SECONDS):
+        """Buang entri dari versi data lain yang tidak diakses selama ``max_idle`` detik.
+
+        Entri dipertahankan jika versinya sama dengan ``version`` atau
+        berawalan ``version + ":"`` (versi per tahun, mis. ``<hash>:2024``).
+        Mengembalikan jumlah entri yang dibuang.
+        """
+        try:
+            with self._lock:
+                cursor = self._conn.execute(
+                    "DELETE FROM entries WHERE version != ? AND substr(version, 1, ?) != ? AND accessed < ?",
+                    (version, len(version) + 1, version + ":", time.time() - max_idle),
+                )
+                return cursor.rowcount
+        except sqlite3.Error:
+            self.errors += 1
+            return 0
+
+    def clear(self):
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM entries")
+        except sqlite3.Error:
+            self.errors += 1
+
+    def stats(self):
+        """Dict ``entries``, ``bytes`` (terkompresi), dan ``errors``."""
+        try:
+            with self._lock:
+                entries, total = self._conn.execute(
+                    "SELECT count(*), coalesce(sum(size), 0) FROM entries").fetchone()
+        except sqlite3.Error:
+            entries = total = 0
+        return {"entries": entries, "bytes": total, "errors": self.errors}
@@ -0,0 +1,107 @@
+"""Resolusi peran kolom (latitude, longitude, kemiskinan, dll.) per dataset.
+
+Dijalankan sekali saat data dimuat. Nama kolom dipecah menjadi token
+(``"Kota/Kab"`` -> ``KOTA``, ``KAB``) lalu dicocokkan dengan kata kunci
+secara utuh, sehingga ``LON`` tidak lagi cocok dengan kolom apa pun yang
+kebetulan mengandung huruf tersebut. Jika beberapa kolom cocok, kolom
+pertama yang dipakai.
+"""
+
+import re
+
+import pandas as pd
+
+# peran -> kata kunci (token utuh, huruf besar) sesuai urutan prioritas
+PROVINSI_ROLES = {
+    "province": ["PROVINSI", "PROV"],
+    "latitude": ["LATITUDE", "LAT", "LINTANG"],
+    "longitude": ["LONGITUDE", "LONG", "LON", "BUJUR"],
+    "poverty": ["PENDUDUK_MISKIN", "MISKIN", "KEMISKINAN", "POVERTY"],
+    "tpt": ["TPT"],
+    "year": ["TAHUN", "YEAR"],
+}
+KABKOTA_ROLES = {
+    "province": ["PROVINSI", "PROV"],
+    "name": ["KABUPATEN", "KAB", "KOTA"],
+    "poverty": ["MISKIN", "KEMISKINAN", "POVERTY"],
+    "year": ["TAHUN", "YEAR"],
+}
+TPAK_ROLES = {
+    "province": ["PROVINSI", "PROV"],
+    "male": ["LAKI-LAKI", "LAKI"],
+    "female": ["PEREMPUAN"],
+    "year": ["TAHUN", "YEAR"],
+}
+
+TABLE_ROLES = {"provinsi": PROVINSI_ROLES, "kabkota": KABKOTA_ROLES, "tpak": TPAK_ROLES}
+
+# Peran yang nilainya harus numerik
+NUMERIC_ROLES = {"latitude", "longitude", "poverty", "tpt", "male", "female"}
+
+# Kolom APS: rentang usia seperti "7-12" atau nama yang mengandung token APS
+_AGE_BAND = re.compile(r"^\s*(?:APS\s*)?\d+\s*-\s*\d+\s*$", re.IGNORECASE)
+
+
+def _tokens(column):
+    name = str(column).upper()
+    # Nama utuh juga dihitung sebagai token (mis. "PENDUDUK_MISKIN", "LAKI-LAKI")
+    return {name.strip()} | set(re.split(r"[^A-Z0-9]+", name)) - {""}
+
+
+def _find(columns, keywords, exclude=()):
+    for keyword in keywords:
+        for col in columns:
+            if col not in exclude and keyword in _tokens(col):
+                return col
+    return None
+
+
+def resolve_table(columns, role_keywords):
+    """Petakan setiap peran ke satu kolom (atau ``None`` jika tidak ditemukan)."""
+    roles = {}
+    used = []
+    for role, keywords in role_keywords.items():
+        col = _find(columns, keywords, exclude=used)
+        roles[role] = col
+        if col is not None:
+            used.append(col)
+    return roles
+
+
+def aps_columns(columns):
+    """Kolom Angka Partisipasi Sekolah sesuai urutan di tabel."""
+    return [col for col in columns if _AGE_BAND.match(str(col)) or "APS" in _tokens(col)]
+
+
+def resolve_table_roles(name, data):
+    """Peta peran kolom satu tabel dashboard (``"provinsi"``, ``"kabkota"``, ``"tpak"``)."""
+    roles = resolve_table(list(data.columns), TABLE_ROLES[name])
+    if name == "provinsi":
+        roles["aps"] = aps_columns(data.columns)
+    return roles
+
+
+def resolve_roles(data_provinsi, data_kabkota=None, data_tpak=None):
+    """Peta peran kolom untuk ketiga tabel dashboard."""
+    return {
+        "provinsi": resolve_table_roles("provinsi", data_provinsi),
+        "kabkota": resolve_table_roles("kabkota", data_kabkota) if data_kabkota is not None else {},
+        "tpak": resolve_table_roles("tpak", data_tpak) if data_tpak is not None else {},
+    }
+
+
+def coerce_numeric(data, table_roles):
+    """Pastikan kolom berperan numerik bertipe angka (nilai tidak valid -> NaN).
+
+    Tabel dikembalikan tanpa disalin jika semua kolom sudah numerik.
+    """
+    columns = [col for role, col in table_roles.items()
+               if role in NUMERIC_ROLES and col is not None]
+    columns += table_roles.get("aps", [])
+    pending = [col for col in columns if not pd.api.types.is_numeric_dtype(data[col])]
+    if not pending:
+        return data
+    data = data.copy()
+    for col in pending:
+        data[col] = pd.to_numeric(data[col], errors="coerce")
+    return data
@@ -0,0 +1,268 @@
+"""Registry sumber data dan loader paralel per sheet/file.
+
+Setiap sumber (``Source``) adalah satu sheet workbook atau satu file CSV
+yang mengisi satu tabel dashboard, opsional untuk satu tahun tertentu
+(mis. workbook tahunan terpisah). Reader dipilih dari ekstensi file lewat
+``register_reader``; reader menerima ``(file_path, sheet_names)`` dan
+mengembalikan ``{nama_sheet: DataFrame}`` seperti
+``dashboard.workbook.read_workbook``.
+
+``LoadJob`` memuat semua sumber lewat cache kolumnar (satu folder cache
+per sumber, lihat ``dashboard.cache``). Sumber yang cache-nya masih segar
+langsung dibaca lewat memory-map. Sumber yang perlu di-parse ulang
+dikerjakan paralel di process pool jika ukurannya cukup besar: worker
+hanya mem-parse dan menulis cache, lalu proses utama membaca hasilnya
+lewat memory-map sehingga data tidak perlu disalin balik antar proses.
+Tabel bisa diambil satu per satu begitu semua sumbernya siap
+(``as_completed``), jadi dashboard tidak perlu menunggu sheet terbesar
+untuk menampilkan tabel lain.
+"""
+
+import concurrent.futures
+import hashlib
+import multiprocessing
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from dashboard.cache import default_cache_dir, is_fresh, load_workbook_cached
+from dashboard.panel import DEFAULT_YEAR, YEAR_COLUMN
+from dashboard.storage import compact_names
+from dashboard.workbook import WorkbookReader, read_csv, read_workbook
+
+# Di bawah ukuran total ini (byte file yang perlu di-parse) process pool tidak
+# sebanding dengan biaya start worker, jadi sumber di-parse langsung
+PARALLEL_MIN_BYTES = 1 << 20
+# Jumlah worker maksimum; default jumlah CPU, 1 = selalu parse di proses ini
+LOAD_WORKERS = int(os.environ.get("DASHBOARD_LOAD_WORKERS", "0")) or os.cpu_count() or 1
+
+_YEAR_IN_NAME = re.compile(r"(?<!\d)((?:19|20)\d{2})(?!\d)")
+
+# table: nama tabel dashboard; sheet: nama sheet (juga menentukan skema kolom);
+# year: tahun data jika sumber hanya berisi satu tahun (None = ikut data)
+Source = namedtuple("Source", ["table", "path", "sheet", "year"])
+
+READERS = {}
+
+
+def register_reader(*extensions):
+    """Dekorator: daftarkan reader untuk ekstensi file (mis. ``".csv"``).
+
+    Reader dijalankan di proses worker, jadi harus fungsi level modul yang
+    bisa di-import ulang di sana.
+    """
+    def decorator(reader):
+        for ext in extensions:
+            READERS[ext.lower()] = reader
+        return reader
+    return decorator
+
+
+register_reader(".xlsx", ".xlsm")(read_workbook)
+register_reader(".csv")(read_csv)
+
+
+def reader_for(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"Format sumber data tidak dikenal: {path}")
+    return READERS[ext]
+
+
+def source_cache_dir(source):
+    """Folder cache satu sumber: ``<cache file>/<nama sheet>``."""
+    return os.path.join(default_cache_dir(source.path), source.sheet)
+
+
+class SourceRegistry:
+    """Daftar sumber data per tabel, sesuai urutan pendaftaran."""
+
+    def __init__(self):
+        self._sources = []
+
+    def add(self, table, path, sheet=None, year=None):
+        """Daftarkan satu sumber; ``sheet`` default untuk CSV adalah nama tabel."""
+        reader_for(path)
+        self._sources.append(Source(table, path, sheet or table, year))
+        return self
+
+    def add_workbook(self, path, sheet_tables, year=None):
+        """Daftarkan semua sheet workbook: ``{nama_sheet: nama_tabel}``."""
+        for sheet, table in sheet_tables.items():
+            self.add(table, path, sheet, year)
+        return self
+
+    def add_file(self, path, sheet_tables):
+        """Daftarkan file tambahan; tahun dan tabel ditebak dari nama file.
+
+        Tahun diambil dari angka 19xx/20xx di nama file (mis.
+        ``data_python_2023.xlsx``). Workbook dianggap berisi sheet yang sama
+        dengan workbook utama; CSV dipetakan ke tabel yang nama sheet-nya
+        menjadi awalan nama file (mis. ``KEMISKINAN_KABKOTA_2023.csv``).
+        """
+        name = os.path.basename(path)
+        match = _YEAR_IN_NAME.search(name)
+        year = int(match.group(1)) if match else None
+        if reader_for(path) is not read_csv:
+            return self.add_workbook(path, sheet_tables, year)
+        stem = os.path.splitext(name)[0].upper()
+        for sheet, table in sheet_tables.items():
+            if stem.startswith(sheet.upper()):
+                return self.add(table, path, sheet, year)
+        raise ValueError(f"Tidak bisa menentukan tabel untuk {path}")
+
+    def sources(self, table=None):
+        return [s for s in self._sources if table is None or s.table == table]
+
+    def tables(self):
+        return list(dict.fromkeys(s.table for s in self._sources))
+
+    def paths(self):
+        return list(dict.fromkeys(s.path for s in self._sources))
+
+
+def _prepare(source):
+    """Worker: parse sumber dan tulis cache-nya (data dibaca ulang di proses utama)."""
+    load_workbook_cached(source.path, [source.sheet], cache_dir=source_cache_dir(source),
+                         reader=reader_for(source.path))
+
+
+def _load(source, reader):
+    frames, version = load_workbook_cached(source.path, [source.sheet], cache_dir=source_cache_dir(source),
+                                           reader=reader)
+    return frames[source.sheet], version
+
+
+def _with_year(frame, year):
+    if YEAR_COLUMN in frame.columns:
+        return frame
+    return frame.assign(**{YEAR_COLUMN: np.full(len(frame), year, dtype=np.int64)})
+
+
+def merge_sources(frames, years):
+    """Gabungkan tabel dari beberapa sumber menjadi satu tabel.
+
+    Satu sumber dikembalikan apa adanya (tetap zero-copy). Untuk beberapa
+    sumber, sumber bertahun mendapat kolom ``TAHUN``; sumber tanpa tahun
+    dianggap ``DEFAULT_YEAR``. Kolom kategori dijadikan kategori lagi
+    setelah digabung.
+    """
+    if len(frames) == 1:
+        return frames[0]
+    frames = [_with_year(frame, DEFAULT_YEAR if year is None else year)
+              for frame, year in zip(frames, years)]
+    merged = pd.concat(frames, ignore_index=True)
+    categorical = {col for frame in frames for col in frame.columns
+                   if isinstance(frame[col].dtype, pd.CategoricalDtype)}
+    if categorical:
+        merged = merged.assign(**{col: compact_names(merged[col]) for col in categorical})
+    return merged
+
+
+class LoadJob:
+    """Satu kali load semua sumber registry, paralel jika perlu parse ulang.
+
+    Pakai sebagai context manager agar process pool ditutup.
+    """
+
+    def __init__(self, registry, max_workers=LOAD_WORKERS, parallel_min_bytes=PARALLEL_MIN_BYTES):
+        self.registry = registry
+        self._versions = {}
+        self._tables = {}
+        self._executor = None
+        self._futures = {}
+        # Parse di proses ini: satu workbook dibuka sekali untuk semua sheet-nya
+        self._workbooks = {}
+
+        stale = [s for s in registry.sources() if not is_fresh(s.path, [s.sheet], source_cache_dir(s))]
+        stale_bytes = 0
+        for path in dict.fromkeys(s.path for s in stale):
+            try:
+                stale_bytes += os.path.getsize(path)
+            except OSError:
+                pass
+        workers = min(max_workers, len(stale))
+        if workers > 1 and stale_bytes >= parallel_min_bytes:
+            # spawn: aman dipakai dari server multi-thread (fork bisa mewarisi lock yang terkunci)
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn"))
+            self._futures = {source: self._executor.submit(_prepare, source) for source in stale}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        for workbook in self._workbooks.values():
+            workbook.close()
+        self._workbooks.clear()
+
+    def _reader(self, source):
+        reader = reader_for(source.path)
+        if reader is not read_workbook or source in self._futures:
+            return reader
+        if source.path not in self._workbooks:
+            self._workbooks[source.path] = WorkbookReader(source.path)
+        return self._workbooks[source.path].read
+
+    def _ready(self, table):
+        return all(self._futures[s].done() for s in self.registry.sources(table) if s in self._futures)
+
+    def progress(self):
+        """Tuple ``(sumber selesai, total sumber)``."""
+        sources = self.registry.sources()
+        done = sum(1 for s in sources
+                   if s.table in self._tables or (s in self._futures and self._futures[s].done()))
+        return done, len(sources)
+
+    def as_completed(self):
+        """Nama tabel, masing-masing segera setelah semua sumbernya siap.
+
+        Tabel yang siap bersamaan dikembalikan sesuai urutan registry.
+        """
+        remaining = self.registry.tables()
+        while remaining:
+            ready = [table for table in remaining if self._ready(table)]
+            if not ready:
+                pending = [f for f in self._futures.values() if not f.done()]
+                concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                continue
+            for table in ready:
+                remaining.remove(table)
+                yield table
+
+    def table(self, table):
+        """Tabel gabungan semua sumber ``table`` (menunggu worker jika belum selesai).
+
+        Error dari reader (mis. file atau sheet tidak ada) dilempar di sini.
+        """
+        if table not in self._tables:
+            frames, years = [], []
+            for source in self.registry.sources(table):
+                if source in self._futures:
+                    self._futures[source].result()
+                frame, version = _load(source, self._reader(source))
+                self._versions[source] = version
+                frames.append(frame)
+                years.append(source.year)
+            self._tables[table] = merge_sources(frames, years)
+        return self._tables[table]
+
+    def version(self):
+        """Versi data dari sumber yang sudah dimuat: hash file jika hanya satu file."""
+        versions = list(dict.fromkeys(self._versions.values()))
+        if len(versions) == 1:
+            return versions[0]
+        digest = hashlib.sha256()
+        for source, version in self._versions.items():
+            digest.update(f"{source.path}|{source.sheet}|{version}\n".encode("utf-8"))
+        return digest.hexdigest()
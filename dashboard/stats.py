@@ -0,0 +1,198 @@
+"""Statistik ringkas per provinsi yang dihitung sekali saat data dimuat.
+
+Untuk setiap kolom angka disimpan agregat aditif per grup (jumlah data,
+total, jumlah kuadrat, minimum, maksimum) dan sketsa kuantil. Grup kecil
+(sampai ``EXACT_LIMIT`` nilai) menyimpan nilai terurutnya sehingga kuantil
+tetap eksak; grup besar menyimpan histogram dengan batas bin yang sama
+untuk seluruh tabel, jadi histogram beberapa grup cukup dijumlahkan.
+
+Subset provinsi mana pun digabung dari statistik per grup tanpa membaca
+ulang baris. Jika filter memotong sebagian baris dalam satu grup (mis.
+filter rentang pada tabel dengan banyak baris per provinsi), statistik
+dihitung langsung dari baris yang lolos.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from dashboard.storage import widen_values
+
+EXACT_LIMIT = 512
+HISTOGRAM_BINS = 2048
+# Pagar whisker boxplot (aturan Tukey)
+WHISKER_IQR = 1.5
+
+
+class Summary(namedtuple("Summary", ["count", "total", "sumsq", "minimum", "maximum"])):
+    """Agregat aditif satu kolom; dua ringkasan digabung dengan ``merge``."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_values(cls, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return cls(0, 0.0, 0.0, np.nan, np.nan)
+        return cls(len(values), float(values.sum()), float(np.dot(values, values)),
+                   float(values.min()), float(values.max()))
+
+    def merge(self, other):
+        return Summary(
+            self.count + other.count,
+            self.total + other.total,
+            self.sumsq + other.sumsq,
+            float(np.fmin(self.minimum, other.minimum)),
+            float(np.fmax(self.maximum, other.maximum)),
+        )
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else np.nan
+
+    @property
+    def std(self):
+        """Simpangan baku sampel (ddof=1, sama seperti pandas)."""
+        if self.count < 2:
+            return np.nan
+        variance = (self.sumsq - self.total * self.total / self.count) / (self.count - 1)
+        return float(np.sqrt(max(variance, 0.0)))
+
+
+class _ColumnStats:
+    """Agregat dan sketsa kuantil per grup untuk satu kolom."""
+
+    def __init__(self, codes, n_groups, values, exact_limit, bins):
+        valid = (codes >= 0) & ~np.isnan(values)
+        group = codes[valid]
+        values = values[valid]
+        order = np.lexsort((values, group))
+        group, values = group[order], values[order]
+
+        self.counts = np.bincount(group, minlength=n_groups)
+        self.totals = np.bincount(group, weights=values, minlength=n_groups)
+        self.sumsq = np.bincount(group, weights=values * values, minlength=n_groups)
+        offsets = np.concatenate([[0], np.cumsum(self.counts)])
+        present = self.counts > 0
+        self.minimums = np.full(n_groups, np.nan)
+        self.maximums = np.full(n_groups, np.nan)
+        self.minimums[present] = values[offsets[:-1][present]]
+        self.maximums[present] = values[offsets[1:][present] - 1]
+
+        # Grup kecil: nilai terurut (eksak). Grup besar: histogram dengan batas bin bersama.
+        small = self.counts <= exact_limit
+        self.exact_values = values[small[group]]
+        self.exact_offsets = np.concatenate([[0], np.cumsum(np.where(small, self.counts, 0))])
+        self.edges = np.linspace(values.min(), values.max(), bins + 1) if len(values) else None
+        self.histograms = {}
+        for g in np.flatnonzero(~small):
+            chunk = values[offsets[g]:offsets[g + 1]]
+            self.histograms[g] = np.histogram(chunk, self.edges)[0]
+
+    def summary(self, groups):
+        if not len(groups):
+            return Summary(0, 0.0, 0.0, np.nan, np.nan)
+        count = int(self.counts[groups].sum())
+        if not count:
+            return Summary(0, 0.0, 0.0, np.nan, np.nan)
+        return Summary(count, float(self.totals[groups].sum()), float(self.sumsq[groups].sum()),
+                       float(np.nanmin(self.minimums[groups])), float(np.nanmax(self.maximums[groups])))
+
+    def sketch(self, groups):
+        """``(nilai eksak terurut, histogram atau None)`` gabungan beberapa grup."""
+        exact = np.concatenate([self.exact_values[self.exact_offsets[g]:self.exact_offsets[g + 1]]
+                                for g in groups if g not in self.histograms] or [np.empty(0)])
+        big = [self.histograms[g] for g in groups if g in self.histograms]
+        if not big:
+            return np.sort(exact), None
+        histogram = np.sum(big, axis=0) + np.histogram(exact, self.edges)[0]
+        return None, histogram
+
+
+def _histogram_quantiles(histogram, edges, qs):
+    """Kuantil dari histogram dengan interpolasi linear di dalam bin."""
+    cumulative = np.cumsum(histogram)
+    targets = np.asarray(qs) * cumulative[-1]
+    bins = np.minimum(np.searchsorted(cumulative, targets, side="left"), len(histogram) - 1)
+    before = np.where(bins > 0, cumulative[bins - 1], 0)
+    inside = np.where(histogram[bins] > 0, (targets - before) / np.maximum(histogram[bins], 1), 0.0)
+    return edges[bins] + np.clip(inside, 0.0, 1.0) * (edges[bins + 1] - edges[bins])
+
+
+def box_stats(summary, exact=None, histogram=None, edges=None):
+    """Statistik boxplot (kuartil, pagar whisker, mean, sd) dari sketsa gabungan."""
+    if summary.count == 0:
+        return None
+    if histogram is None:
+        q1, median, q3 = np.quantile(exact, [0.25, 0.5, 0.75])
+    else:
+        q1, median, q3 = _histogram_quantiles(histogram, edges, [0.25, 0.5, 0.75])
+    low = q1 - WHISKER_IQR * (q3 - q1)
+    high = q3 + WHISKER_IQR * (q3 - q1)
+    if histogram is None:
+        # Whisker berhenti di titik data terjauh yang masih di dalam pagar
+        lower_fence = float(exact[np.searchsorted(exact, low, side="left")])
+        upper_fence = float(exact[np.searchsorted(exact, high, side="right") - 1])
+    else:
+        lower_fence = max(low, summary.minimum)
+        upper_fence = min(high, summary.maximum)
+    return {
+        "q1": float(q1), "median": float(median), "q3": float(q3),
+        "lowerfence": lower_fence, "upperfence": upper_fence,
+        "mean": summary.mean, "sd": summary.std, "count": summary.count,
+        "min": summary.minimum, "max": summary.maximum,
+    }
+
+
+class GroupStats:
+    """Statistik per grup (mis. provinsi) untuk semua kolom angka satu tabel."""
+
+    def __init__(self, data, key_col="PROVINSI", exact_limit=EXACT_LIMIT, bins=HISTOGRAM_BINS):
+        codes, _ = pd.factorize(data[key_col])
+        n_groups = int(codes.max()) + 1 if len(codes) else 0
+        self.data = data
+        self._codes = codes
+        # Jumlah baris per grup (termasuk NaN) untuk mengecek apakah grup terpilih utuh
+        self._rows_per_group = np.bincount(codes[codes >= 0], minlength=n_groups)
+        self._columns = {}
+        for col in data.columns:
+            if col != key_col and pd.api.types.is_numeric_dtype(data[col]):
+                values = np.asarray(widen_values(data[col].to_numpy()), dtype=np.float64)
+                self._columns[col] = _ColumnStats(codes, n_groups, values, exact_limit, bins)
+
+    def __contains__(self, col):
+        return col in self._columns
+
+    def _groups(self, rows):
+        """Grup yang terpilih utuh oleh ``rows``, atau ``None`` jika ada grup terpotong."""
+        if rows is None:
+            return np.arange(len(self._rows_per_group))
+        groups, counts = np.unique(self._codes[rows], return_counts=True)
+        if len(groups) and groups[0] < 0:
+            return None
+        if not np.array_equal(counts, self._rows_per_group[groups]):
+            return None
+        return groups
+
+    def _values(self, col, rows):
+        return np.asarray(widen_values(self.data[col].to_numpy()[rows]), dtype=np.float64)
+
+    def summary(self, col, rows=None):
+        """``Summary`` kolom ``col`` untuk baris ``rows`` (``None`` = semua baris)."""
+        groups = self._groups(rows)
+        if groups is None:
+            return Summary.from_values(self._values(col, rows))
+        return self._columns[col].summary(groups)
+
+    def box(self, col, rows=None):
+        """Statistik boxplot kolom ``col`` (lihat ``box_stats``), atau ``None`` jika kosong."""
+        groups = self._groups(rows)
+        if groups is None:
+            values = self._values(col, rows)
+            values = np.sort(values[~np.isnan(values)])
+            return box_stats(Summary.from_values(values), exact=values)
+        column = self._columns[col]
+        exact, histogram = column.sketch(groups)
+        return box_stats(column.summary(groups), exact=exact, histogram=histogram, edges=column.edges)
@@ -0,0 +1,91 @@
+"""Penyimpanan tabel dengan tipe kolom yang ringkas.
+
+Kolom nama (provinsi, kabupaten/kota) disimpan sebagai ``category``:
+nilai teks yang berulang cukup disimpan sekali dan setiap baris hanya
+memegang kode integer kecil. Kolom indikator disimpan sebagai ``float32``
+jika presisi desimal sumbernya masih terwakili (nilai asli bisa
+dikembalikan tepat dengan pembulatan), dan tetap ``float64`` jika tidak
+(mis. koordinat dengan banyak desimal). Nilai kosong tetap NaN/kode -1,
+tidak perlu kolom ``object``.
+
+Karena ``float32`` menyimpan 806.82 sebagai 806.8200073..., figure tidak
+menggambar kolom ringkas secara langsung: ``widen`` mengembalikan nilai ke
+desimal aslinya sebelum diserialisasi (lihat ``dashboard.figures``).
+"""
+
+import numpy as np
+import pandas as pd
+
+# Batas jumlah desimal yang dicoba saat mendeteksi presisi kolom
+MAX_DECIMALS = 6
+
+
+def _decimals(values):
+    """Jumlah desimal terkecil yang mewakili semua nilai, atau ``None``."""
+    finite = values[np.isfinite(values)]
+    for decimals in range(MAX_DECIMALS + 1):
+        if np.array_equal(np.round(finite, decimals), finite):
+            return decimals
+    return None
+
+
+def compact_float(values):
+    """Array ``float32`` jika presisi sumber masih terjaga, selain itu ``float64``."""
+    values = np.asarray(values, dtype=np.float64)
+    decimals = _decimals(values)
+    if decimals is None:
+        return values
+    narrow = values.astype(np.float32)
+    restored = np.round(narrow.astype(np.float64), decimals)
+    if np.array_equal(restored, values, equal_nan=True):
+        return narrow
+    return values
+
+
+def compact_names(values):
+    """Kolom nama sebagai ``category`` (nilai kosong menjadi kode -1)."""
+    return pd.Categorical(values)
+
+
+def widen_values(values):
+    """Kembalikan array ``float32`` ke ``float64`` dengan desimal aslinya.
+
+    Jumlah desimal dicari dari yang terkecil sampai semua nilai, setelah
+    dibulatkan, kembali ke ``float32`` yang sama. Array bertipe lain
+    dikembalikan apa adanya.
+    """
+    values = np.asarray(values)
+    if values.dtype != np.float32:
+        return values
+    wide = values.astype(np.float64)
+    finite = np.isfinite(values)
+    for decimals in range(MAX_DECIMALS + 2):
+        rounded = np.round(wide, decimals)
+        if np.array_equal(rounded[finite].astype(np.float32), values[finite]):
+            return rounded
+    return wide
+
+
+def widen(data):
+    """DataFrame dengan kolom ``float32`` dilebarkan lewat ``widen_values``.
+
+    Tabel dikembalikan tanpa disalin jika tidak ada kolom ``float32``.
+    """
+    narrow = [col for col in data.columns if data[col].dtype == np.float32]
+    if not narrow:
+        return data
+    return data.assign(**{col: widen_values(data[col].to_numpy()) for col in narrow})
+
+
+def _wide_bytes(series):
+    """Ukuran kolom jika disimpan seperti hasil ``pd.read_excel`` (object/float64)."""
+    if isinstance(series.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(series):
+        return int(pd.Series(np.asarray(series, dtype=object)).memory_usage(index=False, deep=True))
+    return len(series) * 8
+
+
+def memory_report(data):
+    """Tuple ``(byte dengan tipe ringkas, byte dengan tipe lebar)`` untuk satu tabel."""
+    compact = int(data.memory_usage(index=False, deep=True).sum())
+    wide = sum(_wide_bytes(data[col]) for col in data.columns)
+    return compact, wide
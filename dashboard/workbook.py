@@ -0,0 +1,225 @@
+"""Reader workbook satu kali jalan (single-pass) berbasis openpyxl.
+
+Workbook dibuka sekali dalam mode ``read_only`` lalu semua sheet yang
+diminta di-stream baris per baris. Kolom yang dikenal di ``SHEET_SCHEMAS``
+langsung dibangun dengan dtype eksplisit, jadi pandas tidak perlu menebak
+tipe dan sel seperti ``'-'`` pada kolom angka menjadi NaN. Kolom nama dan
+indikator langsung disimpan ringkas (lihat ``dashboard.storage``).
+
+``read_csv`` membaca ekspor CSV dengan skema yang sama (nama sheet
+menentukan skema) dan mengembalikan hasil dalam bentuk yang sama dengan
+``read_workbook``.
+"""
+
+import csv
+import os
+import posixpath
+import zipfile
+from xml.etree import ElementTree
+
+import numpy as np
+import pandas as pd
+
+from dashboard.storage import compact_float, compact_names
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Tipe kolom per sheet. "str" memakai tipe string default pandas, "category"
+# untuk kolom nama, dan "float" untuk indikator yang disimpan sebagai
+# float32 jika presisinya cukup (lihat ``dashboard.storage.compact_float``).
+SHEET_SCHEMAS = {
+    "DATA_PROVINSI": {
+        "PROVINSI": "category",
+        "PENDUDUK_MISKIN": "float",
+        "TPT (%)": "float",
+        "7-12": "float",
+        "13-15": "float",
+        "16-18": "float",
+        "19-23": "float",
+        "LATITUDE": "float64",
+        "LONGITUDE": "float64",
+    },
+    "KEMISKINAN_KABKOTA": {
+        "Provinsi": "category",
+        "Kota/Kab": "category",
+        "Jumlah Penduduk Miskin (Ribu Jiwa)": "float",
+    },
+    "TPAK_JENISKELAMIN": {
+        "PROVINSI": "category",
+        "LAKI-LAKI": "float",
+        "PEREMPUAN": "float",
+    },
+}
+
+
+def _to_float(value):
+    if value is None or isinstance(value, bool):
+        return np.nan
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(str(value).strip().replace(",", "."))
+    except ValueError:
+        return np.nan
+
+
+def _build_column(values, dtype):
+    if dtype is None:
+        # Kolom di luar skema: biarkan pandas menentukan tipenya
+        return pd.Series(values, dtype=None if values else object)
+    if dtype in ("str", "category"):
+        text = [np.nan if v is None else str(v) for v in values]
+        if dtype == "category":
+            return compact_names(text)
+        return pd.Series(text, dtype=None if values else object)
+    floats = np.fromiter((_to_float(v) for v in values), dtype=np.float64, count=len(values))
+    return compact_float(floats) if dtype == "float" else floats.astype(dtype)
+
+
+def _read_sheet(ws, schema):
+    ws.reset_dimensions()
+    rows = ws.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame()
+
+    # Buang kolom kosong di ujung kanan header
+    width = len(header)
+    while width and header[width - 1] is None:
+        width -= 1
+    names = [h if h is not None else f"Unnamed: {i}" for i, h in enumerate(header[:width])]
+
+    columns = [[] for _ in names]
+    for row in rows:
+        if all(v is None for v in row[:width]):
+            continue
+        for i in range(width):
+            columns[i].append(row[i] if i < len(row) else None)
+
+    return _build_frame(names, columns, schema)
+
+
+def _build_frame(names, columns, schema):
+    data = {name: _build_column(values, schema.get(name)) for name, values in zip(names, columns)}
+    return pd.DataFrame(data)
+
+
+class WorkbookReader:
+    """Workbook yang dibuka sekali (saat sheet pertama dibaca) untuk beberapa pembacaan.
+
+    ``read`` bisa dipanggil berkali-kali untuk sheet yang berbeda tanpa
+    membuka dan mem-parse ulang shared strings workbook. Tutup dengan ``close``.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._wb = None
+
+    def read(self, file_path, sheet_names, schemas=SHEET_SCHEMAS):
+        """Baca sheet-sheet dari workbook yang sudah terbuka.
+
+        Signature sama dengan ``read_workbook`` agar bisa dipakai sebagai
+        ``reader`` cache; ``file_path`` harus workbook milik reader ini
+        (``ValueError`` jika berbeda).
+        """
+        if os.path.abspath(file_path) != os.path.abspath(self.file_path):
+            raise ValueError(f"WorkbookReader untuk {self.file_path} tidak bisa membaca {file_path}")
+        if self._wb is None:
+            # openpyxl (~150 ms import) hanya diperlukan saat cache kolumnar tidak bisa dipakai
+            from openpyxl import load_workbook
+
+            self._wb = load_workbook(self.file_path, read_only=True, data_only=True)
+        missing = [sheet for sheet in sheet_names if sheet not in self._wb.sheetnames]
+        if missing:
+            raise ValueError(f"Worksheet named '{missing[0]}' not found")
+        return {sheet: _read_sheet(self._wb[sheet], schemas.get(sheet, {})) for sheet in sheet_names}
+
+    def close(self):
+        if self._wb is not None:
+            self._wb.close()
+            self._wb = None
+
+
+def read_workbook(file_path, sheet_names, schemas=SHEET_SCHEMAS):
+    """Baca beberapa sheet sekaligus dengan satu kali membuka workbook.
+
+    Mengembalikan dict ``{nama_sheet: DataFrame}``. ``ValueError`` dilempar
+    jika ada sheet yang tidak ditemukan, sama seperti ``pd.read_excel``.
+    """
+    reader = WorkbookReader(file_path)
+    try:
+        return reader.read(file_path, sheet_names, schemas)
+    finally:
+        reader.close()
+
+
+def _csv_value(text):
+    """Sel CSV: kosong -> None, angka -> int/float, selain itu teks apa adanya."""
+    text = text.strip()
+    if not text:
+        return None
+    for parse in (int, float):
+        try:
+            return parse(text)
+        except ValueError:
+            pass
+    return text
+
+
+def read_csv(file_path, sheet_names, schemas=SHEET_SCHEMAS):
+    """Baca satu file CSV sebagai tabel ``sheet_names[0]`` (skema dari nama tersebut).
+
+    Mengembalikan dict ``{nama_sheet: DataFrame}`` seperti ``read_workbook``.
+    """
+    sheet = sheet_names[0]
+    schema = schemas.get(sheet, {})
+    with open(file_path, newline="", encoding="utf-8-sig") as f:
+        rows = csv.reader(f)
+        header = next(rows, None)
+        if header is None:
+            return {sheet: pd.DataFrame()}
+        names = [h if h else f"Unnamed: {i}" for i, h in enumerate(header)]
+        columns = [[] for _ in names]
+        for row in rows:
+            if not any(cell.strip() for cell in row):
+                continue
+            for i in range(len(names)):
+                cell = row[i] if i < len(row) else ""
+                # Kolom dalam skema diubah oleh _build_column; kolom lain ditebak di sini
+                columns[i].append((cell.strip() or None) if names[i] in schema else _csv_value(cell))
+    return {sheet: _build_frame(names, columns, schema)}
+
+
+def sheet_fingerprints(file_path, sheet_names):
+    """Sidik jari isi per sheet, diambil dari CRC32 di direktori zip xlsx.
+
+    Tidak perlu mengekstrak atau mem-parse isi sheet. ``sharedStrings.xml``
+    dan ``styles.xml`` dipakai bersama oleh semua sheet, jadi perubahan di
+    sana dianggap mengubah semua sheet. Sheet yang tidak ditemukan tidak
+    dimasukkan ke hasil.
+    """
+    with zipfile.ZipFile(file_path) as zf:
+        infos = {info.filename: info for info in zf.infolist()}
+
+        def member_id(name):
+            info = infos.get(name)
+            return f"{info.CRC:08x}:{info.file_size}" if info else "-"
+
+        workbook = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+        rels = ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+
+    targets = {}
+    for rel in rels.iter(f"{_NS_PKG_REL}Relationship"):
+        target = rel.get("Target", "")
+        # Target bisa relatif terhadap folder xl/ atau absolut dari root paket
+        targets[rel.get("Id")] = target.lstrip("/") if target.startswith("/") else posixpath.join("xl", target)
+
+    shared = member_id("xl/sharedStrings.xml") + "|" + member_id("xl/styles.xml")
+    fingerprints = {}
+    for sheet in workbook.iter(f"{_NS_MAIN}sheet"):
+        name = sheet.get("name")
+        if name in sheet_names:
+            fingerprints[name] = member_id(targets.get(sheet.get(f"{_NS_REL}id"), "")) + "|" + shared
+    return fingerprints
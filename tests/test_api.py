@@ -0,0 +1,46 @@
+"""Filter ``dashboard.api`` mengikuti semantik sidebar (``FilterIndex.select``)."""
+
+import json
+import os
+
+import pytest
+
+from dashboard.api import QueryService
+from dashboard.dataset import load_dataset
+from dashboard.refresh import DataStore
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data_python.xlsx")
+
+
+@pytest.fixture(scope="module")
+def service(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("DASHBOARD_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+        store = DataStore(DATA_FILE, load_dataset)
+    return QueryService(store.snapshot)
+
+
+def _provinces(service, **params):
+    query = {name: value if isinstance(value, list) else [str(value)] for name, value in params.items()}
+    body = json.loads(service.respond("/api/rows/provinsi", {"limit": ["1000"], **query}).body)
+    return {row["PROVINSI"] for row in body["rows"]}
+
+
+def test_range_applies_to_default_selection(service):
+    # Tanpa parameter provinsi: semua provinsi terpilih, seperti keadaan awal sidebar
+    everything = _provinces(service)
+    filtered = _provinces(service, poverty_max=500)
+    assert filtered and filtered < everything
+
+
+def test_cleared_selection_ignores_range(service):
+    # provinsi= kosong: multiselect dikosongkan, rentang tidak diterapkan
+    assert _provinces(service, provinsi=[""], poverty_max=500) == _provinces(service)
+
+
+def test_range_applies_to_selected_provinces(service):
+    everything = sorted(_provinces(service))
+    selected = everything[:10]
+    filtered = _provinces(service, provinsi=selected, poverty_max=500)
+    assert filtered <= set(selected)
+    assert filtered == set(selected) & _provinces(service, poverty_max=500)
@@ -0,0 +1,47 @@
+"""Pembersihan cache kolumnar dan store figure di disk."""
+
+import json
+import os
+import time
+
+import pandas as pd
+
+from dashboard import cache
+from dashboard.resultstore import ResultStore
+
+
+def _write_manifest(directory, version):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / cache.MANIFEST_NAME).write_text(json.dumps({"format": version, "sheets": {"S": {"dir": "sheet0"}}}))
+
+
+def test_write_cache_removes_stale_formats(tmp_path):
+    parent = tmp_path / "data_python"
+    # Layout lama: satu manifest per workbook dengan folder sheetN langsung di bawahnya
+    _write_manifest(parent, cache.CACHE_FORMAT_VERSION - 1)
+    (parent / "sheet0").mkdir()
+    _write_manifest(parent / "OLD_SHEET", cache.CACHE_FORMAT_VERSION - 1)
+    _write_manifest(parent / "NEWER_SHEET", cache.CACHE_FORMAT_VERSION + 1)
+    leftover = parent / ".build-crashed"
+    leftover.mkdir()
+    old = time.time() - cache.STALE_BUILD_SECONDS - 1
+    os.utime(leftover, (old, old))
+    in_progress = parent / ".build-running"
+    in_progress.mkdir()
+
+    manifest = {"format": cache.CACHE_FORMAT_VERSION, "mtime_ns": 0, "size": 0, "sha256": ""}
+    cache._write_cache(str(parent / "DATA_PROVINSI"), {"S": pd.DataFrame({"a": [1.0]})}, manifest, {})
+
+    assert sorted(os.listdir(parent)) == [".build-running", "DATA_PROVINSI", "NEWER_SHEET"]
+
+
+def test_retain_keeps_recently_used_versions(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    store.put("lama", "{}", version="v1")
+    store.put("aktif", "{}", version="v1:2024")
+    store.put("baru", "{}", version="v2")
+    # Proses lain yang masih memakai v1 baru saja membaca entrinya
+    assert store.retain("v2") == 0
+    assert store.retain("v2", max_idle=-1) == 2
+    assert store.get("baru") == "{}" and store.get("lama") is None
+    store.close()
@@ -0,0 +1,33 @@
+"""Mode batch ``dashboard.export`` pada workbook contoh di repo."""
+
+import os
+
+import pandas as pd
+
+from dashboard import export
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data_python.xlsx")
+# Baris agregat nasional di sheet provinsi; tidak punya baris kab/kota
+NATIONAL_ROWS = {"INDONESIA"}
+
+
+def test_every_province_has_kabkota_and_tpak(tmp_path, monkeypatch):
+    # Sheet kab/kota mengeja "D I YOGYAKARTA" dan "KEPULAUAN RIAU", berbeda dengan sheet provinsi
+    monkeypatch.setenv("DASHBOARD_CACHE_DIR", str(tmp_path / "cache"))
+    out = tmp_path / "exports"
+    export.main(["--data", DATA_FILE, "--out", str(out), "--formats", "html", "csv", "--workers", "1"])
+
+    (year_dir,) = [path for path in out.iterdir() if path.is_dir()]
+    directories = [path for path in year_dir.iterdir() if path.is_dir()]
+    assert len(directories) > 30
+
+    checked = 0
+    for directory in directories:
+        province = pd.read_csv(directory / "provinsi.csv")["PROVINSI"].iloc[0]
+        assert len(pd.read_csv(directory / "tpak.csv")), province
+        if province in NATIONAL_ROWS:
+            continue
+        assert len(pd.read_csv(directory / "kabkota.csv")), province
+        assert (directory / "kabkota.html").exists(), province
+        checked += 1
+    assert checked == len(directories) - len(NATIONAL_ROWS)
@@ -0,0 +1,19 @@
+"""Anggaran alokasi memori per rerun (``benchmarks.bench_memory``) sebagai pemeriksaan pytest."""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Sama dengan default benchmark: 5000 provinsi, 20000 kab/kota sintetis
+# dan jumlah DataFrame seukuran tabel provinsi per rerun (puncak terukur ~2,3 MB, 2 frame)
+BUDGET_MB = 4
+MAX_FRAMES = 2
+
+
+def test_rerun_allocations_within_budget():
+    # Proses baru: konstanta dashboard.app dan cache Streamlit dibaca dari workbook sintetis
+    result = subprocess.run([sys.executable, "-m", "benchmarks.bench_memory", "--budget-mb", str(BUDGET_MB),
+                             "--max-frames", str(MAX_FRAMES)],
+                            cwd=ROOT, capture_output=True, text=True, timeout=900)
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,44 @@
+"""Panel profiling admin hanya terbuka dengan token ``DASHBOARD_PROFILE_TOKEN``."""
+
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from dashboard import instrument
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "kemiskinan.py")
+PANEL_LABEL = "Profil Performa"
+
+
+def _panel_shown(monkeypatch, tmp_path, query_value, token=None):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setenv("DASHBOARD_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("DASHBOARD_RESULT_CACHE", "off")
+    if token is None:
+        monkeypatch.delenv(instrument.PROFILE_TOKEN_ENV, raising=False)
+    else:
+        monkeypatch.setenv(instrument.PROFILE_TOKEN_ENV, token)
+
+    at = AppTest.from_file(APP_PATH, default_timeout=300)
+    at.query_params[instrument.QUERY_PARAM] = query_value
+    at.run()
+    assert not at.exception
+    return any(PANEL_LABEL in expander.label for expander in at.expander)
+
+
+@pytest.mark.parametrize("query_value", ["1", ""])
+def test_panel_hidden_without_token(monkeypatch, tmp_path, query_value):
+    assert not _panel_shown(monkeypatch, tmp_path, query_value)
+
+
+def test_panel_requires_matching_token(monkeypatch, tmp_path):
+    assert not _panel_shown(monkeypatch, tmp_path, "1", token="rahasia")
+    assert _panel_shown(monkeypatch, tmp_path, "rahasia", token="rahasia")
+
+
+def test_query_enabled_without_token():
+    assert not instrument.query_enabled({instrument.QUERY_PARAM: "1"}, environ={})
+    assert not instrument.query_enabled({instrument.QUERY_PARAM: ""}, environ={instrument.PROFILE_TOKEN_ENV: ""})
+    assert instrument.query_enabled({instrument.QUERY_PARAM: "x"}, environ={instrument.PROFILE_TOKEN_ENV: "x"})